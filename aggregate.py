@@ -0,0 +1,178 @@
+"""Накопительные итоги тренировок по пользователям и периодам."""
+import json
+import os
+from typing import Dict, Hashable, Iterable, Iterator, Optional, Tuple
+
+from batch import BatchResult
+from homework import InfoMessage
+
+WEEK: int = 7 * 24 * 60 * 60
+
+Key = Tuple[Hashable, Optional[str], Optional[int]]
+
+
+class Totals:
+    """Суммы по тренировкам: количество, время, дистанция и калории.
+
+    `speed_time` — сумма скоростей, взвешенных длительностью: скорость
+    плавания считается по бассейнам, а не по дистанции, поэтому среднюю
+    скорость нельзя получить делением дистанции на время.
+    """
+
+    __slots__ = ('count', 'duration', 'distance', 'calories', 'speed_time')
+
+    def __init__(self,
+                 count: int = 0,
+                 duration: float = 0.0,
+                 distance: float = 0.0,
+                 calories: float = 0.0,
+                 speed_time: float = 0.0,
+                 ) -> None:
+        self.count: int = count
+        self.duration: float = duration
+        self.distance: float = distance
+        self.calories: float = calories
+        self.speed_time: float = speed_time
+
+    def __repr__(self) -> str:
+        return (f'{type(self).__name__}(count={self.count}, '
+                f'duration={self.duration}, distance={self.distance}, '
+                f'calories={self.calories}, speed_time={self.speed_time})')
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Totals):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def as_tuple(self) -> Tuple[int, float, float, float, float]:
+        """Получить суммы кортежем."""
+        return (self.count, self.duration, self.distance, self.calories,
+                self.speed_time)
+
+    def add(self,
+            duration: float,
+            distance: float,
+            calories: float,
+            speed: float,
+            ) -> None:
+        """Учесть одну тренировку."""
+        self.count += 1
+        self.duration += duration
+        self.distance += distance
+        self.calories += calories
+        self.speed_time += speed * duration
+
+    def get_mean_speed(self) -> float:
+        """Получить среднюю скорость за все учтённые тренировки."""
+        if not self.duration:
+            return 0.0
+        return self.speed_time / self.duration
+
+
+def _as_key(value):
+    """Вернуть кортежами списки, в которые JSON превратил ключ."""
+    if isinstance(value, list):
+        return tuple(map(_as_key, value))
+    return value
+
+
+class Aggregator:
+    """Итоги тренировок по пользователю, виду тренировки и периоду.
+
+    Каждая тренировка обновляет четыре среза за O(1): всё время,
+    вид тренировки, период и вид тренировки за период. Период — окно
+    длиной `window` секунд, выровненное по началу эпохи.
+    """
+
+    def __init__(self, window: int = WEEK) -> None:
+        self.window: int = window
+        self.totals: Dict[Key, Totals] = {}
+
+    def window_start(self, timestamp: float) -> int:
+        """Получить начало периода, в который попадает `timestamp`."""
+        return int(timestamp // self.window * self.window)
+
+    def add_values(self,
+                   user: Hashable,
+                   training_type: str,
+                   timestamp: float,
+                   duration: float,
+                   distance: float,
+                   calories: float,
+                   speed: float,
+                   ) -> None:
+        """Учесть одну тренировку по её показателям."""
+        start: int = self.window_start(timestamp)
+        totals: Dict[Key, Totals] = self.totals
+        for key in ((user, None, None), (user, training_type, None),
+                    (user, None, start), (user, training_type, start)):
+            item: Optional[Totals] = totals.get(key)
+            if item is None:
+                item = totals[key] = Totals()
+            item.add(duration, distance, calories, speed)
+
+    def add(self,
+            user: Hashable,
+            message: InfoMessage,
+            timestamp: float) -> None:
+        """Учесть тренировку по информационному сообщению."""
+        self.add_values(user, message.training_type, timestamp,
+                        message.duration, message.distance,
+                        message.calories, message.speed)
+
+    def add_batch(self,
+                  user: Hashable,
+                  result: BatchResult,
+                  timestamps: Iterable[float]) -> None:
+        """Учесть результаты пакетного расчёта одного пользователя."""
+        for timestamp, duration, distance, calories, speed in zip(
+                timestamps, result.duration, result.distance,
+                result.calories, result.speed):
+            self.add_values(user, result.training_type, timestamp,
+                            duration, distance, calories, speed)
+
+    def get(self,
+            user: Hashable,
+            training_type: Optional[str] = None,
+            timestamp: Optional[float] = None,
+            ) -> Totals:
+        """Получить итоги пользователя за всё время или за период."""
+        start: Optional[int] = (None if timestamp is None
+                                else self.window_start(timestamp))
+        return self.totals.get((user, training_type, start), Totals())
+
+    def periods(self, user: Hashable) -> Iterator[Tuple[int, Totals]]:
+        """Перечислить периоды пользователя в порядке времени."""
+        keys = sorted(key[2] for key in self.totals
+                      if key[0] == user and key[1] is None
+                      and key[2] is not None)
+        for start in keys:
+            yield start, self.totals[(user, None, start)]
+
+    def snapshot(self, path: str) -> None:
+        """Сохранить итоги в файл, заменив прежний снимок атомарно.
+
+        Пользователь должен сохраняться в JSON: строка, число или
+        кортеж из них. Кортежи записываются списками и при загрузке
+        снова становятся кортежами.
+        """
+        data: dict = {
+            'window': self.window,
+            'totals': [[*key, *item.as_tuple()]
+                       for key, item in self.totals.items()],
+        }
+        tmp_path: str = f'{path}.tmp'
+        with open(tmp_path, 'w') as out:
+            json.dump(data, out)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def restore(cls, path: str) -> 'Aggregator':
+        """Загрузить итоги из снимка."""
+        with open(path) as src:
+            data: dict = json.load(src)
+        aggregator: Aggregator = cls(data['window'])
+        for user, training_type, start, *values in data['totals']:
+            aggregator.totals[(_as_key(user), training_type, start)] = (
+                Totals(*values))
+        return aggregator
@@ -0,0 +1,161 @@
+"""Пакетный расчёт показателей тренировок по колонкам данных.
+
+`SCALAR_KERNELS` — те же формулы для одного пакета; их используют
+`service` и `sessions`.
+"""
+from array import array
+from dataclasses import dataclass
+from itertools import repeat
+from operator import add, floordiv, mul, pow, sub, truediv
+from typing import (Callable, Dict, Iterable, Iterator, Mapping, Sequence,
+                    Tuple)
+
+from homework import (WORKOUT_TYPES, InfoMessage, Running, SportsWalking,
+                      Swimming)
+
+Metrics = Tuple[float, float, float]
+
+
+@dataclass
+class BatchResult:
+    """Результаты пакетного расчёта для одного типа тренировки."""
+
+    training_type: str
+    duration: Sequence[float]
+    distance: array
+    speed: array
+    calories: array
+
+    def __len__(self) -> int:
+        return len(self.distance)
+
+    def messages(self) -> Iterator[InfoMessage]:
+        """Получить информационные сообщения по каждой тренировке."""
+        for row in zip(self.duration, self.distance,
+                       self.speed, self.calories):
+            yield InfoMessage(self.training_type, *row)
+
+
+def _distance(action: Iterable[float], len_step: float,
+              m_in_km: int) -> Iterator[float]:
+    """Дистанция в км: action * LEN_STEP / M_IN_KM."""
+    return map(truediv,
+               map(mul, action, repeat(len_step)),
+               repeat(m_in_km))
+
+
+def _minutes(duration: Iterable[float], min_in_h: int) -> Iterator[float]:
+    """Длительность тренировки в минутах."""
+    return map(mul, duration, repeat(min_in_h))
+
+
+def _running(action, duration, weight):
+    """Бег: дистанция, скорость и расход калорий."""
+    cls = Running
+    distance = array('d', _distance(action, cls.LEN_STEP, cls.M_IN_KM))
+    speed = array('d', map(truediv, distance, duration))
+    speed_based_calc = map(sub,
+                           map(mul, repeat(cls.COEF_CAL_1), speed),
+                           repeat(cls.COEF_CAL_2))
+    cal_rate = map(truediv,
+                   map(mul, speed_based_calc, weight),
+                   repeat(cls.M_IN_KM))
+    calories = array('d', map(mul, cal_rate,
+                              _minutes(duration, cls.MIN_IN_H)))
+    return distance, speed, calories
+
+
+def _sports_walking(action, duration, weight, height):
+    """Спортивная ходьба: дистанция, скорость и расход калорий."""
+    cls = SportsWalking
+    distance = array('d', _distance(action, cls.LEN_STEP, cls.M_IN_KM))
+    speed = array('d', map(truediv, distance, duration))
+    square_speed = map(pow, speed, repeat(2))
+    speed_based_calc = map(mul,
+                           map(mul,
+                               map(floordiv, square_speed, height),
+                               repeat(cls.COEF_CAL_2)),
+                           height)
+    weight_based_calc = map(mul, repeat(cls.COEF_CAL_1), weight)
+    cal_rate = map(add, speed_based_calc, weight_based_calc)
+    calories = array('d', map(mul, cal_rate,
+                              _minutes(duration, cls.MIN_IN_H)))
+    return distance, speed, calories
+
+
+def _swimming(action, duration, weight, length_pool, count_pool):
+    """Плавание: дистанция, скорость и расход калорий."""
+    cls = Swimming
+    distance = array('d', _distance(action, cls.LEN_STEP, cls.M_IN_KM))
+    pool = map(mul, length_pool, count_pool)
+    speed = array('d', map(truediv,
+                           map(truediv, pool, repeat(cls.M_IN_KM)),
+                           duration))
+    calories = array('d', map(mul,
+                              map(mul,
+                                  map(add, speed, repeat(cls.COEF_CAL_1)),
+                                  repeat(cls.COEF_CAL_2)),
+                              weight))
+    return distance, speed, calories
+
+
+KERNELS: dict = {
+    'RUN': _running,
+    'WLK': _sports_walking,
+    'SWM': _swimming,
+}
+
+
+def _running_metrics(action, duration, weight) -> Metrics:
+    """Бег: дистанция, скорость и расход калорий."""
+    cls = Running
+    distance = action * cls.LEN_STEP / cls.M_IN_KM
+    speed = distance / duration
+    cal_rate = ((cls.COEF_CAL_1 * speed - cls.COEF_CAL_2) * weight
+                / cls.M_IN_KM)
+    return distance, speed, cal_rate * (duration * cls.MIN_IN_H)
+
+
+def _sports_walking_metrics(action, duration, weight, height) -> Metrics:
+    """Спортивная ходьба: дистанция, скорость и расход калорий."""
+    cls = SportsWalking
+    distance = action * cls.LEN_STEP / cls.M_IN_KM
+    speed = distance / duration
+    cal_rate = (speed ** 2 // height * cls.COEF_CAL_2 * height
+                + cls.COEF_CAL_1 * weight)
+    return distance, speed, cal_rate * (duration * cls.MIN_IN_H)
+
+
+def _swimming_metrics(action, duration, weight, length_pool,
+                      count_pool) -> Metrics:
+    """Плавание: дистанция, скорость и расход калорий."""
+    cls = Swimming
+    distance = action * cls.LEN_STEP / cls.M_IN_KM
+    speed = length_pool * count_pool / cls.M_IN_KM / duration
+    return distance, speed, (speed + cls.COEF_CAL_1) * cls.COEF_CAL_2 * weight
+
+
+# Те же формулы для одного пакета: без объекта тренировки и массивов.
+SCALAR_KERNELS: Dict[str, Callable[..., Metrics]] = {
+    'RUN': _running_metrics,
+    'WLK': _sports_walking_metrics,
+    'SWM': _swimming_metrics,
+}
+
+
+def compute_batch(workout_type: str,
+                  columns: Mapping[str, Sequence[float]]) -> BatchResult:
+    """Рассчитать дистанцию, скорость и калории для колонок данных.
+
+    Формулы и порядок операций совпадают с методами классов тренировок,
+    поэтому результаты побитово равны скалярному расчёту.
+    """
+    kernel = KERNELS[workout_type]
+    training_class = WORKOUT_TYPES[workout_type]
+    data: list = [columns[name] for name in training_class.FIELDS]
+    size: int = len(data[0])
+    if any(len(column) != size for column in data):
+        raise ValueError('Колонки пакета должны быть одной длины.')
+    distance, speed, calories = kernel(*data)
+    return BatchResult(training_class.__name__,
+                       data[1], distance, speed, calories)
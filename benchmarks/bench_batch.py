@@ -0,0 +1,55 @@
+"""Сравнение пакетного и поштучного расчёта тренировок.
+
+Запуск: python -m benchmarks.bench_batch --rows 10000000
+"""
+import argparse
+import time
+
+from batch import compute_batch
+from benchmarks.synthetic import WORKOUT_TYPES, generate_columns
+from homework import WORKOUT_TYPES, read_package
+
+
+def scalar(workout_type: str, columns: list) -> None:
+    """Поштучный расчёт через классы тренировок."""
+    for data in zip(*columns):
+        read_package(workout_type, data).show_training_info()
+
+
+def mismatches(workout_type: str, columns: list, result) -> int:
+    """Посчитать строки, где пакетный расчёт расходится со скалярным."""
+    count: int = 0
+    for data, *row in zip(zip(*columns), result.distance,
+                          result.speed, result.calories):
+        info = read_package(workout_type, data).show_training_info()
+        if (info.distance, info.speed, info.calories) != tuple(row):
+            count += 1
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    for workout_type in WORKOUT_TYPES:
+        columns: list = generate_columns(workout_type, args.rows, args.seed)
+        named: dict = dict(zip(WORKOUT_TYPES[workout_type].FIELDS,
+                              columns))
+
+        start: float = time.perf_counter()
+        result = compute_batch(workout_type, named)
+        batch_time: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scalar(workout_type, columns)
+        scalar_time: float = time.perf_counter() - start
+
+        print(f'{workout_type}: rows={args.rows} '
+              f'scalar={scalar_time:.3f}s batch={batch_time:.3f}s '
+              f'speedup={scalar_time / batch_time:.1f}x '
+              f'mismatches={mismatches(workout_type, columns, result)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Ответ на пакет с кэшем и без него при повторах от источника.
+
+Запуск: python -m benchmarks.bench_cache --packages 200000 --repeats 0.5
+Доля `--repeats` пакетов потока — повторы уже присланных пакетов.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.synthetic import generate_packages
+from cache import ResultCache
+from homework import read_package
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--packages', type=int, default=200_000)
+    parser.add_argument('--repeats', type=float, default=0.5)
+    parser.add_argument('--maxsize', type=int, default=100_000)
+    args = parser.parse_args()
+    unique: int = max(1, int(args.packages * (1 - args.repeats)))
+    pool: list = list(generate_packages(unique))
+    rng: random.Random = random.Random(0)
+    packages: list = pool + [rng.choice(pool)
+                             for _ in range(args.packages - unique)]
+    rng.shuffle(packages)
+
+    start: float = time.perf_counter()
+    for workout_type, data in packages:
+        read_package(workout_type, data).show_training_info().get_message()
+    plain: float = time.perf_counter() - start
+    print(f'без кэша: {plain / len(packages) * 1e9:.0f} ns/package')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for title, path in (('память', None),
+                            ('память + диск', os.path.join(tmp, 'c.db')),
+                            ('тёплый диск', os.path.join(tmp, 'c.db'))):
+            with ResultCache(args.maxsize, path=path) as results:
+                get_text = results.get_text
+                start = time.perf_counter()
+                for workout_type, data in packages:
+                    get_text(workout_type, data)
+                elapsed: float = time.perf_counter() - start
+            print(f'{title}: {elapsed / len(packages) * 1e9:.0f} '
+                  f'ns/package, доля попаданий '
+                  f'{results.stats.hit_rate():.2f}, {results.stats}')
+
+
+if __name__ == '__main__':
+    main()
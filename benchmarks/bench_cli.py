@@ -0,0 +1,51 @@
+"""Пропускная способность cli.py против построчного print через main().
+
+Запуск: python -m benchmarks.bench_cli --packages 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import cli
+import homework
+from benchmarks.synthetic import write_packages
+from pipeline import parse_line
+
+
+def print_path(path: str) -> None:
+    """Прежний способ: main() и print на каждую тренировку."""
+    with open(path) as src, open(os.devnull, 'w') as devnull:
+        with redirect_stdout(devnull):
+            for line in src:
+                homework.main(homework.read_package(*parse_line(line)))
+
+
+def cli_path(path: str, output_format: str) -> None:
+    with open(path) as src, open(os.devnull, 'w',
+                                 buffering=cli.OUTPUT_BUFFER_SIZE) as out:
+        cli.run([src], out, output_format)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--packages', type=int, default=1_000_000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path: str = os.path.join(tmp, 'packages.txt')
+        write_packages(path, args.packages)
+        cases: dict = {'print': lambda: print_path(path)}
+        for output_format in cli.FORMATS:
+            cases[f'cli {output_format}'] = (
+                lambda output_format=output_format:
+                cli_path(path, output_format))
+        for name, case in cases.items():
+            start: float = time.perf_counter()
+            case()
+            elapsed: float = time.perf_counter() - start
+            print(f'{name}: {args.packages / elapsed:,.0f} packages/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Колоночный файл результатов против текстового отчёта.
+
+Сравнивает размер файлов и время записи и чтения всех показателей.
+Текстовый отчёт читается разбором строк регулярным выражением.
+
+Запуск: python -m benchmarks.bench_columnar --packages 1000000
+"""
+import argparse
+import os
+import re
+import tempfile
+import timeit
+
+import columnar
+from benchmarks.synthetic import generate_packages
+from homework import format_many, read_package
+
+NUMBER: str = r'([-\d.]+)'
+LINE = re.compile(
+    rf'Тип тренировки: (\w+); Длительность: {NUMBER} ч\.; '
+    rf'Дистанция: {NUMBER} км; Ср\. скорость: {NUMBER} км/ч; '
+    rf'Потрачено ккал: {NUMBER}\.$', re.MULTILINE)
+
+
+def write_text(path: str, messages: list) -> None:
+    with open(path, 'w') as dst:
+        dst.write(format_many(messages))
+
+
+def read_text(path: str) -> list:
+    with open(path) as src:
+        return [(name, *map(float, values))
+                for name, *values in LINE.findall(src.read())]
+
+
+def read_columnar(path: str) -> list:
+    with columnar.ColumnarReader(path) as reader:
+        return list(reader.columns().values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--packages', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    messages: list = [read_package(*package).show_training_info()
+                      for package in generate_packages(args.packages)]
+    with tempfile.TemporaryDirectory() as directory:
+        text_path: str = os.path.join(directory, 'report.txt')
+        columnar_path: str = os.path.join(directory, 'report.wcf')
+        cases: dict = {
+            'text': (text_path, lambda: write_text(text_path, messages),
+                     lambda: read_text(text_path)),
+            'columnar': (columnar_path, lambda: columnar.write_columnar(
+                columnar_path, messages), lambda: read_columnar(
+                columnar_path)),
+        }
+        for name, (path, write, read) in cases.items():
+            write_time: float = min(timeit.repeat(write, number=1,
+                                                  repeat=args.repeat))
+            read_time: float = min(timeit.repeat(read, number=1,
+                                                 repeat=args.repeat))
+            size: int = os.path.getsize(path)
+            print(f'{name}: {size / args.packages:.1f} B/message, '
+                  f'write {write_time / args.packages * 1e9:.0f} ns, '
+                  f'read {read_time / args.packages * 1e9:.0f} ns')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Стоимость выбора класса тренировки по коду пакета.
+
+Запуск: python -m benchmarks.bench_dispatch --packages 100000
+"""
+import argparse
+import timeit
+
+from benchmarks.synthetic import generate_packages
+from homework import (Running, SportsWalking, Swimming, read_package,
+                      read_packages)
+
+
+def legacy_read_package(workout_type: str, data: list):
+    """Прежний read_package: словарь классов собирается на каждый вызов."""
+    packages = {
+        'SWM': Swimming,
+        'RUN': Running,
+        'WLK': SportsWalking,
+    }
+    return packages[workout_type](*data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--packages', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    packages: list = list(generate_packages(args.packages))
+    rows: list = [data for _, data in
+                  generate_packages(args.packages, workout_types=('RUN',))]
+    cases: dict = {
+        'legacy read_package': lambda: [
+            legacy_read_package(*package) for package in packages],
+        'read_package': lambda: [
+            read_package(*package) for package in packages],
+        'read_packages (RUN)': lambda: read_packages('RUN', rows),
+        'read_package (RUN)': lambda: [
+            read_package('RUN', data) for data in rows],
+    }
+    for name, case in cases.items():
+        best: float = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f'{name}: {best / args.packages * 1e9:.0f} ns/package')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Точный расчёт с фиксированной точкой против float-движка.
+
+Запуск: python -m benchmarks.bench_exact --packages 1000000
+"""
+import argparse
+import timeit
+
+import batch
+import exact
+from benchmarks.synthetic import generate_columns, generate_packages
+from homework import WORKOUT_TYPES, read_packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--packages', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scalar', type=int, default=100_000,
+                        help='число пакетов для скалярного сравнения')
+    args = parser.parse_args()
+    for workout_type in ('RUN', 'WLK', 'SWM'):
+        columns: dict = dict(zip(WORKOUT_TYPES[workout_type].FIELDS,
+                                 generate_columns(workout_type,
+                                                  args.packages)))
+        rows: list = [data for _, data in generate_packages(
+            args.scalar, workout_types=(workout_type,))]
+        trainings: list = read_packages(workout_type, rows)
+        cases: dict = {
+            'batch float': (args.packages, lambda: batch.compute_batch(
+                workout_type, columns)),
+            'batch exact': (args.packages, lambda: exact.compute_batch(
+                workout_type, columns)),
+            'scalar float': (args.scalar, lambda: [
+                (t.invalidate(), t.get_spent_calories()) for t in trainings]),
+            'scalar exact': (args.scalar, lambda: [
+                exact.metrics(workout_type, data) for data in rows]),
+        }
+        for name, (size, case) in cases.items():
+            best: float = min(timeit.repeat(case, number=1,
+                                            repeat=args.repeat))
+            print(f'{workout_type} {name}: {best / size * 1e9:.0f} ns/package')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""Стоимость форматирования одного сообщения о тренировке.
+
+Запуск: python -m benchmarks.bench_format --messages 100000
+"""
+import argparse
+import timeit
+
+from benchmarks.synthetic import generate_packages
+from homework import InfoMessage, format_many, read_package
+
+
+def legacy_message(message: InfoMessage) -> str:
+    """Прежний способ: словарь полей и str.format."""
+    return message.MESSAGE.format(**{
+        name: getattr(message, name) for name in message.__slots__
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    messages: list = [
+        read_package(*package).show_training_info()
+        for package in generate_packages(args.messages)
+    ]
+    cases: dict = {
+        'dict + format': lambda: [legacy_message(m) for m in messages],
+        'get_message': lambda: [m.get_message() for m in messages],
+        'format_many': lambda: format_many(messages),
+    }
+    for name, case in cases.items():
+        best: float = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f'{name}: {best / len(messages) * 1e9:.0f} ns/message')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Пересчёт файла пакетов шардами против одного конвейера.
+
+Запуск: python -m benchmarks.bench_jobs --packages 1000000 --workers 4
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import write_packages
+from jobs import run_job
+from pipeline import run_pipeline
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--packages', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--shard-size', type=int, default=4 * 1024 * 1024)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path: str = os.path.join(tmp, 'packages.txt')
+        write_packages(path, args.packages)
+
+        start: float = time.perf_counter()
+        with open(path) as src, open(os.path.join(tmp, 'a.txt'), 'w') as out:
+            run_pipeline(src, out)
+        single: float = time.perf_counter() - start
+        print(f'один конвейер: {single:.2f}s')
+
+        start = time.perf_counter()
+        result = run_job(path, os.path.join(tmp, 'b.txt'),
+                         os.path.join(tmp, 'job'), args.workers,
+                         args.shard_size)
+        sharded: float = time.perf_counter() - start
+        print(f'{args.workers} рабочих, {result.shards} шардов: '
+              f'{sharded:.2f}s ({single / sharded:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
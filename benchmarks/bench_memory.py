@@ -0,0 +1,50 @@
+"""Память на одну тренировку и одно сообщение по данным tracemalloc.
+
+Запуск: python -m benchmarks.bench_memory --packages 100000
+"""
+import argparse
+import tracemalloc
+
+from benchmarks.synthetic import WORKOUT_TYPES, generate_packages
+from homework import read_package
+
+
+def measure(factory, packages: list) -> float:
+    """Средний прирост памяти на один созданный объект."""
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    objects: list = [factory(package) for package in packages]
+    after: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / len(packages)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--packages', type=int, default=100_000)
+    args = parser.parse_args()
+    for workout_type in WORKOUT_TYPES:
+        packages: list = [
+            read_package(*package)
+            for package in generate_packages(args.packages,
+                                             workout_types=(workout_type,))
+        ]
+        trainings: float = measure(
+            lambda t: type(t)(*_fields(t)), packages)
+        messages: float = measure(lambda t: t.show_training_info(), packages)
+        print(f'{workout_type}: training={trainings:.1f} B, '
+              f'info_message={messages:.1f} B')
+
+
+def _fields(training) -> list:
+    """Параметры конструктора тренировки."""
+    data: list = [training.action, training.duration, training.weight]
+    for name in ('height', 'length_pool', 'count_pool'):
+        if hasattr(training, name):
+            data.append(getattr(training, name))
+    return data
+
+
+if __name__ == '__main__':
+    main()
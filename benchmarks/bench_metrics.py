@@ -0,0 +1,27 @@
+"""Сколько вычислений метрик экономит кеш в Training.
+
+Запуск: python -m benchmarks.bench_metrics --packages 100000
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import generate_packages
+from homework import MetricCounter, read_package
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--packages', type=int, default=100_000)
+    args = parser.parse_args()
+    packages: list = list(generate_packages(args.packages))
+    with MetricCounter() as counter:
+        start: float = time.perf_counter()
+        for package in packages:
+            read_package(*package).show_training_info()
+        elapsed: float = time.perf_counter() - start
+    print(f'computed={counter.computed} reused={counter.reused} '
+          f'time={elapsed / len(packages) * 1e9:.0f} ns/package')
+
+
+if __name__ == '__main__':
+    main()
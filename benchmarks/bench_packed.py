@@ -0,0 +1,65 @@
+"""Чтение пакетов: текстовый формат конвейера против двоичного packed.
+
+Запуск: python -m benchmarks.bench_packed --packages 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import deque
+
+from batch import compute_batch
+from benchmarks.synthetic import generate_packages
+from packed import PackedReader, write_packed
+from pipeline import format_package, parse_line
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--packages', type=int, default=1_000_000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for workout_type in ('RUN', 'WLK', 'SWM'):
+            rows: list = [data for _, data in generate_packages(
+                args.packages, workout_types=(workout_type,))]
+            text_path: str = os.path.join(tmp, f'{workout_type}.txt')
+            packed_path: str = os.path.join(tmp, f'{workout_type}.wpk')
+            with open(text_path, 'w') as out:
+                for data in rows:
+                    out.write(format_package(workout_type, data) + '\n')
+            write_packed(packed_path, workout_type, rows)
+            del rows
+
+            start: float = time.perf_counter()
+            with open(text_path) as src:
+                parsed: list = [parse_line(line)[1] for line in src]
+            text_parse: float = time.perf_counter() - start
+            del parsed
+
+            start = time.perf_counter()
+            with PackedReader(packed_path) as reader:
+                deque(reader, maxlen=0)
+            packed_rows: float = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with PackedReader(packed_path) as reader:
+                reader.compute()
+            packed_batch: float = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with open(text_path) as src:
+                columns = zip(*(parse_line(line)[1] for line in src))
+                compute_batch(workout_type, dict(zip(
+                    reader.fields, map(list, columns))))
+            text_batch: float = time.perf_counter() - start
+
+            print(f'{workout_type}: text={os.path.getsize(text_path)}B '
+                  f'packed={os.path.getsize(packed_path)}B | '
+                  f'parse text={text_parse:.3f}s '
+                  f'iterate packed={packed_rows:.3f}s | '
+                  f'batch from text={text_batch:.3f}s '
+                  f'batch from packed={packed_batch:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""Масштабирование параллельной генерации отчётов по числу процессов.
+
+Запуск: python -m benchmarks.bench_parallel --packages 1000000 --workers 8
+"""
+import argparse
+import os
+import time
+from collections import deque
+
+from benchmarks.synthetic import generate_packages
+from parallel import run_parallel, run_serial
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--packages', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=2048)
+    args = parser.parse_args()
+    packages: list = list(generate_packages(args.packages))
+
+    start: float = time.perf_counter()
+    deque(run_serial(packages, args.chunk_size), maxlen=0)
+    serial: float = time.perf_counter() - start
+    print(f'serial: {args.packages / serial:,.0f} packages/s')
+
+    for workers in range(1, args.workers + 1):
+        start = time.perf_counter()
+        deque(run_parallel(packages, workers, args.chunk_size), maxlen=0)
+        elapsed: float = time.perf_counter() - start
+        print(f'workers={workers}: {args.packages / elapsed:,.0f} '
+              f'packages/s, speedup={serial / elapsed:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
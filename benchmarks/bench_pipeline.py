@@ -0,0 +1,43 @@
+"""Пиковая память потокового конвейера в зависимости от размера входа.
+
+Запуск: python -m benchmarks.bench_pipeline --sizes 10000,100000,1000000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_packages
+
+
+def run(path: str) -> tuple:
+    """Запустить конвейер в отдельном процессе и снять rusage."""
+    start: float = time.perf_counter()
+    with open(os.devnull, 'w') as devnull:
+        process = subprocess.Popen(
+            [sys.executable, 'pipeline.py', path, '-o', os.devnull],
+            stderr=devnull,
+        )
+        _, status, rusage = os.wait4(process.pid, 0)
+    elapsed: float = time.perf_counter() - start
+    assert os.waitstatus_to_exitcode(status) == 0
+    return elapsed, rusage.ru_maxrss
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in map(int, args.sizes.split(',')):
+            path: str = os.path.join(tmp, f'packages-{size}.txt')
+            write_packages(path, size)
+            elapsed, max_rss = run(path)
+            print(f'packages={size} file={os.path.getsize(path)}B '
+                  f'time={elapsed:.2f}s max_rss={max_rss}KiB')
+
+
+if __name__ == '__main__':
+    main()
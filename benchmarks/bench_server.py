@@ -0,0 +1,102 @@
+"""Генератор нагрузки для server.py: задержки p50/p99 и пакетов в секунду.
+
+Запуск: python -m benchmarks.bench_server --clients 16 --packages 20000
+Без --port сервер поднимается в отдельном процессе на свободном порту.
+"""
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+from collections import deque
+from typing import Deque, List
+
+from benchmarks.synthetic import generate_packages
+from pipeline import format_package
+
+
+async def client(host: str, port: int, lines: List[bytes], depth: int,
+                 latencies: List[float]) -> None:
+    """Отправить пакеты, держа в полёте не больше `depth` запросов."""
+    reader, writer = await asyncio.open_connection(host, port)
+    sent: Deque[float] = deque()
+    window: asyncio.Semaphore = asyncio.Semaphore(depth)
+
+    async def send() -> None:
+        for line in lines:
+            await window.acquire()
+            sent.append(time.perf_counter())
+            writer.write(line)
+            await writer.drain()
+
+    sender: asyncio.Task = asyncio.create_task(send())
+    for _ in lines:
+        await reader.readline()
+        latencies.append(time.perf_counter() - sent.popleft())
+        window.release()
+    await sender
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(args: argparse.Namespace) -> None:
+    lines: List[bytes] = [
+        (format_package(*package) + '\n').encode()
+        for package in generate_packages(args.packages)
+    ]
+    shares: List[List[bytes]] = [
+        lines[i::args.clients] for i in range(args.clients)
+    ]
+    latencies: List[float] = []
+    start: float = time.perf_counter()
+    await asyncio.gather(*(
+        client(args.host, args.port, share, args.depth, latencies)
+        for share in shares
+    ))
+    elapsed: float = time.perf_counter() - start
+    latencies.sort()
+    p50: float = latencies[len(latencies) // 2]
+    p99: float = latencies[int(len(latencies) * 0.99)]
+    print(f'clients={args.clients} depth={args.depth} '
+          f'packages={len(latencies)} '
+          f'rate={len(latencies) / elapsed:,.0f} packages/s '
+          f'p50={p50 * 1e3:.2f}ms p99={p99 * 1e3:.2f}ms')
+
+
+def free_port() -> int:
+    """Найти свободный TCP-порт на localhost."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--depth', type=int, default=32)
+    parser.add_argument('--packages', type=int, default=20_000)
+    args = parser.parse_args()
+    server = None
+    if args.port is None:
+        args.port = free_port()
+        server = subprocess.Popen([sys.executable, 'server.py',
+                                   '--port', str(args.port)])
+        for _ in range(100):
+            try:
+                socket.create_connection((args.host, args.port)).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+    try:
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
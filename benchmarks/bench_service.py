@@ -0,0 +1,81 @@
+"""Пропускная способность общего сервиса расчёта из многих потоков.
+
+Запуск: python -m benchmarks.bench_service --threads 16 --packages 200000
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from benchmarks.synthetic import generate_packages
+from homework import read_package
+from service import CalculatorService
+
+
+def per_request(workout_type: str, data: list):
+    """Прежний способ: объект тренировки на каждый запрос."""
+    return read_package(workout_type, data).show_training_info()
+
+
+def run(call: Callable, packages: list, threads: int) -> float:
+    """Обработать пакеты из `threads` потоков, вернуть время."""
+    def worker(offset: int) -> None:
+        for i in range(offset, len(packages), threads):
+            call(*packages[i])
+
+    start: float = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(worker, range(threads)))
+    return time.perf_counter() - start
+
+
+def run_bursts(service: CalculatorService, packages: list, threads: int,
+               burst: int) -> float:
+    """Отправлять пакеты пачками по `burst` без ожидания, вернуть время."""
+    def worker(offset: int) -> None:
+        mine: list = packages[offset::threads]
+        for start in range(0, len(mine), burst):
+            futures: list = [service.submit(*package)
+                             for package in mine[start:start + burst]]
+            for future in futures:
+                future.result()
+
+    start: float = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(worker, range(threads)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--packages', type=int, default=200_000)
+    parser.add_argument('--window', type=float, default=0.0005)
+    parser.add_argument('--burst', type=int, default=256)
+    args = parser.parse_args()
+    packages: list = list(generate_packages(args.packages))
+    calculator: CalculatorService = CalculatorService()
+    with CalculatorService(batch_window=args.window) as batched:
+        cases: dict = {
+            'read_package + show_training_info': per_request,
+            'CalculatorService.calculate': calculator.calculate,
+            'CalculatorService.calculate_batched':
+                batched.calculate_batched,
+        }
+        for name, call in cases.items():
+            elapsed: float = run(call, packages, args.threads)
+            print(f'{name}: {len(packages) / elapsed:,.0f} packages/s, '
+                  f'{elapsed / len(packages) * 1e9:.0f} ns/package')
+        batches: int = batched.batches
+        elapsed = run_bursts(batched, packages, args.threads, args.burst)
+        print(f'CalculatorService.submit x{args.burst}: '
+              f'{len(packages) / elapsed:,.0f} packages/s, '
+              f'{elapsed / len(packages) * 1e9:.0f} ns/package')
+        bursts: int = batched.batches - batches
+        print(f'микропакетов: {batches} и {bursts}, в среднем '
+              f'{len(packages) / max(batches, 1):.1f} и '
+              f'{len(packages) / max(bursts, 1):.1f} запросов')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Обновление текущей тренировки против пересоздания объекта.
+
+Сравнивает время обработки одного показания датчика с чтением
+метрик и память на одну сессию по данным tracemalloc.
+
+Запуск: python -m benchmarks.bench_sessions --sessions 10000
+"""
+import argparse
+import timeit
+import tracemalloc
+
+from homework import read_package
+from sessions import SessionStore
+
+WEIGHT: float = 75
+PARAMS: dict = {'RUN': (), 'WLK': (180,), 'SWM': (25,)}
+STEP: float = 5 / 3600
+
+
+def rebuild(totals: dict, workout_type: str, sessions: int) -> None:
+    """Прежний способ: новый объект тренировки на каждое показание."""
+    laps: tuple = (1,) if workout_type == 'SWM' else ()
+    for key in range(sessions):
+        action, duration = totals[key]
+        action += 12
+        duration += STEP
+        totals[key] = action, duration
+        read_package(workout_type, [action, duration, WEIGHT,
+                                    *PARAMS[workout_type],
+                                    *laps]).show_training_info()
+
+
+def update(store: SessionStore, workout_type: str, sessions: int) -> None:
+    laps: int = 1 if workout_type == 'SWM' else 0
+    for key in range(sessions):
+        store.update(key, 12, STEP, laps).show_training_info()
+
+
+def session_memory(workout_type: str, sessions: int) -> float:
+    """Средний прирост памяти на одну начатую сессию."""
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    store: SessionStore = SessionStore()
+    for key in range(sessions):
+        store.start(key, workout_type, WEIGHT, *PARAMS[workout_type])
+        store.update(key, 12, STEP, 1 if workout_type == 'SWM' else 0)
+    after: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / sessions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sessions', type=int, default=10_000)
+    parser.add_argument('--updates', type=int, default=20)
+    args = parser.parse_args()
+    for workout_type in PARAMS:
+        totals: dict = dict.fromkeys(range(args.sessions), (0, 0.0))
+        store: SessionStore = SessionStore()
+        for key in range(args.sessions):
+            store.start(key, workout_type, WEIGHT, *PARAMS[workout_type])
+        size: int = args.sessions * args.updates
+        old: float = timeit.timeit(
+            lambda: rebuild(totals, workout_type, args.sessions),
+            number=args.updates)
+        new: float = timeit.timeit(
+            lambda: update(store, workout_type, args.sessions),
+            number=args.updates)
+        memory: float = session_memory(workout_type, args.sessions)
+        print(f'{workout_type}: rebuild {old / size * 1e9:.0f} ns/update, '
+              f'session {new / size * 1e9:.0f} ns/update, '
+              f'{memory:.0f} B/session')
+
+
+if __name__ == '__main__':
+    main()
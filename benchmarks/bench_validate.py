@@ -0,0 +1,59 @@
+"""Стоимость проверки пакета против создания объекта тренировки.
+
+Запуск: python -m benchmarks.bench_validate --packages 1000000 --bad 0.01
+Доля `--bad` пакетов портится: нулевая длительность или лишний параметр.
+"""
+import argparse
+import random
+import timeit
+
+from batch import compute_batch
+from benchmarks.synthetic import generate_packages
+from homework import read_package, read_packages
+from validate import validate_rows
+
+
+def checked_messages(workout_type: str, rows: list) -> list:
+    """Построчный расчёт с перехватом ошибок каждого пакета."""
+    messages: list = []
+    for data in rows:
+        try:
+            messages.append(
+                read_package(workout_type, data).show_training_info())
+        except (TypeError, ValueError, ZeroDivisionError):
+            pass
+    return messages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--packages', type=int, default=1_000_000)
+    parser.add_argument('--bad', type=float, default=0.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    rng: random.Random = random.Random(0)
+    for workout_type in ('RUN', 'WLK', 'SWM'):
+        rows: list = [data for _, data in generate_packages(
+            args.packages, workout_types=(workout_type,))]
+        for i in rng.sample(range(len(rows)),
+                            int(len(rows) * args.bad)):
+            rows[i] = (rows[i] + [1] if rng.random() < 0.5
+                       else [rows[i][0], 0, *rows[i][2:]])
+        cases: dict = {
+            'validate_rows': lambda: validate_rows(workout_type, rows),
+            'validate_rows + compute_batch': lambda: compute_batch(
+                workout_type, validate_rows(workout_type, rows).columns),
+            'try/except read_package': lambda: checked_messages(
+                workout_type, rows),
+            'read_packages': lambda: read_packages(workout_type, [
+                data for data in rows if len(data) == len(rows[0])]),
+        }
+        for name, case in cases.items():
+            best: float = min(timeit.repeat(case, number=1,
+                                            repeat=args.repeat))
+            print(f'{workout_type} {name}: '
+                  f'{best / len(rows) * 1e9:.0f} ns/package')
+
+
+if __name__ == '__main__':
+    main()
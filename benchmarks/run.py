@@ -0,0 +1,198 @@
+"""Набор бенчмарков горячих путей homework.py с сохранением в JSON.
+
+Запуск:
+    python -m benchmarks.run --sizes 1000,1000000,10000000 -o bench.json
+    python -m benchmarks.run --sizes 1000 --compare bench.json
+
+Входные пакеты берутся из синтетического генератора: пул различных
+пакетов повторяется по кругу до нужного размера, чтобы 10M пакетов
+не занимали гигабайты памяти.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from itertools import cycle, islice
+from typing import Callable, Dict, List, Optional
+
+import homework
+from benchmarks.synthetic import generate_packages
+
+POOL_SIZE: int = 100_000
+DEFAULT_SIZES: str = '1000,1000000,10000000'
+
+
+def package_pool(size: int, workout_types=('RUN', 'WLK', 'SWM')) -> list:
+    """Получить пул различных пакетов для повторения."""
+    return list(generate_packages(min(size, POOL_SIZE),
+                                  workout_types=workout_types))
+
+
+def stream(pool: list, size: int):
+    """Перебрать `size` элементов пула по кругу."""
+    return islice(cycle(pool), size)
+
+
+def bench_read_package(size: int) -> Callable[[], None]:
+    pool: list = package_pool(size)
+    read_package = homework.read_package
+
+    def run() -> None:
+        for workout_type, data in stream(pool, size):
+            read_package(workout_type, data)
+    return run
+
+
+def bench_spent_calories(workout_type: str) -> Callable[[int], Callable]:
+    def prepare(size: int) -> Callable[[], None]:
+        pool: list = [homework.read_package(*package) for package in
+                      package_pool(size, (workout_type,))]
+
+        def run() -> None:
+            for training in stream(pool, size):
+                training.invalidate()
+                training.get_spent_calories()
+        return run
+    return prepare
+
+
+def bench_show_training_info(size: int) -> Callable[[], None]:
+    pool: list = [homework.read_package(*package)
+                  for package in package_pool(size)]
+
+    def run() -> None:
+        for training in stream(pool, size):
+            training.invalidate()
+            training.show_training_info()
+    return run
+
+
+def bench_get_message(size: int) -> Callable[[], None]:
+    pool: list = [homework.read_package(*package).show_training_info()
+                  for package in package_pool(size)]
+
+    def run() -> None:
+        for message in stream(pool, size):
+            message.get_message()
+    return run
+
+
+def bench_format_many(size: int) -> Callable[[], None]:
+    pool: list = [homework.read_package(*package).show_training_info()
+                  for package in package_pool(size)]
+
+    def run() -> None:
+        homework.format_many(stream(pool, size))
+    return run
+
+
+def bench_main(size: int) -> Callable[[], None]:
+    pool: list = package_pool(size)
+
+    def run() -> None:
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            for workout_type, data in stream(pool, size):
+                homework.main(homework.read_package(workout_type, data))
+    return run
+
+
+BENCHMARKS: Dict[str, Callable[[int], Callable[[], None]]] = {
+    'read_package': bench_read_package,
+    'Running.get_spent_calories': bench_spent_calories('RUN'),
+    'SportsWalking.get_spent_calories': bench_spent_calories('WLK'),
+    'Swimming.get_spent_calories': bench_spent_calories('SWM'),
+    'show_training_info': bench_show_training_info,
+    'InfoMessage.get_message': bench_get_message,
+    'format_many': bench_format_many,
+    'main': bench_main,
+}
+
+
+def git_commit() -> Optional[str]:
+    """Получить текущий коммит, если бенчмарк запущен из git-репозитория."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes: List[int], names: List[str],
+                   repeat: int) -> dict:
+    """Запустить бенчмарки и собрать результаты."""
+    results: List[dict] = []
+    for size in sizes:
+        for name in names:
+            run: Callable[[], None] = BENCHMARKS[name](size)
+            timings: List[float] = []
+            for _ in range(repeat):
+                start: float = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - start)
+            best: float = min(timings)
+            results.append({
+                'name': name,
+                'size': size,
+                'seconds': best,
+                'ns_per_op': best / size * 1e9,
+            })
+            print(f'{name:<36} size={size:<10} '
+                  f'{best / size * 1e9:>9.1f} ns/op', file=sys.stderr)
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(base: dict, current: dict) -> None:
+    """Вывести изменение времени относительно прежнего прогона."""
+    previous: dict = {(r['name'], r['size']): r['ns_per_op']
+                      for r in base['results']}
+    print(f'base {base["meta"]["commit"]} -> '
+          f'current {current["meta"]["commit"]}')
+    for result in current['results']:
+        key: tuple = (result['name'], result['size'])
+        if key not in previous:
+            continue
+        ratio: float = result['ns_per_op'] / previous[key]
+        print(f'{result["name"]:<36} size={result["size"]:<10} '
+              f'{previous[key]:>9.1f} -> {result["ns_per_op"]:>9.1f} '
+              f'ns/op ({ratio:.2f}x)')
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=DEFAULT_SIZES)
+    parser.add_argument('--only', action='append', choices=BENCHMARKS,
+                        help='запустить только указанные бенчмарки')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('-o', '--output', help='файл для результатов JSON')
+    parser.add_argument('--compare', help='JSON прежнего прогона')
+    args = parser.parse_args(argv)
+    sizes: List[int] = [int(size) for size in args.sizes.split(',')]
+    results: dict = run_benchmarks(sizes, args.only or list(BENCHMARKS),
+                                   args.repeat)
+    if args.output:
+        with open(args.output, 'w') as out:
+            json.dump(results, out, indent=2)
+    if args.compare:
+        with open(args.compare) as src:
+            compare(json.load(src), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Генератор синтетических пакетов данных от блока датчиков."""
+import random
+from typing import Iterator, Sequence, Tuple
+
+WORKOUT_TYPES: Tuple[str, ...] = ('RUN', 'WLK', 'SWM')
+FIELDS_COUNT: dict = {'RUN': 3, 'WLK': 4, 'SWM': 5}
+
+
+def random_package(rnd: random.Random, workout_type: str) -> list:
+    """Сгенерировать данные одного пакета указанного типа."""
+    data: list = [
+        rnd.randint(500, 30000),
+        round(rnd.uniform(0.25, 3.0), 2),
+        round(rnd.uniform(45.0, 120.0), 1),
+    ]
+    if workout_type == 'WLK':
+        data.append(rnd.randint(150, 200))
+    elif workout_type == 'SWM':
+        data.append(rnd.choice((25, 50)))
+        data.append(rnd.randint(10, 80))
+    return data
+
+
+def generate_packages(count: int,
+                      seed: int = 0,
+                      workout_types: Sequence[str] = WORKOUT_TYPES,
+                      ) -> Iterator[Tuple[str, list]]:
+    """Сгенерировать поток пакетов `(workout_type, data)`."""
+    rnd: random.Random = random.Random(seed)
+    for _ in range(count):
+        workout_type: str = rnd.choice(workout_types)
+        yield workout_type, random_package(rnd, workout_type)
+
+
+def generate_columns(workout_type: str, count: int, seed: int = 0) -> list:
+    """Сгенерировать строки одного типа тренировки в виде колонок."""
+    rnd: random.Random = random.Random(seed)
+    columns: list = [[] for _ in range(FIELDS_COUNT[workout_type])]
+    for _ in range(count):
+        for column, value in zip(columns,
+                                 random_package(rnd, workout_type)):
+            column.append(value)
+    return columns
+
+
+def write_packages(path: str, count: int, seed: int = 0) -> None:
+    """Записать пакеты в файл в строковом формате конвейера."""
+    from pipeline import format_package
+
+    with open(path, 'w') as out:
+        for workout_type, data in generate_packages(count, seed):
+            out.write(format_package(workout_type, data) + '\n')
@@ -0,0 +1,217 @@
+"""Кэш сообщений о тренировках для повторяющихся пакетов.
+
+Повторно присланный пакет ``(workout_type, data)`` не рассчитывается
+заново: сообщение берётся из памяти, где давно не запрошенные записи
+вытесняются первыми (LRU), а записи старше `ttl` секунд устаревают.
+С `path` кэш дополнительно хранит сообщения в файле SQLite, и после
+перезапуска они читаются с диска вместо повторного расчёта::
+
+    with ResultCache(maxsize=100_000, ttl=3600, path='cache.db') as cache:
+        print(cache.get_text('RUN', [15000, 1, 75]))
+
+Пакеты с равными значениями параметров (``15000`` и ``15000.0``)
+считаются одним пакетом.
+"""
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence
+
+from homework import InfoMessage, read_package
+
+DEFAULT_MAXSIZE: int = 100_000
+COMMIT_EVERY: int = 1024
+NEVER: float = float('inf')
+
+# Запись кэша: [срок годности, сообщение, текст сообщения или None].
+EXPIRES, MESSAGE, TEXT = range(3)
+
+SCHEMA: str = '''
+CREATE TABLE IF NOT EXISTS messages (
+    package TEXT PRIMARY KEY,
+    expires REAL,
+    training_type TEXT,
+    duration REAL,
+    distance REAL,
+    speed REAL,
+    calories REAL
+)
+'''
+
+
+def disk_key(key: tuple) -> str:
+    """Получить ключ пакета для таблицы на диске."""
+    workout_type, *data = key
+    return ' '.join([workout_type, *(repr(float(value)) for value in data)])
+
+
+class CacheStats:
+    """Счётчики обращений к кэшу."""
+
+    __slots__ = ('hits', 'disk_hits', 'misses', 'evictions', 'expirations')
+
+    def __init__(self) -> None:
+        self.hits: int = 0
+        self.disk_hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    def __repr__(self) -> str:
+        fields: str = ', '.join(f'{name}={value}' for name, value
+                                in self.as_dict().items())
+        return f'{type(self).__name__}({fields})'
+
+    def as_dict(self) -> dict:
+        """Получить счётчики словарём."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def hit_rate(self) -> float:
+        """Получить долю запросов, обслуженных без расчёта."""
+        hits: int = self.hits + self.disk_hits
+        total: int = hits + self.misses
+        return hits / total if total else 0.0
+
+
+class ResultCache:
+    """Ограниченный кэш сообщений по содержимому пакета.
+
+    В памяти хранится не больше `maxsize` записей. Срок жизни `ttl`
+    отсчитывается по часам `clock` от момента расчёта; без `ttl` записи
+    не устаревают. Таблица на диске не ограничена по размеру, устаревшие
+    записи удаляет `prune()`.
+    """
+
+    def __init__(self,
+                 maxsize: int = DEFAULT_MAXSIZE,
+                 ttl: Optional[float] = None,
+                 path: Optional[str] = None,
+                 clock: Callable[[], float] = time.time,
+                 ) -> None:
+        if maxsize < 1:
+            raise ValueError('Размер кэша должен быть положительным.')
+        self.maxsize: int = maxsize
+        self.ttl: Optional[float] = ttl
+        self.clock: Callable[[], float] = clock
+        self.stats: CacheStats = CacheStats()
+        self._entries: OrderedDict = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._pending: int = 0
+        if path is not None:
+            self._db = sqlite3.connect(path)
+            # Потеря последних записей при сбое для кэша не страшна.
+            self._db.execute('PRAGMA journal_mode = WAL')
+            self._db.execute('PRAGMA synchronous = NORMAL')
+            self._db.execute(SCHEMA)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_message(self, workout_type: str, data: Sequence) -> InfoMessage:
+        """Получить сообщение о тренировке по пакету."""
+        return self._lookup(workout_type, data)[MESSAGE]
+
+    def get_text(self, workout_type: str, data: Sequence) -> str:
+        """Получить текст сообщения о тренировке по пакету."""
+        entry: list = self._lookup(workout_type, data)
+        text: Optional[str] = entry[TEXT]
+        if text is None:
+            text = entry[TEXT] = entry[MESSAGE].get_message()
+        return text
+
+    def _lookup(self, workout_type: str, data: Sequence) -> list:
+        """Найти запись пакета или рассчитать и сохранить её."""
+        key: tuple = (workout_type, *data)
+        entries: OrderedDict = self._entries
+        entry: Optional[list] = entries.get(key)
+        if entry is not None:
+            if self.ttl is None or entry[EXPIRES] > self.clock():
+                entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry
+            del entries[key]
+            self.stats.expirations += 1
+        entry = self._load(key) if self._db is not None else None
+        if entry is None:
+            message: InfoMessage = read_package(
+                workout_type, data).show_training_info()
+            self.stats.misses += 1
+            entry = [self._expires(), message, None]
+            if self._db is not None:
+                self._save(key, entry)
+        else:
+            self.stats.disk_hits += 1
+        entries[key] = entry
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.stats.evictions += 1
+        return entry
+
+    def _expires(self) -> float:
+        """Получить срок годности новой записи."""
+        return NEVER if self.ttl is None else self.clock() + self.ttl
+
+    def _load(self, key: tuple) -> Optional[list]:
+        """Прочитать запись с диска, если она есть и не устарела."""
+        row: Optional[tuple] = self._db.execute(
+            'SELECT expires, training_type, duration, distance, speed, '
+            'calories FROM messages WHERE package = ?', (disk_key(key),)
+        ).fetchone()
+        if row is None:
+            return None
+        expires, *fields = row
+        if expires is None:
+            expires = NEVER
+        elif expires <= self.clock():
+            self.stats.expirations += 1
+            return None
+        return [expires, InfoMessage(*fields), None]
+
+    def _save(self, key: tuple, entry: list) -> None:
+        """Записать запись на диск; фиксация — пачками по COMMIT_EVERY."""
+        message: InfoMessage = entry[MESSAGE]
+        expires: Optional[float] = (None if entry[EXPIRES] == NEVER
+                                    else entry[EXPIRES])
+        self._db.execute(
+            'INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (disk_key(key), expires, *message.as_tuple()))
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self.flush()
+
+    def prune(self) -> int:
+        """Удалить устаревшие записи в памяти и на диске, вернуть их число."""
+        now: float = self.clock()
+        expired: List[tuple] = [key for key, entry in self._entries.items()
+                                if entry[EXPIRES] <= now]
+        for key in expired:
+            del self._entries[key]
+        removed: int = len(expired)
+        if self._db is not None:
+            removed += self._db.execute(
+                'DELETE FROM messages WHERE expires <= ?', (now,)).rowcount
+            self.flush()
+        return removed
+
+    def clear(self) -> None:
+        """Очистить кэш в памяти; записи на диске сохраняются."""
+        self._entries.clear()
+
+    def flush(self) -> None:
+        """Зафиксировать записанные на диск сообщения."""
+        if self._db is not None:
+            self._db.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        """Зафиксировать записи и закрыть файл кэша."""
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+    def __enter__(self) -> 'ResultCache':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
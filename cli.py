@@ -0,0 +1,140 @@
+"""Расчёт тренировок по файлам пакетов из командной строки.
+
+Пакеты читаются из файлов или stdin в формате конвейера, по одному
+в строке: ``RUN 15000 1 75``. Отчёты пишутся крупными блоками в stdout
+или файл в одном из форматов: text (сообщения InfoMessage), csv или
+jsonl. В csv и jsonl значения выводятся с полной точностью. Код возврата
+1 означает, что часть строк пропущена как некорректные или неизвестные.
+
+Запуск: python cli.py packages.txt -f csv -o report.csv
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+from math import isfinite
+from typing import Callable, Dict, Iterable, List, Optional, TextIO
+
+from homework import InfoMessage, format_many
+from instrument import Recorder
+from pipeline import DEFAULT_CHUNK_SIZE, PipelineStats, run_pipeline
+
+OUTPUT_BUFFER_SIZE: int = 1 << 20
+CSV_FIELDS: List[str] = ['training_type', 'duration', 'distance', 'speed',
+                         'calories']
+
+
+def format_csv(messages: Iterable[InfoMessage]) -> str:
+    """Получить строки CSV без заголовка."""
+    buffer: io.StringIO = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(
+        (message.training_type, message.duration, message.distance,
+         message.speed, message.calories)
+        for message in messages
+    )
+    return buffer.getvalue()
+
+
+JSONL_TEMPLATE: str = ('{"training_type": %s, "duration": %s, '
+                       '"distance": %s, "speed": %s, "calories": %s}')
+
+
+def _jsonl_line(message: InfoMessage) -> str:
+    """Записать сообщение с нечисловыми значениями, как их пишет json."""
+    return JSONL_TEMPLATE % tuple(map(json.dumps, message.as_tuple()))
+
+
+def format_jsonl(messages: Iterable[InfoMessage]) -> str:
+    """Получить по одному JSON-объекту на строку.
+
+    Конечные числа записываются через ``repr`` — так же, как их пишет
+    json, но быстрее. Если среди значений есть nan или inf, строка
+    собирается через ``json.dumps``, чтобы её прочитал ``json.loads``.
+    """
+    lines: List[str] = [
+        JSONL_TEMPLATE % (
+            json.dumps(message.training_type), repr(message.duration),
+            repr(message.distance), repr(message.speed),
+            repr(message.calories))
+        if isfinite(message.duration + message.distance + message.speed
+                    + message.calories)
+        else _jsonl_line(message)
+        for message in messages
+    ]
+    lines.append('')
+    return '\n'.join(lines)
+
+
+FORMATS: Dict[str, Callable[[Iterable[InfoMessage]], str]] = {
+    'text': format_many,
+    'csv': format_csv,
+    'jsonl': format_jsonl,
+}
+HEADERS: Dict[str, str] = {
+    'csv': ','.join(CSV_FIELDS) + '\n',
+}
+
+
+def run(inputs: List[TextIO],
+        out: TextIO,
+        output_format: str = 'text',
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        recorder: Optional[Recorder] = None,
+        ) -> PipelineStats:
+    """Обработать входные потоки по очереди и записать отчёт в `out`."""
+    out.write(HEADERS.get(output_format, ''))
+    total: PipelineStats = PipelineStats()
+    for src in inputs:
+        stats: PipelineStats = run_pipeline(
+            src, out, chunk_size, recorder, FORMATS[output_format])
+        for name, value in vars(stats).items():
+            setattr(total, name, getattr(total, name) + value)
+    return total
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='*', metavar='FILE',
+                        help='файлы пакетов, по умолчанию stdin; - — stdin')
+    parser.add_argument('-o', '--output',
+                        help='файл отчёта, по умолчанию stdout')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='text')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--profile', metavar='PATH',
+                        help='сохранить статистику этапов в JSON')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='не выводить итоговую статистику в stderr')
+    args = parser.parse_args(argv)
+
+    recorder: Optional[Recorder] = Recorder() if args.profile else None
+    inputs: List[TextIO] = [
+        sys.stdin if path == '-' else open(path)
+        for path in args.inputs or ['-']
+    ]
+    out: TextIO = (open(args.output, 'w', buffering=OUTPUT_BUFFER_SIZE)
+                   if args.output else sys.stdout)
+    try:
+        stats: PipelineStats = run(inputs, out, args.format,
+                                   args.chunk_size, recorder)
+    finally:
+        for src in inputs:
+            if src is not sys.stdin:
+                src.close()
+        if out is sys.stdout:
+            out.flush()
+        else:
+            out.close()
+    if not args.quiet:
+        print(stats, file=sys.stderr)
+    if recorder is not None:
+        recorder.dump(args.profile)
+        print(recorder.summary(), file=sys.stderr)
+    return 1 if stats.malformed or stats.unknown else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
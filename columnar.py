@@ -0,0 +1,305 @@
+"""Колоночный файл результатов расчёта тренировок.
+
+Сообщения InfoMessage хранятся группами строк. Группа начинается
+с заголовка ``<II`` (число строк, размер словаря), за ним идут словарь
+видов тренировок (длина ``<H`` и имя в UTF-8 на каждый вид), коды видов
+по байту на строку, выравнивание до 8 байт и колонки `duration`,
+`distance`, `speed` и `calories` — little-endian float64 полной
+точности. В конце файла — смещения групп ``<Q`` и хвост ``<QQ4s``
+(число групп, число строк, сигнатура).
+
+Писатель держит в памяти только текущую группу, поэтому файл можно
+писать прямо из конвейера; читатель отображает файл через mmap
+и отдаёт колонки групп без копирования.
+
+Запуск: python columnar.py packages.txt -o report.wcf
+"""
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+from typing import (BinaryIO, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, TextIO)
+
+from batch import BatchResult
+from homework import InfoMessage
+from pipeline import (DEFAULT_CHUNK_SIZE, PipelineStats, build_trainings,
+                      parse_packages, read_lines, show_info)
+
+MAGIC: bytes = b'WCF1'
+GROUP_HEADER: struct.Struct = struct.Struct('<II')
+NAME_LENGTH: struct.Struct = struct.Struct('<H')
+TRAILER: struct.Struct = struct.Struct('<QQ4s')
+FLOAT_COLUMNS: tuple = ('duration', 'distance', 'speed', 'calories')
+COLUMNS: tuple = ('training_type',) + FLOAT_COLUMNS
+DEFAULT_ROW_GROUP_SIZE: int = 64 * 1024
+MAX_DICTIONARY: int = 256
+LITTLE_ENDIAN: bool = sys.byteorder == 'little'
+
+
+class ColumnarFormatError(ValueError):
+    """Файл не соответствует колоночному формату."""
+
+
+def _padding(offset: int) -> int:
+    """Получить число байт до ближайшей границы 8 байт."""
+    return -offset % 8
+
+
+class ColumnarWriter:
+    """Запись сообщений о тренировках группами строк."""
+
+    def __init__(self,
+                 path: str,
+                 row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+                 ) -> None:
+        self.row_group_size: int = row_group_size
+        self.count: int = 0
+        self.offsets: array = array('Q')
+        self.file: BinaryIO = open(path, 'wb')
+        self.file.write(MAGIC)
+        self._dictionary: Dict[str, int] = {}
+        self._codes: bytearray = bytearray()
+        self._columns: List[array] = [array('d') for _ in FLOAT_COLUMNS]
+
+    def write(self, message: InfoMessage) -> None:
+        """Записать одно сообщение."""
+        self.write_many((message,))
+
+    def write_many(self, messages: Iterable[InfoMessage]) -> None:
+        """Записать сообщения, сбрасывая заполненные группы на диск.
+
+        `flush` очищает буферы на месте, поэтому локальные ссылки
+        на них остаются действительными.
+        """
+        dictionary: Dict[str, int] = self._dictionary
+        codes: bytearray = self._codes
+        duration, distance, speed, calories = self._columns
+        for message in messages:
+            code: Optional[int] = dictionary.get(message.training_type)
+            if code is None:
+                if len(dictionary) == MAX_DICTIONARY:
+                    self.flush()
+                code = dictionary[message.training_type] = len(dictionary)
+            codes.append(code)
+            duration.append(message.duration)
+            distance.append(message.distance)
+            speed.append(message.speed)
+            calories.append(message.calories)
+            if len(codes) >= self.row_group_size:
+                self.flush()
+
+    def write_batch(self, result: BatchResult) -> None:
+        """Записать результаты пакетного расчёта колонками."""
+        start: int = 0
+        while start < len(result):
+            code: Optional[int] = self._dictionary.get(result.training_type)
+            if code is None:
+                if len(self._dictionary) == MAX_DICTIONARY:
+                    self.flush()
+                code = self._dictionary[result.training_type] = len(
+                    self._dictionary)
+            end: int = min(len(result), start + self.row_group_size
+                           - len(self._codes))
+            self._codes.extend(bytes((code,)) * (end - start))
+            for column, values in zip(self._columns, (
+                    result.duration, result.distance, result.speed,
+                    result.calories)):
+                column.extend(values[start:end])
+            start = end
+            if len(self._codes) >= self.row_group_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Записать накопленную группу строк."""
+        rows: int = len(self._codes)
+        if not rows:
+            self._dictionary.clear()
+            return
+        self.offsets.append(self.file.tell())
+        names: List[bytes] = [name.encode()
+                              for name in self._dictionary]
+        parts: List[bytes] = [GROUP_HEADER.pack(rows, len(names))]
+        for name in names:
+            parts.append(NAME_LENGTH.pack(len(name)))
+            parts.append(name)
+        parts.append(bytes(self._codes))
+        size: int = sum(map(len, parts))
+        parts.append(bytes(_padding(self.file.tell() + size)))
+        self.file.write(b''.join(parts))
+        for column in self._columns:
+            if not LITTLE_ENDIAN:
+                column.byteswap()
+            column.tofile(self.file)
+        self.count += rows
+        self._dictionary.clear()
+        del self._codes[:]
+        for column in self._columns:
+            del column[:]
+
+    def close(self) -> None:
+        """Записать последнюю группу и оглавление, закрыть файл."""
+        if self.file.closed:
+            return
+        self.flush()
+        offsets: array = array('Q', self.offsets)
+        if not LITTLE_ENDIAN:
+            offsets.byteswap()
+        self.file.write(offsets.tobytes())
+        self.file.write(TRAILER.pack(len(self.offsets), self.count, MAGIC))
+        self.file.close()
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def write_columnar(path: str,
+                   messages: Iterable[InfoMessage],
+                   row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> int:
+    """Записать сообщения в файл, вернуть их число."""
+    with ColumnarWriter(path, row_group_size) as writer:
+        writer.write_many(messages)
+    return writer.count
+
+
+class ColumnarReader:
+    """Чтение колоночного файла через mmap.
+
+    Колонки float64 — срезы memoryview над отображённым файлом; они
+    действительны до `close()` и должны быть освобождены раньше него.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as src:
+            try:
+                self._mmap: mmap.mmap = mmap.mmap(src.fileno(), 0,
+                                                  access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ColumnarFormatError(f'{path}: пустой файл.')
+        size: int = len(self._mmap)
+        if size < len(MAGIC) + TRAILER.size:
+            self._mmap.close()
+            raise ColumnarFormatError(f'{path}: нет оглавления.')
+        groups, count, magic = TRAILER.unpack_from(self._mmap,
+                                                   size - TRAILER.size)
+        index_start: int = size - TRAILER.size - groups * 8
+        if (self._mmap[:len(MAGIC)] != MAGIC or magic != MAGIC
+                or index_start < len(MAGIC)):
+            self._mmap.close()
+            raise ColumnarFormatError(f'{path}: неизвестный формат.')
+        self.count: int = count
+        self.offsets: array = array('Q', self._mmap[index_start:
+                                                    size - TRAILER.size])
+        if not LITTLE_ENDIAN:
+            self.offsets.byteswap()
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def row_groups(self) -> int:
+        return len(self.offsets)
+
+    def read_row_group(self, index: int) -> Dict[str, Sequence]:
+        """Получить колонки группы строк по именам."""
+        offset: int = self.offsets[index]
+        rows, dictionary_size = GROUP_HEADER.unpack_from(self._mmap, offset)
+        offset += GROUP_HEADER.size
+        dictionary: List[str] = []
+        for _ in range(dictionary_size):
+            (length,) = NAME_LENGTH.unpack_from(self._mmap, offset)
+            offset += NAME_LENGTH.size
+            dictionary.append(
+                self._mmap[offset:offset + length].decode())
+            offset += length
+        codes: bytes = self._mmap[offset:offset + rows]
+        offset += rows + _padding(offset + rows)
+        columns: Dict[str, Sequence] = {
+            'training_type': list(map(dictionary.__getitem__, codes)),
+        }
+        for name in FLOAT_COLUMNS:
+            end: int = offset + rows * 8
+            view: memoryview = memoryview(self._mmap)[offset:end]
+            if LITTLE_ENDIAN:
+                columns[name] = view.cast('d')
+            else:
+                columns[name] = array('d', view.tobytes())
+                columns[name].byteswap()
+            view.release()
+            offset = end
+        return columns
+
+    def columns(self) -> Dict[str, Sequence]:
+        """Получить колонки всего файла, скопировав их из групп."""
+        result: Dict[str, Sequence] = {'training_type': []}
+        result.update((name, array('d')) for name in FLOAT_COLUMNS)
+        for index in range(self.row_groups):
+            group: Dict[str, Sequence] = self.read_row_group(index)
+            for name, column in group.items():
+                result[name].extend(column)
+                if isinstance(column, memoryview):
+                    column.release()
+        return result
+
+    def messages(self) -> Iterator[InfoMessage]:
+        """Перебрать сообщения о тренировках по порядку."""
+        for index in range(self.row_groups):
+            group: Dict[str, Sequence] = self.read_row_group(index)
+            try:
+                yield from map(InfoMessage,
+                               *(group[name] for name in COLUMNS))
+            finally:
+                for name in FLOAT_COLUMNS:
+                    if isinstance(group[name], memoryview):
+                        group[name].release()
+
+    def close(self) -> None:
+        """Освободить отображение файла."""
+        self._mmap.close()
+
+    def __enter__(self) -> 'ColumnarReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def export_pipeline(src: TextIO,
+                    path: str,
+                    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    ) -> PipelineStats:
+    """Рассчитать пакеты из текстового потока и записать колоночный файл."""
+    stats: PipelineStats = PipelineStats()
+    lines = read_lines(src, stats, chunk_size)
+    trainings = build_trainings(parse_packages(lines, stats), stats)
+    with ColumnarWriter(path, row_group_size) as writer:
+        writer.write_many(show_info(trainings, stats))
+    stats.written = writer.count
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Записать колоночный отчёт по файлу пакетов или stdin."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('input', nargs='?', help='файл пакетов, иначе stdin')
+    parser.add_argument('-o', '--output', required=True)
+    parser.add_argument('--row-group-size', type=int,
+                        default=DEFAULT_ROW_GROUP_SIZE)
+    args = parser.parse_args(argv)
+    src: TextIO = open(args.input) if args.input else sys.stdin
+    try:
+        stats: PipelineStats = export_pipeline(src, args.output,
+                                               args.row_group_size)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+    print(stats, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,401 @@
+"""Дифференциальная проверка быстрых движков по эталонным классам.
+
+Для каждого вида тренировки генерируются случайные допустимые пакеты
+(ограничения полей — `validate.RULES`): целые и дробные значения,
+крайние значения диапазонов. Каждый пакет считается эталоном
+``read_package(...).show_training_info()`` и зарегистрированными
+движками. Побитово точные движки должны совпадать с эталоном
+полностью, приближённые — в пределах `rel_tol`. Расхождения
+упрощаются жадно: поля заменяются более короткими числами, пока
+расхождение сохраняется.
+
+Порции пакетов генерируются по номеру из общего зерна, поэтому
+результат не зависит от числа процессов.
+
+Запуск: python differential.py --packages 1000000 --workers 4
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import exact
+import parallel
+from batch import compute_batch
+from cache import ResultCache
+from homework import WORKOUT_TYPES, InfoMessage, read_package
+from pipeline import PipelineStats
+from service import CalculatorService
+from sessions import LAP_FIELD, LiveSession
+from validate import DEFAULT_RULE, RULES
+
+DEFAULT_PACKAGES: int = 1_000_000
+DEFAULT_CHUNK_SIZE: int = 10_000
+MAX_EXAMPLES: int = 5
+MAX_SHRINKS: int = 1000
+
+# Диапазоны значений полей; поле без диапазона берёт DEFAULT_RANGE.
+RANGES: Dict[str, Tuple[float, float]] = {
+    'action': (0, 100_000),
+    'duration': (0.01, 24),
+    'weight': (1, 300),
+    'height': (50, 250),
+    'length_pool': (10, 100),
+    'count_pool': (0, 500),
+}
+DEFAULT_RANGE: Tuple[float, float] = (1, 1000)
+PARALLEL_WORKERS: int = 2
+PARALLEL_CHUNK_SIZE: int = 256
+
+Run = Callable[[str, List[list]], List[InfoMessage]]
+Mismatch = Tuple[list, tuple, tuple]
+
+
+@dataclass
+class Engine:
+    """Альтернативный способ расчёта сообщений о тренировках."""
+
+    name: str
+    run: Run
+    rel_tol: Optional[float] = None
+    default: bool = True
+    prepare: Optional[Callable[[list], list]] = None
+
+
+ENGINES: Dict[str, Engine] = {}
+
+
+def register_engine(name: str,
+                    rel_tol: Optional[float] = None,
+                    default: bool = True,
+                    prepare: Optional[Callable[[list], list]] = None,
+                    ) -> Callable[[Run], Run]:
+    """Зарегистрировать функцию расчёта пакетов одного вида.
+
+    `prepare` приводит пакет к входу, который движок считает на самом
+    деле (например, округляет), и эталон считается по нему.
+    """
+    def decorator(run: Run) -> Run:
+        ENGINES[name] = Engine(name, run, rel_tol, default, prepare)
+        return run
+    return decorator
+
+
+@register_engine('batch')
+def run_batch(workout_type: str, rows: List[list]) -> List[InfoMessage]:
+    fields: Tuple[str, ...] = WORKOUT_TYPES[workout_type].FIELDS
+    return list(compute_batch(workout_type,
+                              dict(zip(fields, zip(*rows)))).messages())
+
+
+@register_engine('service')
+def run_service(workout_type: str, rows: List[list]) -> List[InfoMessage]:
+    calculate = CalculatorService().calculate
+    return [calculate(workout_type, data) for data in rows]
+
+
+@register_engine('cache')
+def run_cache(workout_type: str, rows: List[list]) -> List[InfoMessage]:
+    cache: ResultCache = ResultCache()
+    for data in rows:
+        cache.get_message(workout_type, data)
+    return [cache.get_message(workout_type, data) for data in rows]
+
+
+@register_engine('sessions')
+def run_sessions(workout_type: str, rows: List[list]) -> List[InfoMessage]:
+    laps: bool = WORKOUT_TYPES[workout_type].FIELDS[-1] == LAP_FIELD
+    messages: List[InfoMessage] = []
+    for data in rows:
+        action, duration, *params = data
+        session: LiveSession = LiveSession(
+            workout_type, *(params[:-1] if laps else params))
+        session.observe(action, duration, params[-1] if laps else None)
+        messages.append(session.show_training_info())
+    return messages
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def parallel_executor() -> Optional[ProcessPoolExecutor]:
+    """Получить пул движка parallel, один на всю проверку.
+
+    Пул создаётся при первом вызове движка и служит всем порциям,
+    упрощению расхождений и пересчёту по одному пакету. В процессе пула
+    проверки (`--workers` больше 1) вложенный пул не создаётся: порции
+    считаются на месте, а по процессам их уже распределил внешний пул.
+    """
+    global _executor
+    if multiprocessing.parent_process() is not None:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(PARALLEL_WORKERS)
+    return _executor
+
+
+@register_engine('parallel')
+def run_parallel(workout_type: str, rows: List[list]) -> List[InfoMessage]:
+    packages: Iterator[parallel.Package] = (
+        (workout_type, data) for data in rows)
+    stats: PipelineStats = PipelineStats()
+    executor: Optional[ProcessPoolExecutor] = parallel_executor()
+    messages: List[InfoMessage] = list(
+        parallel.run_serial(packages, PARALLEL_CHUNK_SIZE, stats,
+                            process=parallel.compute_chunk)
+        if executor is None else
+        parallel.run_parallel(packages, PARALLEL_WORKERS,
+                              PARALLEL_CHUNK_SIZE, executor, stats,
+                              process=parallel.compute_chunk))
+    if stats.malformed:
+        raise ValueError(f'пропущено некорректных пакетов: '
+                         f'{stats.malformed}')
+    return messages
+
+
+def round_fixed(data: list) -> list:
+    """Округлить параметры пакета до точности `exact.SCALE`."""
+    return [exact.to_float(exact.to_fixed(value)) for value in data]
+
+
+@register_engine('exact', rel_tol=1e-9, default=False, prepare=round_fixed)
+def run_exact(workout_type: str, rows: List[list]) -> List[InfoMessage]:
+    fields: Tuple[str, ...] = WORKOUT_TYPES[workout_type].FIELDS
+    return list(exact.compute_batch(
+        workout_type, dict(zip(fields, zip(*rows)))).messages())
+
+
+def random_value(rnd: random.Random, name: str) -> float:
+    """Сгенерировать допустимое значение поля."""
+    low, high = RANGES.get(name, DEFAULT_RANGE)
+    choice: float = rnd.random()
+    if choice < 0.05:
+        value: float = low
+    elif choice < 0.4:
+        value = rnd.randint(math.ceil(low), int(high))
+    elif choice < 0.8:
+        value = round(rnd.uniform(low, high), rnd.randint(1, 3))
+    else:
+        value = rnd.uniform(low, high)
+    if not RULES.get(name, DEFAULT_RULE)(value):
+        return high
+    return value
+
+
+def generate_rows(workout_type: str, count: int,
+                  seed: str) -> List[list]:
+    """Сгенерировать `count` допустимых пакетов одного вида."""
+    rnd: random.Random = random.Random(seed)
+    fields: Tuple[str, ...] = WORKOUT_TYPES[workout_type].FIELDS
+    return [[random_value(rnd, name) for name in fields]
+            for _ in range(count)]
+
+
+def reference(workout_type: str, data: Sequence) -> tuple:
+    """Получить поля эталонного сообщения."""
+    message: InfoMessage = read_package(workout_type,
+                                        list(data)).show_training_info()
+    return message.as_tuple()
+
+
+def same(expected: tuple, actual: tuple, rel_tol: Optional[float]) -> bool:
+    """Совпадают ли сообщения с учётом допуска движка."""
+    if rel_tol is None or len(actual) != len(expected):
+        return expected == actual
+    return expected[0] == actual[0] and all(
+        math.isclose(a, b, rel_tol=rel_tol, abs_tol=rel_tol)
+        for a, b in zip(expected[1:], actual[1:]))
+
+
+def run_engine(engine: Engine, workout_type: str,
+               rows: List[list]) -> List[tuple]:
+    """Получить поля сообщений движка; ошибка пакета попадает в поле."""
+    try:
+        return [message.as_tuple()
+                for message in engine.run(workout_type, rows)]
+    except Exception as error:
+        if len(rows) == 1:
+            return [(f'{type(error).__name__}: {error}',)]
+    return list(chain.from_iterable(
+        run_engine(engine, workout_type, [data]) for data in rows))
+
+
+def find_mismatches(engine: Engine, workout_type: str,
+                    rows: List[list]) -> List[Mismatch]:
+    """Сравнить движок с эталоном на пакетах."""
+    prepare: Callable[[list], list] = engine.prepare or list
+    mismatches: List[Mismatch] = []
+    for data, actual in zip(rows, run_engine(engine, workout_type, rows)):
+        expected: tuple = reference(workout_type, prepare(data))
+        if not same(expected, actual, engine.rel_tol):
+            mismatches.append((data, expected, actual))
+    return mismatches
+
+
+@dataclass
+class ChunkResult:
+    """Итог проверки одной порции пакетов."""
+
+    checked: int
+    mismatches: int
+    examples: List[Mismatch]
+
+
+def check_chunk(engine_name: str, workout_type: str, seed: int,
+                index: int, size: int) -> ChunkResult:
+    """Сгенерировать и проверить порцию пакетов с номером `index`."""
+    rows: List[list] = generate_rows(workout_type, size,
+                                     f'{seed}:{workout_type}:{index}')
+    mismatches: List[Mismatch] = find_mismatches(
+        ENGINES[engine_name], workout_type, rows)
+    return ChunkResult(size, len(mismatches), mismatches[:MAX_EXAMPLES])
+
+
+def simplicity(value: float) -> Tuple[int, float]:
+    """Ключ простоты числа: короче запись, затем меньше модуль."""
+    return len(repr(value)), abs(value)
+
+
+def candidates(value: float) -> Iterator[float]:
+    """Более простые замены значения поля."""
+    yield from (0, 1, round(value), int(value) // 2, int(value) - 1)
+    for digits in range(1, 4):
+        yield round(value, digits)
+    yield value / 2
+
+
+def minimize(engine: Engine, workout_type: str, data: list) -> list:
+    """Жадно упростить пакет, сохраняя расхождение с эталоном."""
+    fields: Tuple[str, ...] = WORKOUT_TYPES[workout_type].FIELDS
+    data = list(data)
+    for _ in range(MAX_SHRINKS):
+        for position, name in enumerate(fields):
+            rule = RULES.get(name, DEFAULT_RULE)
+            replacement: Optional[float] = next((
+                value for value in candidates(data[position])
+                if simplicity(value) < simplicity(data[position])
+                and rule(value)
+                and find_mismatches(engine, workout_type, [
+                    data[:position] + [value] + data[position + 1:]])),
+                None)
+            if replacement is not None:
+                data[position] = replacement
+                break
+        else:
+            return data
+    return data
+
+
+@dataclass
+class Counterexample:
+    """Расхождение движка с эталоном и упрощённый пакет."""
+
+    data: list
+    minimized: list
+    expected: tuple
+    actual: tuple
+
+
+def counterexample(engine: Engine, workout_type: str,
+                   data: list) -> Counterexample:
+    """Упростить пакет и получить расхождение на упрощённом пакете."""
+    minimized: list = minimize(engine, workout_type, data)
+    _, expected, actual = find_mismatches(engine, workout_type,
+                                          [minimized])[0]
+    return Counterexample(data, minimized, expected, actual)
+
+
+@dataclass
+class Report:
+    """Итог проверки одного движка на одном виде тренировки."""
+
+    engine: str
+    workout_type: str
+    checked: int = 0
+    mismatches: int = 0
+    counterexamples: List[Counterexample] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        """Сводка и упрощённые расхождения по строке на каждое."""
+        lines: List[str] = [
+            f'{self.engine} {self.workout_type}: {self.checked} пакетов, '
+            f'{self.mismatches} расхождений']
+        for example in self.counterexamples:
+            lines.append(f'  {example.minimized}: ожидалось '
+                         f'{example.expected}, получено {example.actual}'
+                         f' (исходный пакет {example.data})')
+        return '\n'.join(lines)
+
+
+def _tasks(engines: Sequence[str], workout_types: Sequence[str],
+           packages: int, chunk_size: int,
+           seed: int) -> Iterator[tuple]:
+    for engine in engines:
+        for workout_type in workout_types:
+            for index, start in enumerate(range(0, packages, chunk_size)):
+                yield (engine, workout_type, seed, index,
+                       min(chunk_size, packages - start))
+
+
+def run_differential(engines: Optional[Sequence[str]] = None,
+                     workout_types: Sequence[str] = tuple(WORKOUT_TYPES),
+                     packages: int = DEFAULT_PACKAGES,
+                     seed: int = 0,
+                     workers: int = 1,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     ) -> List[Report]:
+    """Проверить движки на `packages` пакетах каждого вида тренировки."""
+    if engines is None:
+        engines = [name for name, engine in ENGINES.items()
+                   if engine.default]
+    reports: Dict[Tuple[str, str], Report] = {
+        (engine, workout_type): Report(engine, workout_type)
+        for engine in engines for workout_type in workout_types}
+    tasks: List[tuple] = list(_tasks(engines, workout_types, packages,
+                                     chunk_size, seed))
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(check_chunk, *zip(*tasks)))
+    else:
+        results = [check_chunk(*task) for task in tasks]
+    for (engine, workout_type, *_), result in zip(tasks, results):
+        report: Report = reports[engine, workout_type]
+        report.checked += result.checked
+        report.mismatches += result.mismatches
+        for data, *_ in result.examples:
+            if len(report.counterexamples) < MAX_EXAMPLES:
+                report.counterexamples.append(counterexample(
+                    ENGINES[engine], workout_type, data))
+    return list(reports.values())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Проверить движки и завершиться с кодом 1 при расхождениях."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--engine', action='append', choices=ENGINES,
+                        help='по умолчанию все побитово точные движки')
+    parser.add_argument('--workout-type', action='append',
+                        choices=WORKOUT_TYPES)
+    parser.add_argument('--packages', type=int, default=DEFAULT_PACKAGES,
+                        help='число пакетов каждого вида тренировки')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    reports: List[Report] = run_differential(
+        args.engine, args.workout_type or tuple(WORKOUT_TYPES),
+        args.packages, args.seed, args.workers, args.chunk_size)
+    for report in reports:
+        print(report)
+    if any(report.mismatches for report in reports):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
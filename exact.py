@@ -0,0 +1,263 @@
+"""Точный расчёт показателей тренировок в целых числах с фиксированной точкой.
+
+Значение хранится как целое число единиц ``1 / SCALE``: дистанция
+1.234 км — это ``1_234_000_000``. Формулы классов тренировок приведены
+к одной дроби целых чисел, поэтому каждый показатель — это точное
+значение формулы, округлённое один раз до единицы к ближайшему
+(половина — вверх). Целочисленное деление спортивной ходьбы (``//``)
+тоже берётся от точного значения. Результат не зависит от порядка
+вычисления и движка: скалярные функции и `compute_batch` дают одни
+и те же целые числа.
+
+Результаты точного режима отличаются от float-методов классов
+на ошибки округления float, например калории ходьбы 157.5 вместо
+157.50000000000003. Параметры пакета, в том числе длительность
+в сообщении, округляются до 9 знаков после запятой.
+"""
+from array import array
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import repeat
+from operator import add, floordiv, mul, sub
+from typing import Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+from homework import (WORKOUT_TYPES, InfoMessage, Running, SportsWalking,
+                      Swimming, Training)
+
+SCALE: int = 10 ** 9
+
+Metrics = Tuple[int, int, int]
+
+
+def to_fixed(value: float) -> int:
+    """Перевести число в целые единицы 1 / SCALE."""
+    return round(value * SCALE)
+
+
+def to_float(value: int) -> float:
+    """Получить ближайший к значению float."""
+    return value / SCALE
+
+
+def to_decimal(value: int) -> Decimal:
+    """Получить значение точно в виде Decimal."""
+    return Decimal(value).scaleb(-9)
+
+
+def _round_div(numerator: int, denominator: int) -> int:
+    """Частное с округлением к ближайшему, половина — вверх."""
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def _constants(cls: type, *names: str) -> Tuple[int, ...]:
+    """Получить константы класса тренировки в единицах 1 / SCALE."""
+    return tuple(to_fixed(getattr(cls, name)) for name in names)
+
+
+RUN_LEN_STEP, RUN_COEF_1, RUN_COEF_2 = _constants(
+    Running, 'LEN_STEP', 'COEF_CAL_1', 'COEF_CAL_2')
+WLK_LEN_STEP, WLK_COEF_1, WLK_COEF_2 = _constants(
+    SportsWalking, 'LEN_STEP', 'COEF_CAL_1', 'COEF_CAL_2')
+SWM_LEN_STEP, SWM_COEF_1, SWM_COEF_2 = _constants(
+    Swimming, 'LEN_STEP', 'COEF_CAL_1', 'COEF_CAL_2')
+M_IN_KM: int = Training.M_IN_KM
+MIN_IN_H: int = Training.MIN_IN_H
+
+# Формулы классов, приведённые к одной дроби целых чисел. Например,
+# калории бега (C1 * v - C2) * w / M * (d * 60) при v = a * ls / (M * d)
+# равны (C1 * a * ls - C2 * M * d) * w * 60 / M**2.
+RUN_CALORIES_DENOMINATOR: int = SCALE ** 3 * M_IN_KM ** 2
+WLK_STEPS_DENOMINATOR: int = SCALE * M_IN_KM ** 2
+WLK_CALORIES_DENOMINATOR: int = SCALE ** 2
+
+
+def _running(action: int, duration: int, weight: int) -> Metrics:
+    """Бег: дистанция, скорость и расход калорий."""
+    path: int = action * RUN_LEN_STEP
+    distance: int = _round_div(path, SCALE * M_IN_KM)
+    speed: int = _round_div(path, M_IN_KM * duration)
+    calories: int = _round_div(
+        (RUN_COEF_1 * path - RUN_COEF_2 * SCALE * M_IN_KM * duration)
+        * weight * MIN_IN_H,
+        RUN_CALORIES_DENOMINATOR)
+    return distance, speed, calories
+
+
+def _sports_walking(action: int, duration: int, weight: int,
+                    height: int) -> Metrics:
+    """Спортивная ходьба: дистанция, скорость и расход калорий."""
+    path: int = action * WLK_LEN_STEP
+    distance: int = _round_div(path, SCALE * M_IN_KM)
+    speed: int = _round_div(path, M_IN_KM * duration)
+    steps: int = path * path // (WLK_STEPS_DENOMINATOR
+                                 * duration * duration * height)
+    calories: int = _round_div(
+        (steps * WLK_COEF_2 * height + WLK_COEF_1 * weight)
+        * duration * MIN_IN_H,
+        WLK_CALORIES_DENOMINATOR)
+    return distance, speed, calories
+
+
+def _swimming(action: int, duration: int, weight: int,
+              length_pool: int, count_pool: int) -> Metrics:
+    """Плавание: дистанция, скорость и расход калорий."""
+    distance: int = _round_div(action * SWM_LEN_STEP, SCALE * M_IN_KM)
+    pool: int = length_pool * count_pool
+    denominator: int = M_IN_KM * duration
+    speed: int = _round_div(pool, denominator)
+    calories: int = _round_div(
+        (pool + SWM_COEF_1 * denominator) * SWM_COEF_2 * weight,
+        SCALE * SCALE * denominator)
+    return distance, speed, calories
+
+
+KERNELS: dict = {
+    'RUN': _running,
+    'WLK': _sports_walking,
+    'SWM': _swimming,
+}
+
+
+def metrics(workout_type: str, data: Sequence[float]) -> Metrics:
+    """Получить дистанцию, скорость и калории пакета в единицах 1 / SCALE."""
+    return KERNELS[workout_type](*map(to_fixed, data))
+
+
+def training_metrics(training: Training) -> Metrics:
+    """Получить дистанцию, скорость и калории тренировки точно."""
+    return metrics(training.CODE,
+                   [getattr(training, name) for name in training.FIELDS])
+
+
+def get_distance(training: Training) -> int:
+    """Получить дистанцию в км в единицах 1 / SCALE."""
+    return training_metrics(training)[0]
+
+
+def get_mean_speed(training: Training) -> int:
+    """Получить среднюю скорость в единицах 1 / SCALE."""
+    return training_metrics(training)[1]
+
+
+def get_spent_calories(training: Training) -> int:
+    """Получить количество затраченных калорий в единицах 1 / SCALE."""
+    return training_metrics(training)[2]
+
+
+def show_training_info(training: Training) -> InfoMessage:
+    """Получить информационное сообщение по точному расчёту.
+
+    Длительность в сообщении округлена до 9 знаков, как в
+    `ExactBatchResult.messages`.
+    """
+    distance, speed, calories = training_metrics(training)
+    return InfoMessage(type(training).__name__,
+                       to_float(to_fixed(training.duration)),
+                       to_float(distance), to_float(speed),
+                       to_float(calories))
+
+
+def _fixed(column: Iterable[float]) -> List[int]:
+    """Перевести колонку в единицы 1 / SCALE."""
+    return list(map(round, map(mul, column, repeat(SCALE))))
+
+
+def _scale(a: Iterable[int], factor: int) -> Iterator[int]:
+    return map(mul, a, repeat(factor))
+
+
+def _round_div_const(a: Iterable[int], denominator: int) -> Iterator[int]:
+    return map(floordiv, map(add, _scale(a, 2), repeat(denominator)),
+               repeat(2 * denominator))
+
+
+def _round_div_all(a: Iterable[int],
+                   denominators: List[int]) -> Iterator[int]:
+    return map(floordiv, map(add, _scale(a, 2), denominators),
+               _scale(denominators, 2))
+
+
+def _running_batch(action, duration, weight):
+    path = list(_scale(action, RUN_LEN_STEP))
+    distance = _round_div_const(path, SCALE * M_IN_KM)
+    speed = _round_div_all(path, list(_scale(duration, M_IN_KM)))
+    numerator = map(sub, _scale(path, RUN_COEF_1),
+                    _scale(duration, RUN_COEF_2 * SCALE * M_IN_KM))
+    calories = _round_div_const(
+        _scale(map(mul, numerator, weight), MIN_IN_H),
+        RUN_CALORIES_DENOMINATOR)
+    return distance, speed, calories
+
+
+def _sports_walking_batch(action, duration, weight, height):
+    path = list(_scale(action, WLK_LEN_STEP))
+    distance = _round_div_const(path, SCALE * M_IN_KM)
+    speed = _round_div_all(path, list(_scale(duration, M_IN_KM)))
+    steps = map(floordiv, map(mul, path, path),
+                _scale(map(mul, map(mul, duration, duration), height),
+                       WLK_STEPS_DENOMINATOR))
+    cal_rate = map(add, map(mul, _scale(steps, WLK_COEF_2), height),
+                   _scale(weight, WLK_COEF_1))
+    calories = _round_div_const(
+        _scale(map(mul, cal_rate, duration), MIN_IN_H),
+        WLK_CALORIES_DENOMINATOR)
+    return distance, speed, calories
+
+
+def _swimming_batch(action, duration, weight, length_pool, count_pool):
+    distance = _round_div_const(_scale(action, SWM_LEN_STEP),
+                                SCALE * M_IN_KM)
+    pool = list(map(mul, length_pool, count_pool))
+    denominator = list(_scale(duration, M_IN_KM))
+    speed = _round_div_all(pool, denominator)
+    numerator = map(add, pool, _scale(denominator, SWM_COEF_1))
+    calories = _round_div_all(
+        map(mul, _scale(numerator, SWM_COEF_2), weight),
+        list(_scale(denominator, SCALE * SCALE)))
+    return distance, speed, calories
+
+
+BATCH_KERNELS: dict = {
+    'RUN': _running_batch,
+    'WLK': _sports_walking_batch,
+    'SWM': _swimming_batch,
+}
+
+
+@dataclass
+class ExactBatchResult:
+    """Результаты точного пакетного расчёта в единицах 1 / SCALE."""
+
+    training_type: str
+    duration: array
+    distance: array
+    speed: array
+    calories: array
+
+    def __len__(self) -> int:
+        return len(self.distance)
+
+    def messages(self) -> Iterator[InfoMessage]:
+        """Получить информационные сообщения по каждой тренировке."""
+        for row in zip(self.duration, self.distance,
+                       self.speed, self.calories):
+            yield InfoMessage(self.training_type, *map(to_float, row))
+
+
+def compute_batch(workout_type: str,
+                  columns: Mapping[str, Sequence[float]]) -> ExactBatchResult:
+    """Рассчитать точные показатели для колонок данных.
+
+    Результаты совпадают с `metrics` для каждого пакета.
+    """
+    kernel = BATCH_KERNELS[workout_type]
+    training_class = WORKOUT_TYPES[workout_type]
+    data: List[List[int]] = [_fixed(columns[name])
+                             for name in training_class.FIELDS]
+    size: int = len(data[0])
+    if any(len(column) != size for column in data):
+        raise ValueError('Колонки пакета должны быть одной длины.')
+    distance, speed, calories = kernel(*data)
+    return ExactBatchResult(training_class.__name__, array('q', data[1]),
+                            array('q', distance), array('q', speed),
+                            array('q', calories))
@@ -1,51 +1,304 @@
-from dataclasses import dataclass, asdict
+from __future__ import annotations
+
+from operator import attrgetter
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import (Callable, ClassVar, Dict, Iterable, Iterator, List,
+                        Optional, Sequence, Tuple, Type)
+
+    MetricHook = Callable[['Training', str, bool], None]
+
+LAZY_ATTRIBUTES: dict = {
+    'compute_batch': 'batch',
+    'run_pipeline': 'pipeline',
+    'run_parallel': 'parallel',
+    'Aggregator': 'aggregate',
+    'PackedReader': 'packed',
+    'PackedWriter': 'packed',
+    'PackageServer': 'server',
+    'Recorder': 'instrument',
+}
+
+
+def __getattr__(name: str):
+    """Загрузить дополнительный движок при первом обращении к нему."""
+    module_name: Optional[str] = LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(__import__(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *LAZY_ATTRIBUTES])
 
 
-@dataclass
 class InfoMessage:
     """Информационное сообщение о тренировке."""
 
-    training_type: str
-    duration: float
-    distance: float
-    speed: float
-    calories: float
-    MESSAGE: str = ('Тип тренировки: {training_type}; '
-                    'Длительность: {duration:.3f} ч.; '
-                    'Дистанция: {distance:.3f} км; '
-                    'Ср. скорость: {speed:.3f} км/ч; '
-                    'Потрачено ккал: {calories:.3f}.'
-                    )
+    __slots__ = ('training_type', 'duration', 'distance', 'speed',
+                 'calories')
+
+    MESSAGE: ClassVar[str] = ('Тип тренировки: {training_type}; '
+                              'Длительность: {duration:.3f} ч.; '
+                              'Дистанция: {distance:.3f} км; '
+                              'Ср. скорость: {speed:.3f} км/ч; '
+                              'Потрачено ккал: {calories:.3f}.'
+                              )
+    MESSAGE_FORMAT: ClassVar[str] = ('Тип тренировки: %s; '
+                                     'Длительность: %.3f ч.; '
+                                     'Дистанция: %.3f км; '
+                                     'Ср. скорость: %.3f км/ч; '
+                                     'Потрачено ккал: %.3f.'
+                                     )
+
+    def __init__(self,
+                 training_type: str,
+                 duration: float,
+                 distance: float,
+                 speed: float,
+                 calories: float,
+                 ) -> None:
+        self.training_type: str = training_type
+        self.duration: float = duration
+        self.distance: float = distance
+        self.speed: float = speed
+        self.calories: float = calories
+
+    def __repr__(self) -> str:
+        return (f'{type(self).__name__}('
+                f'training_type={self.training_type!r}, '
+                f'duration={self.duration!r}, '
+                f'distance={self.distance!r}, '
+                f'speed={self.speed!r}, '
+                f'calories={self.calories!r})')
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    __hash__ = None
+
+    def as_tuple(self) -> Tuple[str, float, float, float, float]:
+        """Получить поля сообщения кортежем."""
+        return (self.training_type, self.duration, self.distance,
+                self.speed, self.calories)
 
     def get_message(self) -> str:
         """Получить информацию о тренировке."""
-        return self.MESSAGE.format(**asdict(self))
+        return self.MESSAGE_FORMAT % (self.training_type,
+                                      self.duration,
+                                      self.distance,
+                                      self.speed,
+                                      self.calories)
+
+
+def format_many(messages: Iterable[InfoMessage]) -> str:
+    """Получить информацию о тренировках одним текстом, по строке на каждую."""
+    template: str = InfoMessage.MESSAGE_FORMAT
+    lines: list = [
+        template % (message.training_type,
+                    message.duration,
+                    message.distance,
+                    message.speed,
+                    message.calories)
+        for message in messages
+    ]
+    lines.append('')
+    return '\n'.join(lines)
+
+
+_metric_hook: Optional[MetricHook] = None
+
+# Метрики тренировки и слоты, в которых хранятся их значения.
+METRIC_SLOTS: Dict[str, str] = {
+    'get_distance': '_distance',
+    'get_mean_speed': '_speed',
+    'get_spent_calories': '_calories',
+}
+
+
+def _hooked(method: Callable[['Training'], float],
+            slot: str) -> Callable[['Training'], float]:
+    """Обернуть метрику вызовом обработчика `_metric_hook`."""
+    def wrapper(self: 'Training') -> float:
+        reused: bool = getattr(self, slot) is not None
+        value: float = method(self)
+        if _metric_hook is not None:
+            _metric_hook(self, method.__name__, reused)
+        return value
+
+    wrapper.__name__ = method.__name__
+    wrapper.__qualname__ = method.__qualname__
+    wrapper.__doc__ = method.__doc__
+    wrapper.__wrapped__ = method
+    return wrapper
+
+
+def _training_classes() -> Iterator[Type['Training']]:
+    """Перебрать Training и все его подклассы."""
+    pending: List[Type[Training]] = [Training]
+    while pending:
+        cls: Type[Training] = pending.pop()
+        pending.extend(cls.__subclasses__())
+        yield cls
+
+
+def set_metric_hook(hook: Optional[MetricHook]) -> Optional[MetricHook]:
+    """Установить обработчик обращений к метрикам, вернуть прежний.
+
+    Обработчик получает тренировку, имя метода и признак того,
+    что значение взято из кеша, а не вычислено заново. Пока обработчик
+    установлен, методы метрик классов заменены обёртками; без него
+    методы вызываются напрямую.
+    """
+    global _metric_hook
+    previous: Optional[MetricHook] = _metric_hook
+    _metric_hook = hook
+    for cls in _training_classes():
+        for name, slot in METRIC_SLOTS.items():
+            method = cls.__dict__.get(name)
+            if method is None:
+                continue
+            original = getattr(method, '__wrapped__', method)
+            setattr(cls, name, original if hook is None
+                    else _hooked(original, slot))
+    return previous
+
+
+class MetricCounter:
+    """Счётчик вычисленных и повторно использованных метрик."""
+
+    __slots__ = ('computed', 'reused', '_previous')
+
+    def __init__(self) -> None:
+        self.computed: int = 0
+        self.reused: int = 0
+
+    def __call__(self, training: 'Training', name: str,
+                 reused: bool) -> None:
+        if reused:
+            self.reused += 1
+        else:
+            self.computed += 1
+
+    def __enter__(self) -> 'MetricCounter':
+        self._previous: Optional[MetricHook] = set_metric_hook(self)
+        return self
+
+    def __exit__(self, *args) -> None:
+        set_metric_hook(self._previous)
+
+
+def training_field(name: str) -> property:
+    """Поле тренировки, хранящееся в слоте `_<name>`.
+
+    Чтение идёт через C-функцию `attrgetter`, запись сбрасывает
+    сохранённые метрики.
+    """
+    slot: str = '_' + name
+
+    def setter(self: 'Training', value) -> None:
+        setattr(self, slot, value)
+        self.invalidate()
+
+    return property(attrgetter(slot), setter, doc=f'Параметр {name}.')
+
+
+class SignatureFields:
+    """Поля пакета по сигнатуре `__init__`, найденные при первом чтении.
+
+    inspect импортируется только здесь, чтобы не замедлять импорт.
+    """
+
+    def __get__(self, instance, owner: Type[Training]) -> Tuple[str, ...]:
+        from inspect import Parameter, signature
+
+        kinds = (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+        fields: Tuple[str, ...] = tuple(
+            name for name, parameter in signature(
+                owner.__init__).parameters.items()
+            if parameter.kind in kinds)[1:]
+        owner.FIELDS = fields
+        return fields
+
+
+WORKOUT_TYPES: Dict[str, Type['Training']] = {}
 
 
 class Training:
-    """Базовый класс тренировки."""
+    """Базовый класс тренировки.
+
+    Дистанция, скорость и калории вычисляются один раз и хранятся
+    в слотах `_distance`, `_speed` и `_calories`; запись параметра
+    тренировки через `training_field` сбрасывает их в None. Формулы читают
+    параметры прямо из слотов.
+    """
+
+    # __dict__ создаётся лениво: только при записи атрибута вне слотов.
+    __slots__ = ('_action', '_duration', '_weight',
+                 '_distance', '_speed', '_calories', '__dict__')
+
+    action = training_field('action')
+    duration = training_field('duration')
+    weight = training_field('weight')
 
     M_IN_KM: int = 1000
     LEN_STEP: float = 0.65
     MIN_IN_H: int = 60
+    CODE: ClassVar[Optional[str]] = None
+    FIELDS: ClassVar[Tuple[str, ...]] = ('action', 'duration', 'weight')
+
+    def __init_subclass__(cls, code: Optional[str] = None, **kwargs) -> None:
+        """Зарегистрировать вид тренировки под кодом пакета `code`.
+
+        Объявленные в классе `FIELDS` сохраняются; без них класс
+        со своим `__init__` получает поля по его сигнатуре.
+        """
+        super().__init_subclass__(**kwargs)
+        if 'FIELDS' not in cls.__dict__ and '__init__' in cls.__dict__:
+            cls.FIELDS = SignatureFields()
+        if code is None:
+            return
+        if code in WORKOUT_TYPES:
+            raise ValueError(f'Код тренировки {code} уже занят '
+                             f'классом {WORKOUT_TYPES[code].__name__}.')
+        cls.CODE = code
+        WORKOUT_TYPES[code] = cls
 
     def __init__(self,
                  action: int,
                  duration: float,
                  weight: float,
                  ) -> None:
-        self.action: int = action
-        self.duration: float = duration
-        self.weight: float = weight
+        self._action: int = action
+        self._duration: float = duration
+        self._weight: float = weight
+        self._distance: Optional[float] = None
+        self._speed: Optional[float] = None
+        self._calories: Optional[float] = None
+
+    def invalidate(self) -> None:
+        """Сбросить сохранённые дистанцию, скорость и калории."""
+        self._distance = self._speed = self._calories = None
 
     def get_distance(self) -> float:
         """Получить дистанцию в км."""
-        distance: float = self.action * self.LEN_STEP / self.M_IN_KM
+        distance: Optional[float] = self._distance
+        if distance is None:
+            distance = self._action * self.LEN_STEP / self.M_IN_KM
+            self._distance = distance
         return distance
 
     def get_mean_speed(self) -> float:
         """Получить среднюю скорость движения."""
-        mean_speed: float = self.get_distance() / self.duration
+        mean_speed: Optional[float] = self._speed
+        if mean_speed is None:
+            mean_speed = self.get_distance() / self._duration
+            self._speed = mean_speed
         return mean_speed
 
     def get_spent_calories(self) -> float:
@@ -56,7 +309,7 @@ class Training:
         """Вернуть информационное сообщение о выполненной тренировке."""
         message: InfoMessage = InfoMessage(
             self.__class__.__name__,
-            self.duration,
+            self._duration,
             self.get_distance(),
             self.get_mean_speed(),
             self.get_spent_calories()
@@ -64,27 +317,39 @@ class Training:
         return message
 
 
-class Running(Training):
+class Running(Training, code='RUN'):
     """Тренировка: бег."""
 
+    __slots__ = ()
+
     COEF_CAL_1: int = 18
     COEF_CAL_2: int = 20
 
     def get_spent_calories(self) -> float:
         """Бег: расход калорий."""
-        speed: float = self.get_mean_speed()
-        speed_based_calc: float = (self.COEF_CAL_1 * speed) - self.COEF_CAL_2
-        cal_rate: float = speed_based_calc * self.weight / self.M_IN_KM
-        minutes: float = self.duration * self.MIN_IN_H
-        calories: float = cal_rate * minutes
+        calories: Optional[float] = self._calories
+        if calories is None:
+            speed: float = self.get_mean_speed()
+            speed_based_calc: float = ((self.COEF_CAL_1 * speed)
+                                       - self.COEF_CAL_2)
+            cal_rate: float = speed_based_calc * self._weight / self.M_IN_KM
+            minutes: float = self._duration * self.MIN_IN_H
+            calories = cal_rate * minutes
+            self._calories = calories
         return calories
 
 
-class SportsWalking(Training):
+class SportsWalking(Training, code='WLK'):
     """Тренировка: спортивная ходьба."""
 
+    __slots__ = ('_height',)
+
+    height = training_field('height')
+
     COEF_CAL_1: float = 0.035
     COEF_CAL_2: float = 0.029
+    FIELDS: ClassVar[Tuple[str, ...]] = ('action', 'duration', 'weight',
+                                         'height')
 
     def __init__(self,
                  action: int,
@@ -93,28 +358,38 @@ class SportsWalking(Training):
                  height: int,
                  ) -> None:
         super().__init__(action, duration, weight)
-        self.height: int = height
+        self._height: int = height
 
     def get_spent_calories(self) -> float:
         """Спортивная ходьба: расход калорий."""
-        square_speed: float = self.get_mean_speed() ** 2
-        speed_based_calc: float = (square_speed
-                                   // self.height
-                                   * self.COEF_CAL_2
-                                   * self.height)
-        weight_based_calc: float = self.COEF_CAL_1 * self.weight
-        cal_rate: float = speed_based_calc + weight_based_calc
-        minutes: float = self.duration * self.MIN_IN_H
-        calories: float = cal_rate * minutes
+        calories: Optional[float] = self._calories
+        if calories is None:
+            square_speed: float = self.get_mean_speed() ** 2
+            speed_based_calc: float = (square_speed
+                                       // self._height
+                                       * self.COEF_CAL_2
+                                       * self._height)
+            weight_based_calc: float = self.COEF_CAL_1 * self._weight
+            cal_rate: float = speed_based_calc + weight_based_calc
+            minutes: float = self._duration * self.MIN_IN_H
+            calories = cal_rate * minutes
+            self._calories = calories
         return calories
 
 
-class Swimming(Training):
+class Swimming(Training, code='SWM'):
     """Тренировка: плавание."""
 
+    __slots__ = ('_length_pool', '_count_pool')
+
+    length_pool = training_field('length_pool')
+    count_pool = training_field('count_pool')
+
     COEF_CAL_1: float = 1.1
     COEF_CAL_2: int = 2
     LEN_STEP: float = 1.38
+    FIELDS: ClassVar[Tuple[str, ...]] = ('action', 'duration', 'weight',
+                                         'length_pool', 'count_pool')
 
     def __init__(
             self,
@@ -124,31 +399,39 @@ class Swimming(Training):
             length_pool: int,
             count_pool: int,) -> None:
         super().__init__(action, duration, weight)
-        self.length_pool: int = length_pool
-        self.count_pool: int = count_pool
+        self._length_pool: int = length_pool
+        self._count_pool: int = count_pool
 
     def get_mean_speed(self) -> float:
         """Плавание: скорость."""
-        pool: int = self.length_pool * self.count_pool
-        mean_speed: float = pool / self.M_IN_KM / self.duration
+        mean_speed: Optional[float] = self._speed
+        if mean_speed is None:
+            pool: int = self._length_pool * self._count_pool
+            mean_speed = pool / self.M_IN_KM / self._duration
+            self._speed = mean_speed
         return mean_speed
 
     def get_spent_calories(self) -> float:
         """Плавание: расход калорий."""
-        speed: float = self.get_mean_speed()
-        calories: float = ((speed + self.COEF_CAL_1)
-                           * self.COEF_CAL_2 * self.weight)
+        calories: Optional[float] = self._calories
+        if calories is None:
+            speed: float = self.get_mean_speed()
+            calories = ((speed + self.COEF_CAL_1)
+                        * self.COEF_CAL_2 * self._weight)
+            self._calories = calories
         return calories
 
 
 def read_package(workout_type: str, data: list) -> Training:
     """Прочитать данные полученные от датчиков."""
-    packages = {
-        'SWM': Swimming,
-        'RUN': Running,
-        'WLK': SportsWalking,
-    }
-    return packages[workout_type](*data)
+    return WORKOUT_TYPES[workout_type](*data)
+
+
+def read_packages(workout_type: str,
+                  rows: Iterable[Sequence]) -> List[Training]:
+    """Прочитать пакеты одного вида тренировки."""
+    training_class: Type[Training] = WORKOUT_TYPES[workout_type]
+    return [training_class(*data) for data in rows]
 
 
 def main(training: Training) -> None:
@@ -0,0 +1,126 @@
+"""Счётчики и время этапов обработки пакетов.
+
+Запись включается явно::
+
+    with Recorder() as recorder:
+        run_pipeline(src, dst)
+    print(recorder.summary())
+
+Без активного `Recorder` этапы конвейера не замеряют время вовсе.
+"""
+from typing import Dict, List, Optional
+
+STAGES: tuple = ('read', 'parse', 'read_package', 'calculate',
+                 'info_message', 'write')
+BUCKETS: int = 64
+
+_active: Optional['Recorder'] = None
+
+
+def active() -> Optional['Recorder']:
+    """Получить включённый `Recorder` или None."""
+    return _active
+
+
+class StageStats:
+    """Число вызовов и суммарное время этапа."""
+
+    __slots__ = ('count', 'total_ns')
+
+    def __init__(self, count: int = 0, total_ns: int = 0) -> None:
+        self.count: int = count
+        self.total_ns: int = total_ns
+
+
+class Recorder:
+    """Накопитель статистики по этапам и видам тренировок.
+
+    Задержка одной тренировки — время расчёта показателей и создания
+    сообщения — хранится в гистограмме по степеням двойки: в корзине `b`
+    лежат задержки от 2**(b-1) до 2**b - 1 нс.
+    """
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageStats] = {
+            stage: StageStats() for stage in STAGES
+        }
+        self.latency: Dict[str, List[int]] = {}
+        self._previous: Optional[Recorder] = None
+
+    def __enter__(self) -> 'Recorder':
+        global _active
+        self._previous = _active
+        _active = self
+        return self
+
+    def __exit__(self, *args) -> None:
+        global _active
+        _active = self._previous
+
+    def add(self, stage: str, elapsed_ns: int, count: int = 1) -> None:
+        """Учесть `count` вызовов этапа, занявших `elapsed_ns`."""
+        stats: StageStats = self.stages[stage]
+        stats.count += count
+        stats.total_ns += elapsed_ns
+
+    def observe(self, workout_type: str, elapsed_ns: int) -> None:
+        """Учесть задержку обработки одной тренировки."""
+        histogram: Optional[List[int]] = self.latency.get(workout_type)
+        if histogram is None:
+            histogram = self.latency[workout_type] = [0] * BUCKETS
+        histogram[min(elapsed_ns.bit_length(), BUCKETS - 1)] += 1
+
+    @staticmethod
+    def percentile(histogram: List[int], fraction: float) -> int:
+        """Оценить перцентиль сверху по гистограмме, нс."""
+        rank: float = sum(histogram) * fraction
+        seen: int = 0
+        for bucket, count in enumerate(histogram):
+            seen += count
+            if count and seen >= rank:
+                return (1 << bucket) - 1
+        return 0
+
+    def as_dict(self) -> dict:
+        """Получить статистику в виде, пригодном для JSON."""
+        return {
+            'stages': {
+                stage: {'count': stats.count, 'total_ns': stats.total_ns}
+                for stage, stats in self.stages.items()
+            },
+            'latency_ns': {
+                workout_type: {
+                    'buckets': histogram,
+                    'p50': self.percentile(histogram, 0.5),
+                    'p99': self.percentile(histogram, 0.99),
+                }
+                for workout_type, histogram in self.latency.items()
+            },
+        }
+
+    def dump(self, path: str) -> None:
+        """Сохранить статистику в JSON-файл."""
+        import json
+
+        with open(path, 'w') as out:
+            json.dump(self.as_dict(), out, indent=2)
+
+    def summary(self) -> str:
+        """Получить статистику текстовой таблицей."""
+        lines: List[str] = [
+            f'{"этап":<14}{"вызовов":>12}{"всего, мс":>12}{"нс/вызов":>12}'
+        ]
+        for stage, stats in self.stages.items():
+            per_call: float = (stats.total_ns / stats.count
+                               if stats.count else 0.0)
+            lines.append(f'{stage:<14}{stats.count:>12}'
+                         f'{stats.total_ns / 1e6:>12.1f}{per_call:>12.0f}')
+        if self.latency:
+            lines.append('')
+            lines.append(f'{"тренировка":<14}{"пакетов":>12}'
+                         f'{"p50, нс":>12}{"p99, нс":>12}')
+        for workout_type, histogram in sorted(self.latency.items()):
+            lines.append(f'{workout_type:<14}{sum(histogram):>12}'
+                         f'{self.percentile(histogram, 0.5):>12}'
+                         f'{self.percentile(histogram, 0.99):>12}')
+        return '\n'.join(lines)
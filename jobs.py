@@ -0,0 +1,425 @@
+"""Пересчёт больших файлов пакетов шардами на нескольких узлах.
+
+Координатор делит входной файл на шарды — диапазоны байтов по границам
+строк — и раздаёт их рабочим процессам по сокету. Рабочий читает свой
+диапазон файла, считает тренировки этапами `pipeline` и пишет отчёт
+шарда в каталог задания, а координатору возвращает счётчики строк
+и итоги по видам тренировок. Готовые шарды записываются в контрольную
+точку, поэтому прерванное задание продолжается с места остановки.
+Шард, рабочий которого вернул ошибку или отключился, отдаётся снова,
+всего не больше `max_attempts` раз.
+
+Входной файл и каталог задания должны быть доступны всем узлам по
+одному и тому же пути, например на общем диске. Ключ аутентификации
+рабочих берётся из переменной окружения JOBS_AUTHKEY.
+
+Запуск на одной машине с четырьмя рабочими процессами:
+    python jobs.py run packages.txt report.txt --job-dir job --workers 4
+На нескольких узлах:
+    python jobs.py run packages.txt report.txt --job-dir job \\
+        --listen 0.0.0.0:7070 --workers 0
+    python jobs.py worker --connect coordinator:7070
+"""
+import argparse
+import io
+import json
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass, field
+from multiprocessing.connection import Client, Connection, Listener
+from operator import add
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from aggregate import Totals
+from homework import InfoMessage
+from pipeline import (PipelineStats, build_trainings, parse_packages,
+                      read_lines, show_info, write_messages)
+
+DEFAULT_SHARD_SIZE: int = 16 * 1024 * 1024
+MAX_ATTEMPTS: int = 3
+AUTHKEY_ENV: str = 'JOBS_AUTHKEY'
+CHECKPOINT: str = 'checkpoint.json'
+POLL_INTERVAL: float = 0.1
+
+Address = Tuple[str, int]
+
+
+class JobError(RuntimeError):
+    """Задание не может быть выполнено или продолжено."""
+
+
+@dataclass
+class Shard:
+    """Диапазон байтов входного файла, обрабатываемый одним рабочим."""
+
+    index: int
+    path: str
+    start: int
+    end: int
+
+
+@dataclass
+class JobResult:
+    """Итоги задания по всем шардам."""
+
+    stats: PipelineStats
+    totals: Dict[str, Totals]
+    shards: int
+    processed: int = 0
+    retries: int = 0
+    workers: List[str] = field(default_factory=list)
+
+
+def plan_shards(path: str, shard_size: int = DEFAULT_SHARD_SIZE,
+                ) -> List[Shard]:
+    """Разбить файл на шарды размером около `shard_size` байт."""
+    size: int = os.path.getsize(path)
+    shards: List[Shard] = []
+    with open(path, 'rb') as src:
+        start: int = 0
+        while start < size:
+            src.seek(min(start + shard_size, size))
+            src.readline()
+            end: int = min(src.tell(), size)
+            shards.append(Shard(len(shards), path, start, end))
+            start = end
+    return shards
+
+
+def shard_output(job_dir: str, index: int) -> str:
+    """Получить путь отчёта шарда."""
+    return os.path.join(job_dir, f'shard-{index:06d}.txt')
+
+
+def _tally(messages: Iterator[InfoMessage],
+           totals: Dict[str, Totals]) -> Iterator[InfoMessage]:
+    """Учитывать сообщения в итогах по видам тренировок."""
+    for message in messages:
+        item: Optional[Totals] = totals.get(message.training_type)
+        if item is None:
+            item = totals[message.training_type] = Totals()
+        item.add(message.duration, message.distance, message.calories,
+                 message.speed)
+        yield message
+
+
+def process_shard(shard: Shard, job_dir: str) -> dict:
+    """Рассчитать шард и записать его отчёт, вернуть счётчики и итоги."""
+    with open(shard.path, 'rb') as src:
+        src.seek(shard.start)
+        text: str = src.read(shard.end - shard.start).decode()
+    stats: PipelineStats = PipelineStats()
+    totals: Dict[str, Totals] = {}
+    lines = read_lines(io.StringIO(text), stats)
+    trainings = build_trainings(parse_packages(lines, stats), stats)
+    output: str = shard_output(job_dir, shard.index)
+    with open(f'{output}.tmp', 'w') as out:
+        write_messages(_tally(show_info(trainings, stats), totals),
+                       out, stats)
+    os.replace(f'{output}.tmp', output)
+    return {
+        'index': shard.index,
+        'stats': vars(stats),
+        'totals': {training_type: item.as_tuple()
+                   for training_type, item in totals.items()},
+    }
+
+
+def run_worker(address: Address, authkey: bytes) -> int:
+    """Получать шарды у координатора, пока он не остановит рабочего.
+
+    Вернуть число обработанных шардов.
+    """
+    done: int = 0
+    with Client(address, authkey=authkey) as conn:
+        conn.send(('hello', f'{os.uname().nodename}:{os.getpid()}'))
+        while True:
+            try:
+                command, shard, job_dir = conn.recv()
+            except EOFError:
+                return done
+            if command == 'stop':
+                return done
+            try:
+                result: dict = process_shard(shard, job_dir)
+            except Exception as error:
+                conn.send(('error', f'{type(error).__name__}: {error}'))
+                continue
+            conn.send(('done', result))
+            done += 1
+
+
+class Coordinator:
+    """Раздача шардов рабочим, повторы, контрольные точки и слияние."""
+
+    def __init__(self,
+                 path: str,
+                 output: str,
+                 job_dir: str,
+                 shard_size: int = DEFAULT_SHARD_SIZE,
+                 max_attempts: int = MAX_ATTEMPTS,
+                 authkey: Optional[bytes] = None,
+                 ) -> None:
+        self.path: str = os.path.abspath(path)
+        self.output: str = output
+        self.job_dir: str = os.path.abspath(job_dir)
+        self.shard_size: int = shard_size
+        self.max_attempts: int = max_attempts
+        self.authkey: bytes = authkey or os.environb.get(
+            AUTHKEY_ENV.encode()) or secrets.token_hex(16).encode()
+        os.makedirs(self.job_dir, exist_ok=True)
+        self.shards: List[Shard] = plan_shards(self.path, shard_size)
+        self.results: Dict[int, dict] = self._load_checkpoint()
+        self.failed: Dict[int, str] = {}
+        self.attempts: Dict[int, int] = {}
+        self.workers: List[str] = []
+        self.processed: int = 0
+        self._pending: queue.Queue = queue.Queue()
+        for shard in self.shards:
+            if shard.index not in self.results:
+                self._pending.put(shard)
+        self._remaining: int = len(self.shards) - len(self.results)
+        self._lock: threading.Lock = threading.Lock()
+        self._done: threading.Event = threading.Event()
+        self._active: int = 0
+        self._listener: Optional[Listener] = None
+        self._processes: List[subprocess.Popen] = []
+        if not self._remaining:
+            self._done.set()
+
+    def _job_key(self) -> dict:
+        """Получить параметры, которые должны совпасть при продолжении."""
+        status = os.stat(self.path)
+        return {'input': self.path, 'size': status.st_size,
+                'mtime_ns': status.st_mtime_ns,
+                'shard_size': self.shard_size}
+
+    def _load_checkpoint(self) -> Dict[int, dict]:
+        """Прочитать готовые шарды прежнего запуска."""
+        path: str = os.path.join(self.job_dir, CHECKPOINT)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as src:
+            data: dict = json.load(src)
+        if data['job'] != self._job_key():
+            raise JobError(f'{path}: контрольная точка другого задания.')
+        return {result['index']: result for result in data['shards']
+                if os.path.exists(shard_output(self.job_dir,
+                                               result['index']))}
+
+    def _save_checkpoint(self) -> None:
+        """Записать готовые шарды, заменив прежнюю точку атомарно."""
+        path: str = os.path.join(self.job_dir, CHECKPOINT)
+        with open(f'{path}.tmp', 'w') as out:
+            json.dump({'job': self._job_key(),
+                       'shards': sorted(self.results.values(),
+                                        key=lambda r: r['index'])}, out)
+        os.replace(f'{path}.tmp', path)
+
+    def start(self, address: Address = ('127.0.0.1', 0)) -> Address:
+        """Начать приём рабочих, вернуть адрес для подключения."""
+        self._listener = Listener(address, authkey=self.authkey)
+        threading.Thread(target=self._accept, daemon=True).start()
+        return self._listener.address
+
+    def spawn_workers(self, count: int) -> None:
+        """Запустить `count` рабочих процессов на этой машине."""
+        host, port = self._listener.address
+        env: dict = dict(os.environ)
+        env[AUTHKEY_ENV] = self.authkey.decode()
+        for _ in range(count):
+            self._processes.append(subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), 'worker',
+                 '--connect', f'{host}:{port}'],
+                env=env))
+
+    def _accept(self) -> None:
+        """Принимать подключения рабочих до остановки координатора."""
+        while True:
+            try:
+                conn: Connection = self._listener.accept()
+            except OSError:
+                return
+            with self._lock:
+                self._active += 1
+            threading.Thread(target=self._serve, args=(conn,),
+                             daemon=True).start()
+
+    def _serve(self, conn: Connection) -> None:
+        """Отдавать шарды одному рабочему и принимать результаты."""
+        try:
+            _, name = conn.recv()
+            with self._lock:
+                self.workers.append(name)
+            self._serve_shards(conn, name)
+        except (EOFError, OSError):
+            pass
+        finally:
+            with self._lock:
+                self._active -= 1
+            conn.close()
+
+    def _serve_shards(self, conn: Connection, name: str) -> None:
+        """Отдавать шарды, пока задание не завершится."""
+        while not self._done.is_set():
+            try:
+                shard: Shard = self._pending.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            try:
+                conn.send(('shard', shard, self.job_dir))
+                status, result = conn.recv()
+            except (EOFError, OSError):
+                self._fail(shard, f'рабочий {name} отключился')
+                return
+            if status == 'done':
+                self._complete(result)
+            else:
+                self._fail(shard, result)
+        conn.send(('stop', None, None))
+
+    def _complete(self, result: dict) -> None:
+        """Учесть готовый шард и обновить контрольную точку."""
+        with self._lock:
+            self.results[result['index']] = result
+            self.processed += 1
+            self._save_checkpoint()
+            self._finish_one()
+
+    def _fail(self, shard: Shard, reason: str) -> None:
+        """Отдать шард повторно или признать его невыполнимым."""
+        with self._lock:
+            attempts: int = self.attempts.get(shard.index, 0) + 1
+            self.attempts[shard.index] = attempts
+            if attempts < self.max_attempts:
+                self._pending.put(shard)
+                return
+            self.failed[shard.index] = reason
+            self._finish_one()
+
+    def _finish_one(self) -> None:
+        self._remaining -= 1
+        if not self._remaining:
+            self._done.set()
+
+    def _workers_gone(self) -> bool:
+        """Проверить, что локальные рабочие завершились, а других нет."""
+        with self._lock:
+            active: int = self._active
+        return (bool(self._processes) and not active
+                and all(process.poll() is not None
+                        for process in self._processes))
+
+    def wait(self) -> JobResult:
+        """Дождаться всех шардов, слить отчёты и итоги."""
+        try:
+            while not self._done.wait(POLL_INTERVAL):
+                if self._workers_gone():
+                    raise JobError('Все рабочие процессы завершились.')
+        finally:
+            self.close()
+        if self.failed:
+            raise JobError('Шарды не выполнены: ' + '; '.join(
+                f'{index}: {reason}'
+                for index, reason in sorted(self.failed.items())))
+        return self._merge()
+
+    def _merge(self) -> JobResult:
+        """Склеить отчёты шардов по порядку и сложить итоги."""
+        stats: PipelineStats = PipelineStats()
+        totals: Dict[str, Totals] = {}
+        with open(f'{self.output}.tmp', 'wb') as out:
+            for shard in self.shards:
+                result: dict = self.results[shard.index]
+                for name, value in result['stats'].items():
+                    setattr(stats, name, getattr(stats, name) + value)
+                for training_type, values in result['totals'].items():
+                    item: Totals = totals.get(training_type, Totals())
+                    totals[training_type] = Totals(
+                        *map(add, item.as_tuple(), values))
+                with open(shard_output(self.job_dir, shard.index),
+                          'rb') as src:
+                    out.write(src.read())
+        os.replace(f'{self.output}.tmp', self.output)
+        return JobResult(stats, totals, len(self.shards), self.processed,
+                         sum(self.attempts.values()), self.workers)
+
+    def close(self) -> None:
+        """Остановить приём рабочих и дождаться локальных процессов."""
+        self._done.set()
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        for process in self._processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+def run_job(path: str,
+            output: str,
+            job_dir: str,
+            workers: int = os.cpu_count() or 1,
+            shard_size: int = DEFAULT_SHARD_SIZE,
+            max_attempts: int = MAX_ATTEMPTS,
+            address: Address = ('127.0.0.1', 0),
+            ) -> JobResult:
+    """Выполнить или продолжить задание с `workers` локальными рабочими."""
+    coordinator: Coordinator = Coordinator(path, output, job_dir,
+                                           shard_size, max_attempts)
+    coordinator.start(address)
+    coordinator.spawn_workers(workers)
+    return coordinator.wait()
+
+
+def parse_address(value: str) -> Address:
+    """Разобрать адрес вида ``host:port``."""
+    host, _, port = value.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Запустить координатора или рабочего из командной строки."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='выполнить задание')
+    run.add_argument('input')
+    run.add_argument('output')
+    run.add_argument('--job-dir', required=True)
+    run.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    run.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE)
+    run.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS)
+    run.add_argument('--listen', type=parse_address,
+                     default=('127.0.0.1', 0))
+    worker = commands.add_parser('worker', help='обрабатывать шарды')
+    worker.add_argument('--connect', type=parse_address, required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == 'worker':
+        authkey: Optional[bytes] = os.environb.get(AUTHKEY_ENV.encode())
+        if authkey is None:
+            parser.error(f'не задана переменная окружения {AUTHKEY_ENV}')
+        run_worker(args.connect, authkey)
+        return 0
+    try:
+        result: JobResult = run_job(
+            args.input, args.output, args.job_dir, args.workers,
+            args.shard_size, args.max_attempts, args.listen)
+    except JobError as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(f'{result.stats}; шардов {result.shards}, обработано сейчас '
+          f'{result.processed}, повторов {result.retries}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
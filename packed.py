@@ -0,0 +1,176 @@
+"""Двоичный формат пакетов с записями фиксированной длины.
+
+Файл содержит пакеты одного вида тренировки: заголовок ``<4s4sQ``
+(сигнатура, код тренировки, число записей), затем записи — параметры
+пакета в порядке `FIELDS` класса тренировки, каждый как little-endian
+float64. Целые значения параметров до 2**53 хранятся точно, поэтому
+расчёт по прочитанным пакетам совпадает с расчётом по исходным.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from itertools import chain
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from batch import BatchResult, compute_batch
+from homework import WORKOUT_TYPES, Training, read_packages
+
+MAGIC: bytes = b'WPK1'
+HEADER: struct.Struct = struct.Struct('<4s4sQ')
+LITTLE_ENDIAN: bool = sys.byteorder == 'little'
+
+
+class PackedFormatError(ValueError):
+    """Файл не соответствует двоичному формату пакетов."""
+
+
+def record_struct(workout_type: str) -> struct.Struct:
+    """Получить формат записи для вида тренировки."""
+    return struct.Struct(f'<{len(WORKOUT_TYPES[workout_type].FIELDS)}d')
+
+
+class PackedWriter:
+    """Запись пакетов одного вида тренировки в двоичный файл."""
+
+    def __init__(self, path: str, workout_type: str) -> None:
+        self.workout_type: str = workout_type
+        self.width: int = len(WORKOUT_TYPES[workout_type].FIELDS)
+        self.record: struct.Struct = record_struct(workout_type)
+        self.count: int = 0
+        self.file: BinaryIO = open(path, 'wb')
+        self._write_header()
+
+    def _write_header(self) -> None:
+        self.file.write(HEADER.pack(MAGIC, self.workout_type.encode(),
+                                    self.count))
+
+    def _arity_error(self) -> PackedFormatError:
+        return PackedFormatError(
+            f'Пакеты {self.workout_type} должны содержать '
+            f'{self.width} чисел.')
+
+    def write(self, data: Sequence[float]) -> None:
+        """Записать один пакет."""
+        try:
+            record: bytes = self.record.pack(*data)
+        except (struct.error, TypeError):
+            raise self._arity_error()
+        self.file.write(record)
+        self.count += 1
+
+    def write_many(self, rows: Iterable[Sequence[float]]) -> None:
+        """Записать пакеты одним блоком.
+
+        Длина проверяется у каждого пакета: иначе пакеты неверной длины
+        незаметно склеились бы в чужие записи.
+        """
+        rows = list(rows)
+        try:
+            if rows and set(map(len, rows)) != {self.width}:
+                raise self._arity_error()
+            values: array = array('d', chain.from_iterable(rows))
+        except TypeError:
+            raise self._arity_error()
+        if not LITTLE_ENDIAN:
+            values.byteswap()
+        self.file.write(values.tobytes())
+        self.count += len(values) // self.width
+
+    def close(self) -> None:
+        """Дописать число записей в заголовок и закрыть файл."""
+        if self.file.closed:
+            return
+        self.file.seek(0)
+        self._write_header()
+        self.file.close()
+
+    def __enter__(self) -> 'PackedWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def write_packed(path: str,
+                 workout_type: str,
+                 rows: Iterable[Sequence[float]]) -> int:
+    """Записать пакеты в файл, вернуть их число."""
+    with PackedWriter(path, workout_type) as writer:
+        writer.write_many(rows)
+    return writer.count
+
+
+class PackedReader:
+    """Чтение двоичного файла пакетов через mmap без копирования.
+
+    Колонки — это срезы memoryview над отображённым файлом; они
+    действительны до `close()` и должны быть освобождены раньше него.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as src:
+            try:
+                self._mmap: mmap.mmap = mmap.mmap(src.fileno(), 0,
+                                                  access=mmap.ACCESS_READ)
+            except ValueError:
+                raise PackedFormatError(f'{path}: пустой файл.')
+        try:
+            magic, code, count = HEADER.unpack_from(self._mmap)
+        except struct.error:
+            self._mmap.close()
+            raise PackedFormatError(f'{path}: нет заголовка.')
+        self.workout_type: str = code.rstrip(b'\0').decode()
+        if magic != MAGIC or self.workout_type not in WORKOUT_TYPES:
+            self._mmap.close()
+            raise PackedFormatError(f'{path}: неизвестный формат.')
+        self.fields: Tuple[str, ...] = WORKOUT_TYPES[self.workout_type].FIELDS
+        self.record: struct.Struct = record_struct(self.workout_type)
+        self.count: int = count
+        if len(self._mmap) != HEADER.size + count * self.record.size:
+            self._mmap.close()
+            raise PackedFormatError(f'{path}: размер не совпадает с '
+                                    'числом записей.')
+        self._view: memoryview = memoryview(self._mmap)[HEADER.size:]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Tuple[float, ...]]:
+        """Перебрать пакеты как кортежи параметров."""
+        return self.record.iter_unpack(self._view)
+
+    def columns(self) -> Dict[str, Sequence[float]]:
+        """Получить колонки параметров по именам полей."""
+        width: int = len(self.fields)
+        if LITTLE_ENDIAN:
+            values: Sequence[float] = self._view.cast('d')
+        else:
+            values = array('d', self._view.tobytes())
+            values.byteswap()
+        return {name: values[i::width] for i, name in enumerate(self.fields)}
+
+    def compute(self) -> BatchResult:
+        """Рассчитать показатели всех пакетов файла пакетным движком."""
+        columns: Dict[str, Sequence[float]] = self.columns()
+        result: BatchResult = compute_batch(self.workout_type, columns)
+        result.duration = array('d', result.duration)
+        for column in columns.values():
+            if isinstance(column, memoryview):
+                column.release()
+        return result
+
+    def trainings(self) -> List[Training]:
+        """Создать объекты тренировок для всех пакетов файла."""
+        return read_packages(self.workout_type, self)
+
+    def close(self) -> None:
+        """Освободить отображение файла."""
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'PackedReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
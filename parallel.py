@@ -0,0 +1,156 @@
+"""Параллельная генерация отчётов о тренировках на нескольких ядрах.
+
+Поток пакетов делится на порции, каждая порция обрабатывается целиком в
+одном процессе пула. Результаты возвращаются в порядке входных пакетов и
+совпадают с последовательной обработкой. Некорректные пакеты
+пропускаются и учитываются в `PipelineStats`, как в `pipeline`.
+На неизвестный код тренировки выводится строка `UNKNOWN_TRAINING`,
+как в ``homework``; с `skip_unknown` (так запускается `main`) такие
+пакеты только считаются, и вывод совпадает с `pipeline`.
+"""
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import fields
+from itertools import islice
+from typing import (Callable, Deque, Iterable, Iterator, List, Optional,
+                    Tuple)
+
+from homework import InfoMessage, read_package
+from pipeline import (CALCULATION_ERRORS, PipelineStats, parse_packages,
+                      read_lines)
+
+DEFAULT_CHUNK_SIZE: int = 2048
+UNKNOWN_TRAINING: str = 'Неизвестный тип тренировки. :('
+
+Package = Tuple[str, list]
+
+
+def chunked(packages: Iterable[Package],
+            chunk_size: int) -> Iterator[List[Package]]:
+    """Разбить поток пакетов на списки по `chunk_size` штук."""
+    iterator: Iterator[Package] = iter(packages)
+    while True:
+        chunk: List[Package] = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def compute_chunk(chunk: List[Package],
+                  skip_unknown: bool = False,
+                  ) -> Tuple[List[Optional[InfoMessage]], PipelineStats]:
+    """Получить сообщения и счётчики пакетов для порции.
+
+    Неизвестному коду тренировки соответствует None, если только
+    такие пакеты не пропускаются.
+    """
+    messages: List[Optional[InfoMessage]] = []
+    stats: PipelineStats = PipelineStats(packages=len(chunk))
+    for workout_type, data in chunk:
+        try:
+            training = read_package(workout_type, data)
+            messages.append(training.show_training_info())
+        except KeyError:
+            stats.unknown += 1
+            if not skip_unknown:
+                messages.append(None)
+        except (TypeError, *CALCULATION_ERRORS):
+            stats.malformed += 1
+    stats.written = len(messages) - (0 if skip_unknown else stats.unknown)
+    return messages, stats
+
+
+def process_chunk(chunk: List[Package],
+                  skip_unknown: bool = False,
+                  ) -> Tuple[List[str], PipelineStats]:
+    """Получить строки отчёта и счётчики пакетов для порции."""
+    messages, stats = compute_chunk(chunk, skip_unknown)
+    return [UNKNOWN_TRAINING if message is None else message.get_message()
+            for message in messages], stats
+
+
+def _collect(result: Tuple[list, PipelineStats],
+             stats: Optional[PipelineStats]) -> list:
+    """Добавить счётчики порции к общим и вернуть её результаты."""
+    lines, chunk_stats = result
+    if stats is not None:
+        for item in fields(PipelineStats):
+            setattr(stats, item.name, getattr(stats, item.name)
+                    + getattr(chunk_stats, item.name))
+    return lines
+
+
+def run_serial(packages: Iterable[Package],
+               chunk_size: int = DEFAULT_CHUNK_SIZE,
+               stats: Optional[PipelineStats] = None,
+               skip_unknown: bool = False,
+               process: Callable[..., Tuple[list, PipelineStats]] = (
+                   process_chunk),
+               ) -> Iterator:
+    """Последовательно получить строки отчёта для потока пакетов."""
+    for chunk in chunked(packages, chunk_size):
+        yield from _collect(process(chunk, skip_unknown), stats)
+
+
+def run_parallel(packages: Iterable[Package],
+                 workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 executor: Optional[Executor] = None,
+                 stats: Optional[PipelineStats] = None,
+                 skip_unknown: bool = False,
+                 process: Callable[..., Tuple[list, PipelineStats]] = (
+                     process_chunk),
+                 ) -> Iterator:
+    """Получить строки отчёта, распределив порции по пулу процессов.
+
+    В работе одновременно не больше `2 * workers` порций, поэтому чтение
+    входа не убегает вперёд записи результатов. С ``process=compute_chunk``
+    вместо строк возвращаются сами сообщения.
+    """
+    workers = workers or os.cpu_count() or 1
+    if executor is None:
+        with ProcessPoolExecutor(workers) as executor:
+            yield from run_parallel(packages, workers, chunk_size, executor,
+                                    stats, skip_unknown, process)
+        return
+    pending: Deque[Future] = deque()
+    for chunk in chunked(packages, chunk_size):
+        pending.append(executor.submit(process, chunk, skip_unknown))
+        if len(pending) >= 2 * workers:
+            yield from _collect(pending.popleft().result(), stats)
+    while pending:
+        yield from _collect(pending.popleft().result(), stats)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Обработать файл или stdin на нескольких ядрах.
+
+    Статистика выводится в stderr, как у `pipeline`.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('input', nargs='?', type=argparse.FileType('r'),
+                        default=sys.stdin)
+    parser.add_argument('-o', '--output', type=argparse.FileType('w'),
+                        default=sys.stdout)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    stats: PipelineStats = PipelineStats()
+    packages = parse_packages(read_lines(args.input, stats), stats)
+    if args.workers > 1:
+        lines = run_parallel(packages, args.workers, args.chunk_size,
+                             stats=stats, skip_unknown=True)
+    else:
+        lines = run_serial(packages, args.chunk_size, stats,
+                           skip_unknown=True)
+    for chunk in chunked(lines, args.chunk_size):
+        args.output.write('\n'.join(chunk) + '\n')
+    args.output.flush()
+    print(stats, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+"""Потоковая обработка файлов с пакетами данных от блока датчиков.
+
+Каждая строка входного потока содержит один пакет: код тренировки и
+параметры через пробел, например ``RUN 15000 1 75``. Этапы конвейера
+связаны генераторами, поэтому следующий пакет читается только тогда,
+когда предыдущий записан, а память не зависит от размера входа.
+"""
+import argparse
+import sys
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import (Callable, Iterable, Iterator, List, Optional, TextIO,
+                    Tuple)
+
+import instrument
+from homework import InfoMessage, Training, format_many, read_package
+from instrument import Recorder
+
+DEFAULT_CHUNK_SIZE: int = 64 * 1024
+MAX_LINE_LENGTH: int = 4096
+WRITE_BUFFER_LINES: int = 1024
+# Ошибки расчёта показателей по допустимому по форме пакету: нулевая
+# длительность, переполнение float при огромных значениях.
+CALCULATION_ERRORS: Tuple[type, ...] = (ZeroDivisionError, OverflowError,
+                                        ValueError)
+
+Formatter = Callable[[Iterable[InfoMessage]], str]
+
+
+@dataclass
+class PipelineStats:
+    """Счётчики обработанных строк и пакетов."""
+
+    lines: int = 0
+    packages: int = 0
+    written: int = 0
+    malformed: int = 0
+    unknown: int = 0
+
+
+def parse_line(line: str) -> Tuple[str, list]:
+    """Разобрать строку пакета в пару `(workout_type, data)`.
+
+    Целые без знака становятся int, остальные значения — float.
+    """
+    workout_type, *values = line.split()
+    return workout_type, [int(value) if value.isdecimal() else float(value)
+                          for value in values]
+
+
+def format_package(workout_type: str, data: Iterable) -> str:
+    """Записать пакет в строковом формате конвейера."""
+    return ' '.join([workout_type, *map(str, data)])
+
+
+def _drop_long_lines(lines: List[str],
+                     stats: PipelineStats,
+                     max_line_length: int) -> List[str]:
+    """Убрать из блока слишком длинные строки и посчитать их."""
+    kept: List[str] = [line for line in lines
+                       if len(line) <= max_line_length]
+    stats.malformed += len(lines) - len(kept)
+    return kept
+
+
+def read_lines(stream: TextIO,
+               stats: PipelineStats,
+               chunk_size: int = DEFAULT_CHUNK_SIZE,
+               max_line_length: int = MAX_LINE_LENGTH,
+               recorder: Optional[Recorder] = None,
+               ) -> Iterator[str]:
+    """Читать поток блоками фиксированного размера и отдавать строки.
+
+    Строки длиннее `max_line_length` пропускаются и считаются
+    некорректными независимо от размера блока.
+    """
+    tail: str = ''
+    skipping: bool = False
+    while True:
+        if recorder is not None:
+            start: int = perf_counter_ns()
+        chunk: str = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines: List[str] = (tail + chunk).split('\n')
+        tail = lines.pop()
+        if recorder is not None:
+            recorder.add('read', perf_counter_ns() - start)
+        if skipping:
+            if not lines:
+                tail = ''
+                continue
+            lines.pop(0)
+            skipping = False
+        if len(tail) > max_line_length:
+            stats.malformed += 1
+            tail = ''
+            skipping = True
+        if lines and max(map(len, lines)) > max_line_length:
+            lines = _drop_long_lines(lines, stats, max_line_length)
+        yield from lines
+    if tail:
+        yield from _drop_long_lines([tail], stats, max_line_length)
+
+
+def parse_packages(lines: Iterable[str],
+                   stats: PipelineStats,
+                   recorder: Optional[Recorder] = None,
+                   ) -> Iterator[Tuple[str, list]]:
+    """Разобрать строки, пропуская пустые и некорректные."""
+    for line in lines:
+        stats.lines += 1
+        if not line.strip():
+            continue
+        try:
+            if recorder is None:
+                package: Tuple[str, list] = parse_line(line)
+            else:
+                start: int = perf_counter_ns()
+                package = parse_line(line)
+                recorder.add('parse', perf_counter_ns() - start)
+        except ValueError:
+            stats.malformed += 1
+            continue
+        yield package
+
+
+def build_trainings(packages: Iterable[Tuple[str, list]],
+                    stats: PipelineStats,
+                    recorder: Optional[Recorder] = None,
+                    ) -> Iterator[Training]:
+    """Создать объекты тренировок через `read_package`."""
+    for workout_type, data in packages:
+        stats.packages += 1
+        try:
+            if recorder is None:
+                training: Training = read_package(workout_type, data)
+            else:
+                start: int = perf_counter_ns()
+                training = read_package(workout_type, data)
+                recorder.add('read_package', perf_counter_ns() - start)
+        except KeyError:
+            stats.unknown += 1
+            continue
+        except TypeError:
+            stats.malformed += 1
+            continue
+        yield training
+
+
+def show_info(trainings: Iterable[Training],
+              stats: PipelineStats,
+              recorder: Optional[Recorder] = None,
+              ) -> Iterator[InfoMessage]:
+    """Получить информационные сообщения о тренировках."""
+    if recorder is not None:
+        yield from _show_info_recorded(trainings, stats, recorder)
+        return
+    for training in trainings:
+        try:
+            yield training.show_training_info()
+        except CALCULATION_ERRORS:
+            stats.malformed += 1
+
+
+def _show_info_recorded(trainings: Iterable[Training],
+                        stats: PipelineStats,
+                        recorder: Recorder,
+                        ) -> Iterator[InfoMessage]:
+    """Получить сообщения, замеряя расчёт и создание сообщения отдельно.
+
+    Сначала вычисляются и кешируются метрики тренировки, затем
+    `show_training_info` берёт их из кеша и только собирает сообщение.
+    """
+    for training in trainings:
+        start: int = perf_counter_ns()
+        try:
+            training.get_distance()
+            training.get_mean_speed()
+            training.get_spent_calories()
+        except CALCULATION_ERRORS:
+            stats.malformed += 1
+            continue
+        calculated: int = perf_counter_ns()
+        message: InfoMessage = training.show_training_info()
+        finished: int = perf_counter_ns()
+        recorder.add('calculate', calculated - start)
+        recorder.add('info_message', finished - calculated)
+        recorder.observe(type(training).CODE, finished - start)
+        yield message
+
+
+def write_messages(messages: Iterable[InfoMessage],
+                   out: TextIO,
+                   stats: PipelineStats,
+                   buffer_lines: int = WRITE_BUFFER_LINES,
+                   recorder: Optional[Recorder] = None,
+                   formatter: Formatter = format_many,
+                   ) -> None:
+    """Записать сообщения в поток порциями по `buffer_lines` строк.
+
+    `formatter` превращает порцию сообщений в текст для одной записи.
+    """
+    buffer: List[InfoMessage] = []
+    for message in messages:
+        buffer.append(message)
+        if len(buffer) >= buffer_lines:
+            _flush(buffer, out, stats, recorder, formatter)
+    if buffer:
+        _flush(buffer, out, stats, recorder, formatter)
+
+
+def _flush(buffer: List[InfoMessage],
+           out: TextIO,
+           stats: PipelineStats,
+           recorder: Optional[Recorder],
+           formatter: Formatter) -> None:
+    """Записать накопленные сообщения одним вызовом `write`."""
+    start: int = perf_counter_ns()
+    out.write(formatter(buffer))
+    if recorder is not None:
+        recorder.add('write', perf_counter_ns() - start, len(buffer))
+    stats.written += len(buffer)
+    buffer.clear()
+
+
+def run_pipeline(src: TextIO,
+                 dst: TextIO,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 recorder: Optional[Recorder] = None,
+                 formatter: Formatter = format_many,
+                 ) -> PipelineStats:
+    """Обработать поток пакетов и записать отчёты о тренировках.
+
+    Если `recorder` не передан, используется включённый через
+    `with Recorder()`, если такой есть.
+    """
+    if recorder is None:
+        recorder = instrument.active()
+    stats: PipelineStats = PipelineStats()
+    lines = read_lines(src, stats, chunk_size, recorder=recorder)
+    packages = parse_packages(lines, stats, recorder)
+    trainings = build_trainings(packages, stats, recorder)
+    messages = show_info(trainings, stats, recorder)
+    write_messages(messages, dst, stats, recorder=recorder,
+                   formatter=formatter)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Обработать файл или stdin и вывести статистику в stderr."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('input', nargs='?', type=argparse.FileType('r'),
+                        default=sys.stdin)
+    parser.add_argument('-o', '--output', type=argparse.FileType('w'),
+                        default=sys.stdout)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--profile', metavar='PATH',
+                        help='сохранить статистику этапов в JSON')
+    args = parser.parse_args(argv)
+    recorder: Optional[Recorder] = Recorder() if args.profile else None
+    stats: PipelineStats = run_pipeline(args.input, args.output,
+                                        args.chunk_size, recorder)
+    args.output.flush()
+    print(stats, file=sys.stderr)
+    if recorder is not None:
+        recorder.dump(args.profile)
+        print(recorder.summary(), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""Asyncio-сервер приёма пакетов от устройств в реальном времени.
+
+Протокол строковый: клиент присылает пакеты по одному в строке в формате
+конвейера (``RUN 15000 1 75``), сервер на каждый пакет отвечает строкой
+с сообщением о тренировке или строкой ``ERR <причина>``. Клиент может
+отправлять пакеты, не дожидаясь ответов: ответы приходят в том же
+порядке, что и запросы.
+"""
+import argparse
+import asyncio
+from typing import List, Optional
+
+from cache import ResultCache
+from homework import read_package
+from pipeline import CALCULATION_ERRORS, MAX_LINE_LENGTH, parse_line
+
+DEFAULT_PORT: int = 8765
+MAX_CONNECTIONS: int = 1024
+MAX_PIPELINE: int = 128
+ERROR_UNKNOWN: str = 'ERR unknown'
+ERROR_MALFORMED: str = 'ERR malformed'
+
+
+def handle_line(line: str, cache: Optional[ResultCache] = None) -> str:
+    """Получить строку ответа на один пакет."""
+    try:
+        if cache is not None:
+            return cache.get_text(*parse_line(line))
+        training = read_package(*parse_line(line))
+        return training.show_training_info().get_message()
+    except KeyError:
+        return ERROR_UNKNOWN
+    except (TypeError, *CALCULATION_ERRORS):
+        return ERROR_MALFORMED
+
+
+class PackageServer:
+    """Сервер расчёта тренировок с ограничениями на нагрузку.
+
+    `max_connections` ограничивает число одновременно обслуживаемых
+    соединений, `max_pipeline` — число ответов, ожидающих отправки
+    в одном соединении: при заполнении очереди сервер перестаёт читать
+    новые пакеты этого клиента. С `cache` повторно присланные пакеты
+    не рассчитываются заново.
+    """
+
+    def __init__(self,
+                 max_connections: int = MAX_CONNECTIONS,
+                 max_pipeline: int = MAX_PIPELINE,
+                 cache: Optional[ResultCache] = None,
+                 ) -> None:
+        self.max_pipeline: int = max_pipeline
+        self.cache: Optional[ResultCache] = cache
+        self.connections: asyncio.Semaphore = asyncio.Semaphore(
+            max_connections)
+        self.packages: int = 0
+
+    async def handle(self,
+                     reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter,
+                     ) -> None:
+        """Обслужить одно соединение."""
+        async with self.connections:
+            queue: asyncio.Queue = asyncio.Queue(self.max_pipeline)
+            sender: asyncio.Task = asyncio.create_task(
+                self._send(queue, writer))
+            try:
+                async for raw in reader:
+                    if writer.is_closing():
+                        break
+                    line: str = raw.decode(errors='replace').strip()
+                    if line:
+                        await queue.put(handle_line(line, self.cache))
+            except (ConnectionError, asyncio.LimitOverrunError,
+                    ValueError):
+                pass
+            finally:
+                await queue.put(None)
+                await sender
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except ConnectionError:
+                    pass
+
+    async def _send(self,
+                    queue: asyncio.Queue,
+                    writer: asyncio.StreamWriter,
+                    ) -> None:
+        """Отправлять ответы из очереди, объединяя готовые в одну запись.
+
+        Если клиент разорвал соединение, ответы дальше только забираются
+        из очереди до конца, чтобы чтение пакетов не ждало места в ней.
+        """
+        connected: bool = True
+        while True:
+            lines: List[str] = [await queue.get()]
+            while not queue.empty():
+                lines.append(queue.get_nowait())
+            done: bool = lines[-1] is None
+            if done:
+                lines.pop()
+            if lines and connected:
+                self.packages += len(lines)
+                writer.write(('\n'.join(lines) + '\n').encode())
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    connected = False
+                    writer.close()
+            if done:
+                return
+
+    async def start(self,
+                    host: Optional[str] = None,
+                    port: int = DEFAULT_PORT,
+                    path: Optional[str] = None,
+                    ) -> asyncio.AbstractServer:
+        """Запустить TCP-сервер или сервер на Unix-сокете `path`."""
+        if path is not None:
+            return await asyncio.start_unix_server(
+                self.handle, path, limit=MAX_LINE_LENGTH)
+        return await asyncio.start_server(
+            self.handle, host, port, limit=MAX_LINE_LENGTH)
+
+
+async def serve(host: Optional[str] = None,
+                port: int = DEFAULT_PORT,
+                path: Optional[str] = None,
+                max_connections: int = MAX_CONNECTIONS,
+                max_pipeline: int = MAX_PIPELINE,
+                cache: Optional[ResultCache] = None,
+                ) -> None:
+    """Принимать пакеты, пока процесс не остановят."""
+    server = await PackageServer(max_connections, max_pipeline,
+                                 cache).start(host, port, path)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Запустить сервер из командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', help='путь к Unix-сокету')
+    parser.add_argument('--max-connections', type=int,
+                        default=MAX_CONNECTIONS)
+    parser.add_argument('--max-pipeline', type=int, default=MAX_PIPELINE)
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help='кэшировать ответы на повторные пакеты')
+    parser.add_argument('--cache-ttl', type=float,
+                        help='срок жизни ответа в кэше, с')
+    parser.add_argument('--cache-path', help='файл SQLite для кэша')
+    args = parser.parse_args(argv)
+    cache: Optional[ResultCache] = None
+    if args.cache_size:
+        cache = ResultCache(args.cache_size, args.cache_ttl, args.cache_path)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix,
+                          args.max_connections, args.max_pipeline, cache))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+if __name__ == '__main__':
+    main()
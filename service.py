@@ -0,0 +1,163 @@
+"""Общий для потоков сервис расчёта тренировок.
+
+Один экземпляр `CalculatorService` создаётся при запуске приложения
+и вызывается из любого числа потоков::
+
+    calculator = CalculatorService()
+    message = calculator.calculate('RUN', [15000, 1, 75])
+
+`calculate` не создаёт объект тренировки и ничего не записывает
+в общее состояние: показатели считаются чистыми функциями по тем же
+формулам и в том же порядке операций, что и методы классов, поэтому
+результат побитово равен ``read_package(...).show_training_info()``.
+
+С `batch_window` сервис также собирает конкурентные запросы
+`submit` за короткое окно и считает их колонками пакетным движком.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from batch import KERNELS, SCALAR_KERNELS, Metrics, compute_batch
+from homework import WORKOUT_TYPES, InfoMessage, read_package
+from validate import validate_rows
+
+MAX_BATCH: int = 4096
+
+Request = Tuple[str, Sequence, Future]
+
+
+class CalculatorService:
+    """Расчёт сообщений о тренировках для многих потоков.
+
+    Таблица видов тренировок собирается при создании сервиса и далее
+    только читается. Виды, зарегистрированные без скалярной функции,
+    считаются через объект тренировки. Фоновый поток микропакетов
+    запускается, только если задано `batch_window`.
+    """
+
+    def __init__(self,
+                 batch_window: Optional[float] = None,
+                 max_batch: int = MAX_BATCH,
+                 ) -> None:
+        self._kernels: Dict[str, Tuple[str, Optional[Callable]]] = {
+            code: (training_class.__name__, SCALAR_KERNELS.get(code))
+            for code, training_class in WORKOUT_TYPES.items()
+        }
+        self.batch_window: Optional[float] = batch_window
+        self.max_batch: int = max_batch
+        self.batches: int = 0
+        self._requests: queue.SimpleQueue = queue.SimpleQueue()
+        self._worker: Optional[threading.Thread] = None
+        if batch_window is not None:
+            self._worker = threading.Thread(
+                target=self._serve_batches, name='calculator-batches',
+                daemon=True)
+            self._worker.start()
+
+    def calculate(self, workout_type: str, data: Sequence) -> InfoMessage:
+        """Рассчитать сообщение о тренировке по пакету.
+
+        Ошибки те же, что у ``read_package(...).show_training_info()``.
+        """
+        training_type, kernel = self._kernels[workout_type]
+        if kernel is None:
+            return read_package(workout_type, data).show_training_info()
+        metrics: Metrics = kernel(*data)
+        return InfoMessage(training_type, data[1], *metrics)
+
+    def submit(self, workout_type: str, data: Sequence) -> Future:
+        """Поставить пакет в очередь микропакетов, вернуть Future."""
+        future: Future = Future()
+        if self._worker is None:
+            try:
+                future.set_result(self.calculate(workout_type, data))
+            except Exception as error:
+                future.set_exception(error)
+            return future
+        self._requests.put((workout_type, data, future))
+        return future
+
+    def calculate_batched(self,
+                          workout_type: str,
+                          data: Sequence) -> InfoMessage:
+        """Рассчитать сообщение через очередь микропакетов."""
+        return self.submit(workout_type, data).result()
+
+    def _serve_batches(self) -> None:
+        """Собирать запросы за окно `batch_window` и считать их вместе."""
+        while True:
+            request: Optional[Request] = self._requests.get()
+            if request is None:
+                return
+            requests: List[Request] = [request]
+            deadline: float = time.monotonic() + self.batch_window
+            while len(requests) < self.max_batch:
+                timeout: float = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._requests.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is None:
+                    self._run_batch(requests)
+                    return
+                requests.append(request)
+            self._run_batch(requests)
+
+    def _run_batch(self, requests: List[Request]) -> None:
+        """Рассчитать накопленные запросы по видам тренировок."""
+        self.batches += 1
+        groups: Dict[str, List[Request]] = {}
+        for request in requests:
+            groups.setdefault(request[0], []).append(request)
+        for workout_type, group in groups.items():
+            if workout_type not in KERNELS:
+                self._run_each(group)
+                continue
+            try:
+                self._run_group(workout_type, group)
+            except Exception:
+                # Пакет прошёл проверку, но пакетный расчёт упал
+                # (например, переполнение): досчитать группу по одному,
+                # чтобы каждый запрос получил свой результат или ошибку.
+                self._run_each([request for request in group
+                                if not request[2].done()])
+
+    def _run_group(self, workout_type: str, group: List[Request]) -> None:
+        """Рассчитать запросы одного вида тренировки колонками."""
+        result = validate_rows(workout_type, [data for _, data, _ in group])
+        # Отклонённые пакеты считаются по одному, чтобы вернуть
+        # те же исключения, что и `calculate`.
+        rejected: set = {i for i, _ in result.rejected}
+        self._run_each([group[i] for i in sorted(rejected)])
+        accepted: List[Future] = [future for i, (_, _, future)
+                                  in enumerate(group)
+                                  if i not in rejected]
+        messages = compute_batch(workout_type, result.columns).messages()
+        for future, message in zip(accepted, messages):
+            future.set_result(message)
+
+    def _run_each(self, requests: List[Request]) -> None:
+        """Рассчитать запросы по одному."""
+        for workout_type, data, future in requests:
+            try:
+                future.set_result(self.calculate(workout_type, data))
+            except Exception as error:
+                future.set_exception(error)
+
+    def close(self) -> None:
+        """Досчитать поставленные запросы и остановить фоновый поток."""
+        if self._worker is not None:
+            self._requests.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def __enter__(self) -> 'CalculatorService':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,155 @@
+"""Текущие тренировки, обновляемые по частичным данным датчиков.
+
+Устройство во время тренировки присылает приращения: шаги или гребки,
+прошедшее время в часах и проплытые бассейны. `LiveSession` копит
+итоги и по запросу считает дистанцию, скорость и калории за O(1)
+формулами классов тренировок в том же порядке операций, поэтому
+сообщение по итогам побитово равно ``show_training_info()`` тренировки
+с теми же полями.
+
+Шаги и бассейны — целые числа и складываются точно. Время
+складывается с компенсацией ошибки округления (алгоритм Ноймайера):
+720 приращений по 5 секунд дают ровно 1.0 ч, а не 0.9999999999999968,
+как при простом сложении.
+
+    session = LiveSession('RUN', weight=75)
+    session.update(steps=1250, elapsed=5 / 60)
+    session.get_distance()
+"""
+from typing import Dict, Hashable, Optional, Tuple, Type
+
+from batch import SCALAR_KERNELS, Metrics
+from homework import WORKOUT_TYPES, InfoMessage, Training
+
+LAP_FIELD: str = 'count_pool'
+
+
+class LiveSession:
+    """Текущая тренировка одного устройства."""
+
+    __slots__ = ('workout_type', 'action', 'laps', 'params', '_elapsed',
+                 '_compensation', '_metrics')
+
+    def __init__(self, workout_type: str, weight: float, *params) -> None:
+        training_class: Type[Training] = WORKOUT_TYPES[workout_type]
+        fields: Tuple[str, ...] = training_class.FIELDS
+        static: int = len(fields) - 3 - (fields[-1] == LAP_FIELD)
+        if len(params) != static:
+            raise TypeError(f'{training_class.__name__}: ожидается '
+                            f'{static} постоянных параметров после веса.')
+        self.workout_type: str = workout_type
+        self.action: int = 0
+        self._elapsed: float = 0.0
+        self.laps: Optional[int] = 0 if fields[-1] == LAP_FIELD else None
+        self.params: tuple = (weight, *params)
+        self._compensation: float = 0.0
+        self._metrics: Optional[Metrics] = None
+
+    def update(self, steps: int = 0, elapsed: float = 0.0,
+               laps: int = 0) -> None:
+        """Добавить приращения шагов, времени и бассейнов."""
+        if steps < 0 or elapsed < 0 or laps < 0:
+            raise ValueError('Приращения не могут быть отрицательными.')
+        if laps and self.laps is None:
+            raise ValueError('Бассейны есть только у плавания.')
+        self.action += steps
+        if elapsed:
+            previous: float = self._elapsed
+            total: float = previous + elapsed
+            if previous >= elapsed:
+                self._compensation += (previous - total) + elapsed
+            else:
+                self._compensation += (elapsed - total) + previous
+            self._elapsed = total
+        if laps:
+            self.laps += laps
+        self._metrics = None
+
+    def observe(self, action: int, duration: float,
+                laps: Optional[int] = None) -> None:
+        """Записать накопленные показания датчиков вместо приращений."""
+        laps_done: int = self.laps or 0
+        if (action < self.action or duration < self.duration
+                or laps is not None and laps < laps_done):
+            raise ValueError('Накопленные показания не могут убывать.')
+        self.update(action - self.action, 0.0,
+                    0 if laps is None else laps - laps_done)
+        self._elapsed = duration
+        self._compensation = 0.0
+
+    @property
+    def duration(self) -> float:
+        """Длительность тренировки в часах."""
+        return self._elapsed + self._compensation
+
+    def fields(self) -> tuple:
+        """Получить поля пакета по текущим итогам."""
+        laps: tuple = () if self.laps is None else (self.laps,)
+        return (self.action, self.duration, *self.params, *laps)
+
+    def training(self) -> Training:
+        """Создать объект тренировки по текущим итогам."""
+        return WORKOUT_TYPES[self.workout_type](*self.fields())
+
+    def metrics(self) -> Metrics:
+        """Получить дистанцию, скорость и калории по текущим итогам."""
+        if self._metrics is None:
+            kernel = SCALAR_KERNELS.get(self.workout_type)
+            if kernel is None:
+                training: Training = self.training()
+                self._metrics = (training.get_distance(),
+                                 training.get_mean_speed(),
+                                 training.get_spent_calories())
+            else:
+                self._metrics = kernel(*self.fields())
+        return self._metrics
+
+    def get_distance(self) -> float:
+        """Получить дистанцию в км."""
+        return self.metrics()[0]
+
+    def get_mean_speed(self) -> float:
+        """Получить среднюю скорость движения."""
+        return self.metrics()[1]
+
+    def get_spent_calories(self) -> float:
+        """Получить количество затраченных калорий."""
+        return self.metrics()[2]
+
+    def show_training_info(self) -> InfoMessage:
+        """Получить информационное сообщение по текущим итогам."""
+        return InfoMessage(WORKOUT_TYPES[self.workout_type].__name__,
+                           self.duration, *self.metrics())
+
+
+class SessionStore:
+    """Текущие тренировки многих устройств по ключу сессии."""
+
+    def __init__(self) -> None:
+        self.sessions: Dict[Hashable, LiveSession] = {}
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.sessions
+
+    def start(self, key: Hashable, workout_type: str, weight: float,
+              *params) -> LiveSession:
+        """Начать тренировку; ключ не должен быть занят."""
+        if key in self.sessions:
+            raise KeyError(f'Сессия {key!r} уже начата.')
+        session: LiveSession = LiveSession(workout_type, weight, *params)
+        self.sessions[key] = session
+        return session
+
+    def update(self, key: Hashable, steps: int = 0, elapsed: float = 0.0,
+               laps: int = 0) -> LiveSession:
+        """Добавить приращения к начатой тренировке."""
+        session: LiveSession = self.sessions[key]
+        session.update(steps, elapsed, laps)
+        return session
+
+    def finish(self, key: Hashable) -> InfoMessage:
+        """Завершить тренировку и получить итоговое сообщение."""
+        return self.sessions.pop(key).show_training_info()
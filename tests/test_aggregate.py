@@ -0,0 +1,83 @@
+import aggregate
+import batch
+import homework
+
+DAY = 24 * 60 * 60
+
+
+def info(workout_type, data):
+    return homework.read_package(workout_type, data).show_training_info()
+
+
+def test_aggregator_slices():
+    aggregator = aggregate.Aggregator(window=aggregate.WEEK)
+    run = info('RUN', [15000, 1, 75])
+    swim = info('SWM', [720, 1, 80, 25, 40])
+    aggregator.add('alice', run, 0)
+    aggregator.add('alice', swim, DAY)
+    aggregator.add('alice', run, 8 * DAY)
+    aggregator.add('bob', run, 0)
+
+    total = aggregator.get('alice')
+    assert total.count == 3
+    assert total.distance == run.distance + swim.distance + run.distance
+    assert aggregator.get('alice', 'Running').count == 2
+    assert aggregator.get('alice', timestamp=2 * DAY).count == 2
+    assert aggregator.get('alice', 'Swimming', 9 * DAY).count == 0
+    assert aggregator.get('bob').get_mean_speed() == run.speed
+    assert [start for start, _ in aggregator.periods('alice')] == [
+        0, aggregate.WEEK
+    ]
+
+
+def test_aggregator_add_batch():
+    rows = [[15000, 1, 75], [9000, 2, 80]]
+    columns = dict(zip(homework.Running.FIELDS, zip(*rows)))
+    by_batch = aggregate.Aggregator()
+    by_batch.add_batch('alice', batch.compute_batch('RUN', columns), [0, 1])
+    by_message = aggregate.Aggregator()
+    for timestamp, data in enumerate(rows):
+        by_message.add('alice', info('RUN', data), timestamp)
+    assert by_batch.get('alice') == by_message.get('alice')
+
+
+def test_snapshot_restore(tmp_path):
+    aggregator = aggregate.Aggregator(window=DAY)
+    aggregator.add('alice', info('WLK', [9000, 1, 75, 180]), 3 * DAY)
+    aggregator.add(42, info('RUN', [1206, 12, 6]), 5)
+    path = str(tmp_path / 'totals.json')
+    aggregator.snapshot(path)
+    restored = aggregate.Aggregator.restore(path)
+    assert restored.window == DAY
+    assert restored.totals == aggregator.totals
+    restored.add(42, info('RUN', [1206, 12, 6]), 5)
+    assert restored.get(42, 'Running', 0).count == 2
+
+
+def test_swimming_mean_speed():
+    swim = info('SWM', [720, 1, 80, 25, 40])
+    aggregator = aggregate.Aggregator()
+    aggregator.add('alice', swim, 0)
+    assert aggregator.get('alice').get_mean_speed() == swim.speed == 1.0, (
+        'Скорость плавания считается по бассейнам, а не по дистанции'
+    )
+    columns = {'action': [720], 'duration': [1], 'weight': [80],
+               'length_pool': [25], 'count_pool': [40]}
+    by_batch = aggregate.Aggregator()
+    by_batch.add_batch('alice', batch.compute_batch('SWM', columns), [0])
+    assert by_batch.get('alice') == aggregator.get('alice')
+
+
+def test_snapshot_tuple_users(tmp_path):
+    aggregator = aggregate.Aggregator()
+    aggregator.add(('dev', 1), info('RUN', [15000, 1, 75]), 0)
+    path = str(tmp_path / 'totals.json')
+    aggregator.snapshot(path)
+    restored = aggregate.Aggregator.restore(path)
+    assert restored.totals == aggregator.totals
+    assert restored.get(('dev', 1)).count == 1
+
+
+def test_empty_totals():
+    assert aggregate.Totals().get_mean_speed() == 0.0
+    assert aggregate.Aggregator().get('nobody') == aggregate.Totals()
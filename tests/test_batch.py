@@ -0,0 +1,39 @@
+import pytest
+
+import batch
+import homework
+
+
+@pytest.mark.parametrize('workout_type, rows', [
+    ('RUN', [[15000, 1, 75], [1206, 12, 6], [9000, 1, 75], [420, 4, 20]]),
+    ('WLK', [[9000, 1, 75, 180], [420, 4, 20, 42], [1206, 12, 6, 12]]),
+    ('SWM', [[720, 1, 80, 25, 40], [420, 4, 20, 42, 4],
+             [1206, 12, 6, 12, 6]]),
+])
+def test_compute_batch_matches_scalar(workout_type, rows):
+    columns = dict(zip(homework.WORKOUT_TYPES[workout_type].FIELDS, zip(*rows)))
+    result = batch.compute_batch(workout_type, columns)
+    assert len(result) == len(rows)
+    for i, data in enumerate(rows):
+        training = homework.read_package(workout_type, data)
+        assert result.distance[i] == training.get_distance()
+        assert result.speed[i] == training.get_mean_speed()
+        assert result.calories[i] == training.get_spent_calories(), (
+            'Пакетный расчёт должен совпадать с методами классов.'
+        )
+
+
+def test_compute_batch_messages():
+    columns = {'action': [9000], 'duration': [1], 'weight': [75],
+               'height': [180]}
+    result = batch.compute_batch('WLK', columns)
+    expected = homework.read_package('WLK', [9000, 1, 75, 180])
+    assert list(result.messages()) == [expected.show_training_info()]
+
+
+def test_compute_batch_errors():
+    with pytest.raises(KeyError):
+        batch.compute_batch('BOX', {})
+    with pytest.raises(ValueError):
+        batch.compute_batch('RUN', {'action': [1, 2], 'duration': [1],
+                                    'weight': [75, 80]})
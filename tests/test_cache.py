@@ -0,0 +1,118 @@
+import pytest
+
+import cache
+import homework
+import server
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def expected(workout_type, data):
+    return homework.read_package(workout_type, data).show_training_info()
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', [15000, 1, 75]),
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('WLK', [9000, 1, 75, 180]),
+])
+def test_cached_message_matches(workout_type, data):
+    results = cache.ResultCache()
+    first = results.get_message(workout_type, data)
+    assert first == expected(workout_type, data), (
+        'Сообщение из кэша должно совпадать с расчётом'
+    )
+    assert results.get_message(workout_type, list(data)) is first
+    assert results.get_text(workout_type, data) == first.get_message()
+    assert results.stats.misses == 1
+    assert results.stats.hits == 2
+
+
+def test_equal_values_share_entry():
+    results = cache.ResultCache()
+    results.get_message('RUN', [15000, 1, 75])
+    results.get_message('RUN', [15000.0, 1.0, 75.0])
+    assert len(results) == 1
+    assert results.stats.hits == 1
+
+
+def test_lru_eviction():
+    results = cache.ResultCache(maxsize=2)
+    results.get_message('RUN', [1, 1, 1])
+    results.get_message('RUN', [2, 1, 1])
+    results.get_message('RUN', [1, 1, 1])
+    results.get_message('RUN', [3, 1, 1])
+    assert results.stats.evictions == 1
+    results.get_message('RUN', [1, 1, 1])
+    assert results.stats.hits == 2, (
+        'Недавно запрошенный пакет не должен вытесняться'
+    )
+    results.get_message('RUN', [2, 1, 1])
+    assert results.stats.misses == 4
+
+
+def test_ttl_expiration():
+    clock = Clock()
+    results = cache.ResultCache(ttl=60, clock=clock)
+    first = results.get_message('RUN', [15000, 1, 75])
+    clock.now += 59
+    assert results.get_message('RUN', [15000, 1, 75]) is first
+    clock.now += 1
+    assert results.get_message('RUN', [15000, 1, 75]) is not first
+    assert results.stats.expirations == 1
+    assert results.stats.misses == 2
+    clock.now += 60
+    assert results.prune() == 1
+    assert len(results) == 0
+
+
+def test_errors_not_cached():
+    results = cache.ResultCache()
+    with pytest.raises(KeyError):
+        results.get_message('BOX', [1, 2, 3])
+    with pytest.raises(TypeError):
+        results.get_message('RUN', [1, 2])
+    assert len(results) == 0
+    with pytest.raises(ValueError):
+        cache.ResultCache(maxsize=0)
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    with cache.ResultCache(path=path) as results:
+        message = results.get_message('SWM', [720, 1, 80, 25, 40])
+    with cache.ResultCache(path=path) as results:
+        assert results.get_message('SWM', [720, 1, 80, 25, 40]) == message
+        assert results.stats.disk_hits == 1
+        assert results.stats.misses == 0
+        results.clear()
+        results.get_text('SWM', [720, 1, 80, 25, 40])
+        assert results.stats.disk_hits == 2
+
+
+def test_disk_tier_ttl(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    clock = Clock()
+    with cache.ResultCache(ttl=10, path=path, clock=clock) as results:
+        results.get_message('RUN', [15000, 1, 75])
+    clock.now += 10
+    with cache.ResultCache(ttl=10, path=path, clock=clock) as results:
+        results.get_message('RUN', [15000, 1, 75])
+        assert results.stats.disk_hits == 0
+        assert results.stats.expirations == 1
+
+
+def test_server_uses_cache():
+    results = cache.ResultCache()
+    line = 'RUN 15000 1 75'
+    assert server.handle_line(line, results) == server.handle_line(line)
+    assert server.handle_line(line, results) == server.handle_line(line)
+    assert server.handle_line('BOX 1 2 3', results) == server.ERROR_UNKNOWN
+    assert server.handle_line('RUN 1 0 3', results) == server.ERROR_MALFORMED
+    assert results.stats.hits == 1
@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+import math
+
+import pytest
+
+import cli
+import homework
+
+PACKAGES = 'RUN 15000 1 75\nSWM 720 1 80 25 40\nWLK 1206 12 6 12\n'
+
+
+def messages():
+    return [
+        homework.read_package('RUN', [15000, 1, 75]).show_training_info(),
+        homework.read_package('SWM', [720, 1, 80, 25, 40]
+                              ).show_training_info(),
+        homework.read_package('WLK', [1206, 12, 6, 12]).show_training_info(),
+    ]
+
+
+def test_text_format(tmp_path, capsys):
+    path = tmp_path / 'packages.txt'
+    path.write_text(PACKAGES)
+    assert cli.main([str(path), str(path), '-q']) == 0
+    expected = [m.get_message() for m in messages()] * 2
+    assert capsys.readouterr().out.splitlines() == expected
+
+
+def test_csv_format(tmp_path):
+    out = tmp_path / 'report.csv'
+    src = tmp_path / 'packages.txt'
+    src.write_text(PACKAGES)
+    assert cli.main([str(src), '-f', 'csv', '-o', str(out), '-q']) == 0
+    with open(out) as report:
+        rows = list(csv.DictReader(report))
+    assert [row['training_type'] for row in rows] == [
+        'Running', 'Swimming', 'SportsWalking'
+    ]
+    assert [float(row['calories']) for row in rows] == [
+        m.calories for m in messages()
+    ]
+
+
+def test_jsonl_format():
+    out = io.StringIO()
+    stats = cli.run([io.StringIO(PACKAGES + 'BOX 1\n')], out, 'jsonl')
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert rows == [
+        {'training_type': m.training_type, 'duration': m.duration,
+         'distance': m.distance, 'speed': m.speed, 'calories': m.calories}
+        for m in messages()
+    ]
+    assert stats.unknown == 1
+
+
+def test_jsonl_non_finite_values():
+    out = io.StringIO()
+    cli.run([io.StringIO('RUN 1 nan 75\nRUN 1 inf 75\n')], out, 'jsonl')
+    first, second = map(json.loads, out.getvalue().splitlines())
+    assert math.isnan(first['duration']) and math.isnan(first['calories'])
+    assert second['duration'] == math.inf, (
+        'Бесконечность должна записываться в виде, который читает json'
+    )
+
+
+@pytest.mark.parametrize('output_format', list(cli.FORMATS))
+def test_exit_code_on_bad_lines(tmp_path, output_format):
+    src = tmp_path / 'packages.txt'
+    src.write_text('RUN 1 0 75\n')
+    assert cli.main([str(src), '-f', output_format, '-q',
+                     '-o', str(tmp_path / 'out')]) == 1
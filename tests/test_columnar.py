@@ -0,0 +1,114 @@
+import io
+
+import pytest
+
+import batch
+import columnar
+import homework
+import pipeline
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [28000, 1.3, 70, 4]),
+] * 20
+
+
+def expected():
+    return [homework.read_package(*package).show_training_info()
+            for package in PACKAGES]
+
+
+@pytest.mark.parametrize('row_group_size', [1, 7, 100, 65536])
+def test_round_trip(tmp_path, row_group_size):
+    path = str(tmp_path / 'report.wcf')
+    messages = expected()
+    assert columnar.write_columnar(path, messages, row_group_size) == 100
+    with columnar.ColumnarReader(path) as reader:
+        assert len(reader) == 100
+        assert reader.row_groups == -(-100 // row_group_size)
+        assert list(reader.messages()) == messages, (
+            'Сообщения должны читаться без потери точности'
+        )
+        columns = reader.columns()
+    assert columns['training_type'] == [m.training_type for m in messages]
+    assert list(columns['calories']) == [m.calories for m in messages]
+
+
+def test_row_group_columns(tmp_path):
+    path = str(tmp_path / 'report.wcf')
+    messages = expected()
+    columnar.write_columnar(path, messages, row_group_size=30)
+    with columnar.ColumnarReader(path) as reader:
+        group = reader.read_row_group(1)
+        assert sorted(group) == sorted(columnar.COLUMNS)
+        assert group['training_type'] == [
+            m.training_type for m in messages[30:60]]
+        assert list(group['speed']) == [m.speed for m in messages[30:60]]
+        for name in columnar.FLOAT_COLUMNS:
+            group[name].release()
+
+
+def test_write_batch(tmp_path):
+    path = str(tmp_path / 'batch.wcf')
+    rows = [data for workout_type, data in PACKAGES if workout_type == 'RUN']
+    result = batch.compute_batch('RUN', dict(zip(
+        homework.Running.FIELDS, zip(*rows))))
+    with columnar.ColumnarWriter(path, row_group_size=16) as writer:
+        writer.write(expected()[0])
+        writer.write_batch(result)
+    with columnar.ColumnarReader(path) as reader:
+        assert reader.row_groups == 3
+        assert list(reader.messages()) == [
+            expected()[0], *result.messages()]
+
+
+def test_dictionary_overflow_starts_new_group(tmp_path):
+    path = str(tmp_path / 'types.wcf')
+    messages = [homework.InfoMessage(f'Type{i}', 1.0, 2.0, 3.0, 4.0)
+                for i in range(300)]
+    columnar.write_columnar(path, messages)
+    with columnar.ColumnarReader(path) as reader:
+        assert reader.row_groups == 2, (
+            'Словарь группы не должен превышать 256 видов тренировок'
+        )
+        assert list(reader.messages()) == messages
+
+
+def test_export_pipeline(tmp_path):
+    lines = [pipeline.format_package(*package) for package in PACKAGES]
+    lines[3:3] = ['RUN x 1', 'BOX 1 2 3', 'RUN 1 0 6']
+    text = '\n'.join(lines) + '\n'
+    path = str(tmp_path / 'report.wcf')
+    stats = columnar.export_pipeline(io.StringIO(text), path,
+                                     row_group_size=32, chunk_size=64)
+    expected_stats = pipeline.run_pipeline(io.StringIO(text), io.StringIO())
+    assert stats == expected_stats
+    with columnar.ColumnarReader(path) as reader:
+        assert list(reader.messages()) == expected()
+
+
+def test_main(tmp_path, capsys):
+    src = tmp_path / 'packages.txt'
+    src.write_text('RUN 15000 1 75\nSWM 720 1 80 25 40\n')
+    path = str(tmp_path / 'report.wcf')
+    columnar.main([str(src), '-o', path])
+    assert 'written=2' in capsys.readouterr().err
+    with columnar.ColumnarReader(path) as reader:
+        assert len(reader) == 2
+
+
+def test_bad_files(tmp_path):
+    path = tmp_path / 'bad.wcf'
+    path.write_bytes(b'')
+    with pytest.raises(columnar.ColumnarFormatError):
+        columnar.ColumnarReader(str(path))
+    path.write_bytes(b'WCF1')
+    with pytest.raises(columnar.ColumnarFormatError):
+        columnar.ColumnarReader(str(path))
+    columnar.write_columnar(str(path), expected())
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(columnar.ColumnarFormatError):
+        columnar.ColumnarReader(str(path))
@@ -0,0 +1,145 @@
+import math
+
+import pytest
+
+import batch
+import differential
+import homework
+
+PACKAGES = 2000
+
+
+def broken(workout_type, rows):
+    """Движок с ошибкой: лишняя калория при весе больше 100."""
+    messages = list(differential.run_batch(workout_type, rows))
+    for message, data in zip(messages, rows):
+        if data[2] > 100:
+            message.calories += 1
+    return messages
+
+
+def failing(workout_type, rows):
+    """Движок, который падает на нулевом числе шагов."""
+    if any(data[0] == 0 for data in rows):
+        raise ValueError('нет шагов')
+    return differential.run_batch(workout_type, rows)
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    monkeypatch.setitem(differential.ENGINES, 'broken',
+                        differential.Engine('broken', broken, default=False))
+    monkeypatch.setitem(differential.ENGINES, 'failing',
+                        differential.Engine('failing', failing,
+                                            default=False))
+
+
+@pytest.mark.parametrize('workout_type', ['RUN', 'WLK', 'SWM'])
+def test_generated_rows_are_valid(workout_type):
+    rows = differential.generate_rows(workout_type, PACKAGES, 'seed')
+    assert rows == differential.generate_rows(workout_type, PACKAGES,
+                                              'seed')
+    fields = homework.WORKOUT_TYPES[workout_type].FIELDS
+    for data in rows:
+        for name, value in zip(fields, data):
+            assert differential.RULES[name](value), (
+                f'Поле {name} вне допустимого диапазона: {value}'
+            )
+    assert any(isinstance(data[1], int) for data in rows)
+    assert any(isinstance(data[1], float) for data in rows)
+
+
+def test_default_engines_match_reference():
+    reports = differential.run_differential(packages=PACKAGES,
+                                            chunk_size=700)
+    assert {report.engine for report in reports} == {
+        'batch', 'service', 'cache', 'sessions', 'parallel'}
+    for report in reports:
+        assert report.checked == PACKAGES
+        assert report.mismatches == 0, str(report)
+
+
+def test_exact_engine_within_tolerance():
+    reports = differential.run_differential(['exact'], packages=PACKAGES)
+    assert sum(report.mismatches for report in reports) == 0
+    engine = differential.ENGINES['exact']
+    assert differential.find_mismatches(
+        engine, 'WLK', [[28000, 1.3, 70, 4]]), (
+        'Точный режим по-другому округляет целочисленное деление ходьбы'
+    )
+
+
+def test_parallel_matches_serial(engines):
+    serial = differential.run_differential(['batch', 'broken'], ['RUN'],
+                                           PACKAGES, chunk_size=500)
+    parallel = differential.run_differential(['batch', 'broken'], ['RUN'],
+                                             PACKAGES, workers=2,
+                                             chunk_size=500)
+    assert parallel == serial
+
+
+def test_counterexamples_are_minimized(engines):
+    (report,) = differential.run_differential(['broken'], ['RUN'],
+                                              PACKAGES)
+    assert report.mismatches > 0
+    assert len(report.counterexamples) == differential.MAX_EXAMPLES
+    for example in report.counterexamples:
+        assert example.data[2] > 100
+        assert example.minimized == [0, 1, 101], (
+            'Пакет должен упрощаться до самых простых значений'
+        )
+        assert example.actual[4] == example.expected[4] + 1
+    assert '[0, 1, 101]' in str(report)
+
+
+def test_engine_errors_are_reported(engines):
+    engine = differential.ENGINES['failing']
+    rows = [[15000, 1, 75], [0, 1, 75], [1206, 12, 6]]
+    (mismatch,) = differential.find_mismatches(engine, 'RUN', rows)
+    assert mismatch[0] == [0, 1, 75]
+    assert mismatch[2] == ('ValueError: нет шагов',)
+    assert differential.minimize(engine, 'RUN', [0, 2.5, 80.2]) == [0, 1, 1]
+
+
+def test_main(engines, capsys):
+    differential.main(['--engine', 'batch', '--packages', '100',
+                       '--workers', '1'])
+    assert 'batch SWM: 100 пакетов, 0 расхождений' in capsys.readouterr().out
+    with pytest.raises(SystemExit) as error:
+        differential.main(['--engine', 'broken', '--workout-type', 'RUN',
+                           '--packages', '100', '--workers', '1'])
+    assert error.value.code == 1
+
+
+def test_parallel_engine_compares_fields(monkeypatch):
+    rows = differential.generate_rows('WLK', 600, 'parallel')
+    messages = differential.run_parallel('WLK', rows)
+    assert messages == [homework.read_package('WLK', data).show_training_info()
+                        for data in rows]
+    assert differential.parallel_executor() is (
+        differential.parallel_executor()), 'Пул движка должен переиспользоваться'
+
+    def drifted(workout_type, rows):
+        messages = differential.run_parallel(workout_type, rows)
+        for message in messages:
+            message.calories = math.nextafter(message.calories, math.inf)
+        return messages
+
+    monkeypatch.setitem(differential.ENGINES, 'drifted', differential.Engine(
+        'drifted', drifted, default=False))
+    mismatches = differential.find_mismatches(
+        differential.ENGINES['drifted'], 'WLK', rows[:3])
+    assert len(mismatches) == 3, 'Расхождение в один ULP должно находиться'
+
+
+def test_parallel_engine_in_worker_pool():
+    (report,) = differential.run_differential(['parallel'], ['SWM'], 600,
+                                              workers=2, chunk_size=300)
+    assert (report.checked, report.mismatches) == (600, 0), (
+        'Движок parallel не должен создавать пулы в процессах проверки')
+
+
+def test_batch_engine_uses_columns():
+    rows = [[15000, 1, 75], [1206, 12, 6]]
+    assert differential.run_batch('RUN', rows) == list(batch.compute_batch(
+        'RUN', dict(zip(homework.Running.FIELDS, zip(*rows)))).messages())
@@ -0,0 +1,145 @@
+import math
+import random
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+import exact
+import homework
+
+CASES = [
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [1206, 12, 6]),
+    ('RUN', [420, 0.25, 60.5]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('WLK', [28000, 1.3, 70, 4]),
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('SWM', [1206, 12, 6, 12, 6]),
+]
+
+
+def constant(cls, name):
+    return Fraction(str(getattr(cls, name)))
+
+
+def reference(workout_type, data):
+    """Значения формул классов в рациональных числах."""
+    values = [Fraction(str(value)) for value in data]
+    cls = homework.WORKOUT_TYPES[workout_type]
+    action, duration, weight = values[:3]
+    distance = action * constant(cls, 'LEN_STEP') / cls.M_IN_KM
+    speed = distance / duration
+    if workout_type == 'SWM':
+        length_pool, count_pool = values[3:]
+        speed = length_pool * count_pool / cls.M_IN_KM / duration
+        calories = ((speed + constant(cls, 'COEF_CAL_1'))
+                    * constant(cls, 'COEF_CAL_2') * weight)
+    elif workout_type == 'WLK':
+        height = values[3]
+        calories = ((speed ** 2 // height * constant(cls, 'COEF_CAL_2')
+                     * height + constant(cls, 'COEF_CAL_1') * weight)
+                    * duration * cls.MIN_IN_H)
+    else:
+        calories = ((constant(cls, 'COEF_CAL_1') * speed
+                     - constant(cls, 'COEF_CAL_2'))
+                    * weight / cls.M_IN_KM * duration * cls.MIN_IN_H)
+    return tuple(math.floor(value * exact.SCALE + Fraction(1, 2))
+                 for value in (distance, speed, calories))
+
+
+@pytest.mark.parametrize('workout_type, data', CASES)
+def test_metrics_match_rational_formulas(workout_type, data):
+    assert exact.metrics(workout_type, data) == reference(
+        workout_type, data), (
+        'Точный режим должен округлять точное значение формулы'
+    )
+
+
+def test_known_values():
+    training = homework.read_package('WLK', [9000, 1, 75, 180])
+    assert training.get_spent_calories() == 157.50000000000003
+    assert exact.get_spent_calories(training) == 157_500_000_000
+    assert exact.to_decimal(exact.get_distance(training)) == Decimal('5.85')
+    assert exact.get_mean_speed(training) == 5_850_000_000
+    message = exact.show_training_info(training)
+    assert message.calories == 157.5
+    assert message.get_message().endswith('Потрачено ккал: 157.500.')
+
+
+def test_floor_division_is_exact():
+    training = homework.read_package('WLK', [28000, 1.3, 70, 4])
+    speed = training.get_mean_speed()
+    assert speed ** 2 // 4 == 48.0
+    steps = (Fraction(28000) * Fraction('0.65') / 1000
+             / Fraction('1.3')) ** 2 // 4
+    assert steps == 49
+    assert exact.get_spent_calories(training) == reference(
+        'WLK', [28000, 1.3, 70, 4])[2]
+
+
+def random_rows(workout_type, count, seed=0):
+    rnd = random.Random(seed)
+    width = len(homework.WORKOUT_TYPES[workout_type].FIELDS)
+    return [[rnd.randint(1, 30000), round(rnd.uniform(0.1, 3), 3),
+             round(rnd.uniform(40, 120), 1),
+             *(rnd.randint(1, 200) for _ in range(width - 3))]
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize('workout_type', ['RUN', 'WLK', 'SWM'])
+def test_batch_matches_scalar_in_any_order(workout_type):
+    rows = random_rows(workout_type, 500)
+    fields = homework.WORKOUT_TYPES[workout_type].FIELDS
+    result = exact.compute_batch(workout_type, dict(zip(fields, zip(*rows))))
+    order = list(range(len(rows)))
+    random.Random(1).shuffle(order)
+    shuffled = exact.compute_batch(workout_type, dict(zip(
+        fields, zip(*(rows[i] for i in order)))))
+    for position, i in enumerate(order):
+        expected = exact.metrics(workout_type, rows[i])
+        assert (result.distance[i], result.speed[i],
+                result.calories[i]) == expected
+        assert (shuffled.distance[position], shuffled.speed[position],
+                shuffled.calories[position]) == expected, (
+            'Результат не должен зависеть от порядка пакетов'
+        )
+
+
+@pytest.mark.parametrize('workout_type', ['RUN', 'WLK', 'SWM'])
+def test_close_to_float(workout_type):
+    rows = random_rows(workout_type, 200, seed=2)
+    fields = homework.WORKOUT_TYPES[workout_type].FIELDS
+    result = exact.compute_batch(workout_type, dict(zip(fields, zip(*rows))))
+    for message, data in zip(result.messages(), rows):
+        expected = homework.read_package(
+            workout_type, data).show_training_info()
+        assert message.training_type == expected.training_type
+        assert message.duration == expected.duration
+        for name in ('distance', 'speed'):
+            assert getattr(message, name) == pytest.approx(
+                getattr(expected, name), rel=1e-9, abs=1e-9)
+    assert len(result) == len(rows)
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', [15000, 1 / 3, 75]),
+    ('WLK', [9000, 2 / 3, 75, 180]),
+    ('SWM', [720, 1 / 7, 80, 25, 40]),
+])
+def test_scalar_message_matches_batch(workout_type, data):
+    fields = homework.WORKOUT_TYPES[workout_type].FIELDS
+    (batch_message,) = exact.compute_batch(
+        workout_type, dict(zip(fields, zip(data)))).messages()
+    scalar_message = exact.show_training_info(
+        homework.read_package(workout_type, data))
+    assert scalar_message == batch_message, (
+        'Сообщение не должно зависеть от движка точного расчёта'
+    )
+    assert scalar_message.duration == round(data[1], 9)
+
+
+def test_compute_batch_checks_lengths():
+    with pytest.raises(ValueError):
+        exact.compute_batch('RUN', {'action': [1, 2], 'duration': [1],
+                                    'weight': [1, 2]})
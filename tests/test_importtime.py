@@ -0,0 +1,56 @@
+import subprocess
+import sys
+
+from conftest import BASE_DIR
+
+IMPORT_BUDGET_US = 20_000
+HEAVY_MODULES = [
+    'dataclasses', 'typing', 'inspect', 're', 'json', 'asyncio',
+    'concurrent.futures', 'array', 'mmap',
+    'batch', 'pipeline', 'parallel', 'server', 'aggregate', 'packed',
+    'instrument',
+]
+
+
+def import_homework(code='pass'):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         f'import sys, homework; {code}'],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    )
+    return result
+
+
+def cumulative_us(stderr, module):
+    for line in stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise AssertionError(f'{module} не найден в выводе -X importtime')
+
+
+def test_import_time_budget():
+    best = min(
+        cumulative_us(import_homework().stderr, 'homework')
+        for _ in range(3)
+    )
+    assert best < IMPORT_BUDGET_US, (
+        f'Импорт homework занял {best} мкс, бюджет {IMPORT_BUDGET_US} мкс.'
+    )
+
+
+def test_engines_are_lazy():
+    code = f'print([m for m in {HEAVY_MODULES!r} if m in sys.modules])'
+    assert import_homework(code).stdout.strip() == '[]', (
+        'Импорт homework не должен загружать дополнительные движки.'
+    )
+    code = 'homework.compute_batch; print("batch" in sys.modules)'
+    assert import_homework(code).stdout.strip() == 'True'
+
+
+def test_sessions_do_not_load_service():
+    code = ('import sessions; print([m for m in ("threading", "queue", '
+            '"service", "validate") if m in sys.modules])')
+    assert import_homework(code).stdout.strip() == '[]', (
+        'Скалярным формулам сессий не нужен потоковый сервис.'
+    )
@@ -0,0 +1,48 @@
+import json
+from io import StringIO
+
+import instrument
+import pipeline
+
+LINES = 'RUN 15000 1 75\nSWM 720 1 80 25 40\nWLK 9000 1 75 180\nBOX 1\n'
+
+
+def test_recorder_context_manager(tmp_path):
+    assert instrument.active() is None
+    with instrument.Recorder() as recorder:
+        assert instrument.active() is recorder
+        pipeline.run_pipeline(StringIO(LINES * 10), StringIO())
+    assert instrument.active() is None
+
+    stages = recorder.stages
+    assert stages['parse'].count == 40
+    assert stages['read_package'].count == 30
+    assert stages['calculate'].count == 30
+    assert stages['info_message'].count == 30
+    assert stages['write'].count == 30
+    assert {code: sum(h) for code, h in recorder.latency.items()} == {
+        'RUN': 10, 'SWM': 10, 'WLK': 10,
+    }
+
+    path = tmp_path / 'profile.json'
+    recorder.dump(str(path))
+    data = json.loads(path.read_text())
+    assert data['stages']['parse']['count'] == 40
+    assert data['latency_ns']['RUN']['p99'] >= data['latency_ns']['RUN'][
+        'p50']
+    assert 'read_package' in recorder.summary()
+
+
+def test_pipeline_without_recorder():
+    dst = StringIO()
+    stats = pipeline.run_pipeline(StringIO(LINES), dst)
+    assert stats.written == 3
+
+
+def test_percentile():
+    histogram = [0] * instrument.BUCKETS
+    histogram[3] = 98
+    histogram[10] = 2
+    assert instrument.Recorder.percentile(histogram, 0.5) == 7
+    assert instrument.Recorder.percentile(histogram, 0.99) == 1023
+    assert instrument.Recorder.percentile([0] * 4, 0.5) == 0
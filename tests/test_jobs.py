@@ -0,0 +1,143 @@
+import io
+import json
+import os
+from multiprocessing.connection import Client
+
+import pytest
+
+import aggregate
+import homework
+import jobs
+import pipeline
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('BOX', [1, 2, 3]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('RUN', [1, 0, 6]),
+] * 50
+SHARD_SIZE = 256
+
+
+@pytest.fixture
+def packages_file(tmp_path):
+    path = tmp_path / 'packages.txt'
+    lines = [pipeline.format_package(*package) for package in PACKAGES]
+    lines.insert(7, 'RUN x 1')
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+
+def expected_report(path):
+    out = io.StringIO()
+    with open(path) as src:
+        stats = pipeline.run_pipeline(src, out)
+    return out.getvalue(), stats
+
+
+def expected_totals():
+    totals = {}
+    for workout_type, data in PACKAGES:
+        try:
+            message = homework.read_package(
+                workout_type, data).show_training_info()
+        except (KeyError, ZeroDivisionError):
+            continue
+        totals.setdefault(message.training_type, aggregate.Totals()).add(
+            message.duration, message.distance, message.calories,
+            message.speed)
+    return totals
+
+
+def test_plan_shards(packages_file):
+    shards = jobs.plan_shards(packages_file, SHARD_SIZE)
+    assert len(shards) > 3
+    assert shards[0].start == 0
+    assert shards[-1].end == os.path.getsize(packages_file)
+    with open(packages_file, 'rb') as src:
+        data = src.read()
+    for previous, shard in zip(shards, shards[1:]):
+        assert previous.end == shard.start
+        assert data[shard.start - 1:shard.start] == b'\n', (
+            'Шард должен начинаться с новой строки'
+        )
+
+
+def test_run_job_matches_pipeline(packages_file, tmp_path):
+    output = str(tmp_path / 'report.txt')
+    result = jobs.run_job(packages_file, output, str(tmp_path / 'job'),
+                          workers=3, shard_size=SHARD_SIZE)
+    report, stats = expected_report(packages_file)
+    with open(output) as src:
+        assert src.read() == report, (
+            'Склеенный отчёт должен совпадать с обработкой одним конвейером'
+        )
+    assert result.stats == stats
+    assert result.processed == result.shards
+    assert result.retries == 0
+    assert len(result.workers) == 3
+    totals = expected_totals()
+    assert sorted(result.totals) == sorted(totals)
+    for training_type, item in totals.items():
+        assert result.totals[training_type].count == item.count
+        assert result.totals[training_type].distance == pytest.approx(
+            item.distance)
+
+
+def test_lost_worker_shard_is_retried(packages_file, tmp_path):
+    coordinator = jobs.Coordinator(packages_file, str(tmp_path / 'out.txt'),
+                                   str(tmp_path / 'job'), SHARD_SIZE)
+    address = coordinator.start()
+    with Client(address, authkey=coordinator.authkey) as conn:
+        conn.send(('hello', 'flaky'))
+        command, shard, _ = conn.recv()
+        assert command == 'shard'
+    coordinator.spawn_workers(2)
+    result = coordinator.wait()
+    assert result.retries == 1
+    assert coordinator.attempts == {shard.index: 1}
+    with open(str(tmp_path / 'out.txt')) as src:
+        assert src.read() == expected_report(packages_file)[0]
+
+
+def test_failed_job_resumes_from_checkpoint(packages_file, tmp_path):
+    output = str(tmp_path / 'out.txt')
+    job_dir = str(tmp_path / 'job')
+    coordinator = jobs.Coordinator(packages_file, output, job_dir,
+                                   SHARD_SIZE, max_attempts=1)
+    address = coordinator.start()
+    failed = []
+    with Client(address, authkey=coordinator.authkey) as conn:
+        conn.send(('hello', 'partial'))
+        for _ in range(len(coordinator.shards)):
+            command, shard, shard_dir = conn.recv()
+            if shard.index % 2:
+                conn.send(('error', 'ValueError: сбой'))
+                failed.append(shard.index)
+            else:
+                conn.send(('done', jobs.process_shard(shard, shard_dir)))
+        with pytest.raises(jobs.JobError):
+            coordinator.wait()
+    assert not os.path.exists(output)
+    with open(os.path.join(job_dir, jobs.CHECKPOINT)) as src:
+        saved = {item['index'] for item in json.load(src)['shards']}
+    assert saved.isdisjoint(failed)
+
+    result = jobs.run_job(packages_file, output, job_dir, workers=1,
+                          shard_size=SHARD_SIZE)
+    assert result.processed == len(failed), (
+        'При продолжении должны считаться только невыполненные шарды'
+    )
+    with open(output) as src:
+        assert src.read() == expected_report(packages_file)[0]
+
+
+def test_checkpoint_of_other_job(packages_file, tmp_path):
+    job_dir = str(tmp_path / 'job')
+    jobs.run_job(packages_file, str(tmp_path / 'out.txt'), job_dir,
+                 workers=1, shard_size=SHARD_SIZE)
+    with pytest.raises(jobs.JobError):
+        jobs.Coordinator(packages_file, str(tmp_path / 'out.txt'), job_dir,
+                         shard_size=SHARD_SIZE * 2)
@@ -0,0 +1,32 @@
+import math
+
+import pytest
+
+import homework
+
+MESSAGES = [
+    homework.InfoMessage('Running', 1, 9.75, 9.75, 699.75),
+    homework.InfoMessage('Swimming', 0.5, 0.0005, 1e-4, -81.32032799999999),
+    homework.InfoMessage('SportsWalking', 12.0, 1e21, 2.0005, 0.0625),
+    homework.InfoMessage('Running', 3.5, -0.0, math.inf, math.nan),
+]
+
+
+@pytest.mark.parametrize('message', MESSAGES)
+def test_get_message_matches_template(message):
+    expected = message.MESSAGE.format(
+        training_type=message.training_type,
+        duration=message.duration,
+        distance=message.distance,
+        speed=message.speed,
+        calories=message.calories,
+    )
+    assert message.get_message() == expected, (
+        'Метод `get_message` должен совпадать с шаблоном `MESSAGE`.'
+    )
+
+
+def test_format_many():
+    text = homework.format_many(MESSAGES)
+    assert text == ''.join(m.get_message() + '\n' for m in MESSAGES)
+    assert homework.format_many([]) == ''
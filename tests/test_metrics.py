@@ -0,0 +1,83 @@
+import pytest
+
+import homework
+
+
+def test_metrics_are_computed_once():
+    training = homework.Running(15000, 1, 75)
+    with homework.MetricCounter() as counter:
+        training.show_training_info()
+        training.show_training_info()
+    assert counter.computed == 3
+    assert counter.reused == 5, (
+        'Дистанция, скорость и калории должны вычисляться один раз.'
+    )
+
+
+@pytest.mark.parametrize('workout_type, data, field, index, value', [
+    ('RUN', [15000, 1, 75], 'action', 0, 9000),
+    ('RUN', [15000, 1, 75], 'duration', 1, 2),
+    ('RUN', [15000, 1, 75], 'weight', 2, 80),
+    ('WLK', [9000, 1, 75, 180], 'height', 3, 150),
+    ('SWM', [720, 1, 80, 25, 40], 'length_pool', 3, 50),
+    ('SWM', [720, 1, 80, 25, 40], 'count_pool', 4, 10),
+])
+def test_metrics_invalidated_on_change(workout_type, data, field, index,
+                                       value):
+    training = homework.read_package(workout_type, data)
+    training.show_training_info()
+    setattr(training, field, value)
+    changed = data[:]
+    changed[index] = value
+    expected = homework.read_package(workout_type,
+                                     changed).show_training_info()
+    assert training.show_training_info() == expected, (
+        'После изменения параметров метрики нужно пересчитать.'
+    )
+
+
+def test_swimming_mean_speed_override():
+    swimming = homework.Swimming(720, 1, 80, 25, 40)
+    assert swimming.get_distance() == 0.9935999999999999
+    assert swimming.get_mean_speed() == 1.0
+    assert swimming.get_spent_calories() == 336.0
+
+
+def test_set_metric_hook():
+    calls = []
+    previous = homework.set_metric_hook(
+        lambda training, name, reused: calls.append((name, reused))
+    )
+    try:
+        homework.SportsWalking(9000, 1, 75, 180).get_spent_calories()
+    finally:
+        homework.set_metric_hook(previous)
+    assert calls == [
+        ('get_distance', False),
+        ('get_mean_speed', False),
+        ('get_spent_calories', False),
+    ]
+
+
+def test_hook_is_off_the_fast_path():
+    methods = [homework.Training.get_distance,
+               homework.Swimming.get_mean_speed,
+               homework.Running.get_spent_calories]
+    with homework.MetricCounter():
+        assert homework.Running.get_spent_calories is not methods[2]
+        assert homework.Running.get_spent_calories.__wrapped__ is methods[2]
+    assert [homework.Training.get_distance,
+            homework.Swimming.get_mean_speed,
+            homework.Running.get_spent_calories] == methods, (
+        'Без обработчика методы метрик не должны быть обёрнуты'
+    )
+
+
+def test_metrics_are_stored_in_slots():
+    training = homework.SportsWalking(9000, 1, 75, 180)
+    training.show_training_info()
+    assert training._calories == training.get_spent_calories()
+    training.weight = 80
+    assert (training._distance, training._speed, training._calories) == (
+        None, None, None)
+    assert training.weight == 80
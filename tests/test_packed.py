@@ -0,0 +1,88 @@
+import pytest
+
+import homework
+import packed
+
+ROWS = {
+    'RUN': [[15000, 1, 75], [1206, 12, 6], [420, 4, 20.5]],
+    'WLK': [[9000, 1, 75, 180], [420, 4, 20, 42], [1206, 12, 6, 12]],
+    'SWM': [[720, 1, 80, 25, 40], [420, 4, 20, 42, 4],
+            [1206, 0.75, 6, 12, 6]],
+}
+
+
+def expected(workout_type):
+    return [homework.read_package(workout_type, data).show_training_info()
+            for data in ROWS[workout_type]]
+
+
+@pytest.mark.parametrize('workout_type', ROWS)
+def test_round_trip(tmp_path, workout_type):
+    path = str(tmp_path / f'{workout_type}.wpk')
+    assert packed.write_packed(path, workout_type,
+                               ROWS[workout_type]) == 3
+    with packed.PackedReader(path) as reader:
+        assert reader.workout_type == workout_type
+        assert len(reader) == 3
+        assert [list(row) for row in reader] == ROWS[workout_type]
+        assert [t.show_training_info()
+                for t in reader.trainings()] == expected(workout_type)
+        assert list(reader.compute().messages()) == expected(workout_type)
+        columns = reader.columns()
+        assert list(columns['duration']) == [
+            data[1] for data in ROWS[workout_type]
+        ]
+        for column in columns.values():
+            column.release()
+
+
+def test_writer_appends(tmp_path):
+    path = str(tmp_path / 'run.wpk')
+    with packed.PackedWriter(path, 'RUN') as writer:
+        writer.write([15000, 1, 75])
+        writer.write_many(ROWS['RUN'])
+    with packed.PackedReader(path) as reader:
+        assert len(reader) == 4
+
+
+@pytest.mark.parametrize('rows', [
+    [[1, 2], [3, 4, 5, 6]],
+    [[15000, 1, 75], [1, 2]],
+    [[15000, 1, 75], None],
+    [[15000, 'x', 75]],
+])
+def test_write_many_checks_rows(tmp_path, rows):
+    path = str(tmp_path / 'run.wpk')
+    with pytest.raises(packed.PackedFormatError):
+        packed.write_packed(path, 'RUN', rows)
+    with packed.PackedReader(path) as reader:
+        assert len(reader) == 0, (
+            'Пакеты неверной длины не должны склеиваться в записи'
+        )
+
+
+def test_write_checks_row(tmp_path):
+    path = str(tmp_path / 'run.wpk')
+    with packed.PackedWriter(path, 'RUN') as writer:
+        writer.write([15000, 1, 75])
+        for data in ([1, 2], [1, 2, 3, 4], None, [1, 'x', 3]):
+            with pytest.raises(packed.PackedFormatError):
+                writer.write(data)
+    with packed.PackedReader(path) as reader:
+        assert [list(row) for row in reader] == [[15000, 1, 75]]
+
+
+def test_bad_files(tmp_path):
+    path = tmp_path / 'bad.wpk'
+    path.write_bytes(b'')
+    with pytest.raises(packed.PackedFormatError):
+        packed.PackedReader(str(path))
+    path.write_bytes(b'WPK1')
+    with pytest.raises(packed.PackedFormatError):
+        packed.PackedReader(str(path))
+    packed.write_packed(str(path), 'RUN', ROWS['RUN'])
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(packed.PackedFormatError):
+        packed.PackedReader(str(path))
+    with pytest.raises(packed.PackedFormatError):
+        packed.write_packed(str(path), 'RUN', [[1, 2]])
@@ -0,0 +1,70 @@
+import io
+
+import pytest
+
+import parallel
+import pipeline
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('BOX', [1, 2, 3]),
+    ('WLK', [9000, 1, 75, 180]),
+] * 25
+
+
+def test_run_serial():
+    lines = list(parallel.run_serial(PACKAGES, chunk_size=7))
+    assert len(lines) == len(PACKAGES)
+    assert lines[2] == parallel.UNKNOWN_TRAINING
+    assert lines[:4] == parallel.process_chunk(PACKAGES[:4])[0]
+
+
+@pytest.mark.parametrize('workers, chunk_size', [(1, 1), (2, 3), (3, 64)])
+def test_run_parallel_keeps_order(workers, chunk_size):
+    expected = list(parallel.run_serial(PACKAGES))
+    result = list(parallel.run_parallel(iter(PACKAGES), workers, chunk_size))
+    assert result == expected, (
+        'Параллельный запуск должен давать тот же вывод, что и '
+        'последовательный.'
+    )
+
+
+BAD_PACKAGES = [
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [1, 2]),
+    ('RUN', [1, 0, 6]),
+    ('BOX', [1, 2, 3]),
+    ('WLK', [1e300, 1e-10, 75, 180]),
+    ('SWM', [720, 1, 80, 25, 40]),
+] * 10
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_malformed_packages_are_counted(workers):
+    stats = pipeline.PipelineStats()
+    if workers > 1:
+        lines = list(parallel.run_parallel(iter(BAD_PACKAGES), workers, 4,
+                                           stats=stats))
+    else:
+        lines = list(parallel.run_serial(BAD_PACKAGES, 4, stats))
+    assert len(lines) == 30
+    assert stats == pipeline.PipelineStats(packages=60, written=20,
+                                           malformed=30, unknown=10), (
+        'Некорректный пакет не должен прерывать обработку'
+    )
+
+
+@pytest.mark.parametrize('workers', ['1', '2'])
+def test_main_matches_pipeline(monkeypatch, capsys, workers):
+    text = ('RUN 15000 1 75\nRUN 1 2\nRUN 1 0 6\nRUN x\nBOX 1 2 3\n'
+            'WLK 1e300 1e-10 75 180\nWLK 9000 1 75 180\n')
+    monkeypatch.setattr('sys.stdin', io.StringIO(text))
+    parallel.main(['--workers', workers, '--chunk-size', '3'])
+    out, err = capsys.readouterr()
+    report = io.StringIO()
+    expected = pipeline.run_pipeline(io.StringIO(text), report)
+    assert out == report.getvalue()
+    assert err.strip() == str(expected), (
+        'Счётчики должны совпадать с последовательным конвейером'
+    )
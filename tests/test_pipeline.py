@@ -0,0 +1,92 @@
+from io import StringIO
+
+import pytest
+
+import homework
+import instrument
+import pipeline
+
+
+def expected_messages(packages):
+    return [
+        homework.read_package(*package).show_training_info().get_message()
+        for package in packages
+    ]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, pipeline.DEFAULT_CHUNK_SIZE])
+def test_run_pipeline(chunk_size):
+    packages = [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+    ]
+    src = StringIO(''.join(
+        pipeline.format_package(*package) + '\n' for package in packages
+    ))
+    dst = StringIO()
+    stats = pipeline.run_pipeline(src, dst, chunk_size)
+    assert dst.getvalue().splitlines() == expected_messages(packages)
+    assert stats == pipeline.PipelineStats(
+        lines=3, packages=3, written=3, malformed=0, unknown=0
+    )
+
+
+def test_run_pipeline_counts_errors():
+    src = StringIO(
+        'RUN 15000 1 75\n'
+        'BOX 1 2 3\n'
+        'RUN 15000 1\n'
+        'RUN 15000 abc 75\n'
+        'RUN 15000 0 75\n'
+        '\n'
+        'WLK 9000 1 75 180'
+    )
+    dst = StringIO()
+    stats = pipeline.run_pipeline(src, dst)
+    assert dst.getvalue().splitlines() == expected_messages([
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+    ])
+    assert stats.unknown == 1
+    assert stats.malformed == 3
+    assert stats.written == 2
+
+
+@pytest.mark.parametrize('recorded', [False, True])
+def test_overflowing_packages_are_malformed(recorded):
+    src = StringIO('RUN 15000 1 75\n'
+                   f'RUN {"9" * 400} 1 75\n'
+                   'WLK 1e300 1e-10 75 180\n'
+                   'WLK 9000 1 75 180\n')
+    dst = StringIO()
+    recorder = instrument.Recorder() if recorded else None
+    stats = pipeline.run_pipeline(src, dst, recorder=recorder)
+    assert dst.getvalue().splitlines() == expected_messages([
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+    ]), 'Переполнение в одном пакете не должно останавливать поток'
+    assert (stats.written, stats.malformed) == (2, 2)
+
+
+def test_read_lines_skips_long_lines():
+    stats = pipeline.PipelineStats()
+    src = StringIO('RUN 1 1 1\n' + 'x' * 100 + '\nRUN 2 2 2\n')
+    lines = list(pipeline.read_lines(src, stats, chunk_size=8,
+                                     max_line_length=20))
+    assert lines == ['RUN 1 1 1', 'RUN 2 2 2']
+    assert stats.malformed == 1
+
+
+@pytest.mark.parametrize('chunk_size', [7, 1024, 65536])
+def test_long_lines_do_not_depend_on_chunk_size(chunk_size):
+    text = '\n'.join(['RUN 15000 1 75', 'x' * 5000, 'RUN ' + '1' * 5000,
+                      'WLK 9000 1 75 180', 'y' * 5000]) + '\n'
+    stats = pipeline.run_pipeline(StringIO(text), StringIO(),
+                                  chunk_size=chunk_size)
+    assert (stats.written, stats.malformed) == (2, 3), (
+        'Длинные строки должны отбрасываться при любом размере блока'
+    )
+    stats = pipeline.run_pipeline(StringIO(text.rstrip('\n')), StringIO(),
+                                  chunk_size=chunk_size)
+    assert (stats.written, stats.malformed) == (2, 3)
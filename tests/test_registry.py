@@ -0,0 +1,90 @@
+import functools
+
+import pytest
+
+import homework
+
+
+def test_workout_types_registered():
+    assert homework.WORKOUT_TYPES == {
+        'RUN': homework.Running,
+        'WLK': homework.SportsWalking,
+        'SWM': homework.Swimming,
+    }
+    assert homework.Swimming.CODE == 'SWM'
+    assert homework.SportsWalking.FIELDS == (
+        'action', 'duration', 'weight', 'height'
+    )
+
+
+def test_subclass_registration(monkeypatch):
+    monkeypatch.setattr(homework, 'WORKOUT_TYPES',
+                        dict(homework.WORKOUT_TYPES))
+
+    class Rowing(homework.Running, code='ROW'):
+        __slots__ = ()
+
+    training = homework.read_package('ROW', [1000, 1, 70])
+    assert isinstance(training, Rowing)
+    with pytest.raises(ValueError):
+        class Duplicate(homework.Training, code='ROW'):
+            pass
+
+
+def test_read_packages():
+    rows = [[15000, 1, 75], [1206, 12, 6]]
+    trainings = homework.read_packages('RUN', rows)
+    assert [t.show_training_info() for t in trainings] == [
+        homework.read_package('RUN', data).show_training_info()
+        for data in rows
+    ]
+    with pytest.raises(KeyError):
+        homework.read_packages('BOX', rows)
+
+
+def test_builtin_fields_match_signatures():
+    import inspect
+
+    for training_class in homework.WORKOUT_TYPES.values():
+        parameters = list(inspect.signature(training_class).parameters)
+        assert training_class.FIELDS == tuple(parameters), (
+            f'FIELDS {training_class.__name__} должны совпадать с __init__'
+        )
+
+
+def test_subclass_fields(monkeypatch):
+    monkeypatch.setattr(homework, 'WORKOUT_TYPES',
+                        dict(homework.WORKOUT_TYPES))
+
+    def logged(init):
+        @functools.wraps(init)
+        def wrapper(self, *args, **kwargs):
+            init(self, *args, **kwargs)
+        return wrapper
+
+    class Cycling(homework.Training, code='CYC'):
+        __slots__ = ('cadence',)
+
+        @logged
+        def __init__(self, action, duration, weight, cadence):
+            super().__init__(action, duration, weight)
+            self.cadence = cadence
+
+    class Declared(homework.Running, code='DCL'):
+        __slots__ = ()
+        FIELDS = ('action', 'duration', 'weight')
+
+        def __init__(self, *args):
+            super().__init__(*args)
+
+    class Rowing(Cycling, code='ROW'):
+        __slots__ = ()
+
+    assert Cycling.FIELDS == ('action', 'duration', 'weight', 'cadence'), (
+        'Поля должны браться из сигнатуры и для обёрнутого __init__'
+    )
+    assert Rowing.FIELDS == Cycling.FIELDS
+    assert Declared.FIELDS == ('action', 'duration', 'weight'), (
+        'Объявленные FIELDS нельзя перезаписывать'
+    )
+    assert homework.read_package('CYC', [1000, 1, 70, 90]).cadence == 90
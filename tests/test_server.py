@@ -0,0 +1,107 @@
+import asyncio
+
+import homework
+import server
+from cache import ResultCache
+from pipeline import format_package
+
+PACKAGES = [
+    ('RUN', [15000, 1, 75]),
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+def expected_lines():
+    return [
+        homework.read_package(*package).show_training_info().get_message()
+        for package in PACKAGES
+    ]
+
+
+async def exchange(reader, writer, lines):
+    writer.write(''.join(line + '\n' for line in lines).encode())
+    await writer.drain()
+    replies = [(await reader.readline()).decode().rstrip('\n')
+               for _ in lines]
+    writer.close()
+    return replies
+
+
+def test_handle_line():
+    assert server.handle_line('RUN 15000 1 75') == expected_lines()[0]
+    assert server.handle_line('BOX 1 2 3') == server.ERROR_UNKNOWN
+    assert server.handle_line('RUN 1 x 3') == server.ERROR_MALFORMED
+    assert server.handle_line('RUN 1 2') == server.ERROR_MALFORMED
+    assert server.handle_line('RUN 1 0 3') == server.ERROR_MALFORMED
+    assert server.handle_line('WLK 1e300 1e-10 75 180') == (
+        server.ERROR_MALFORMED)
+
+
+def test_tcp_pipelining():
+    async def scenario():
+        package_server = server.PackageServer(max_pipeline=2)
+        tcp = await package_server.start('127.0.0.1', 0)
+        port = tcp.sockets[0].getsockname()[1]
+        async with tcp:
+            lines = ['RUN 15000 1 75', 'SWM 720 1 80 25 40',
+                     'WLK 9000 1 75 180', 'BOX 1'] * 50
+            clients = [
+                exchange(*await asyncio.open_connection('127.0.0.1', port),
+                         lines)
+                for _ in range(3)
+            ]
+            return await asyncio.gather(*clients)
+
+    for replies in asyncio.run(scenario()):
+        assert replies == (expected_lines() + [server.ERROR_UNKNOWN]) * 50
+
+
+def test_overflow_keeps_connection():
+    async def scenario(cache):
+        package_server = server.PackageServer(cache=cache)
+        tcp = await package_server.start('127.0.0.1', 0)
+        port = tcp.sockets[0].getsockname()[1]
+        async with tcp:
+            lines = ['RUN 15000 1 75', 'WLK 1e300 1e-10 75 180',
+                     f'RUN {"9" * 400} 1 75', 'WLK 9000 1 75 180']
+            return await asyncio.wait_for(exchange(
+                *await asyncio.open_connection('127.0.0.1', port), lines), 5)
+
+    expected = expected_lines()
+    for cache in (None, ResultCache()):
+        assert asyncio.run(scenario(cache)) == [
+            expected[0], server.ERROR_MALFORMED, server.ERROR_MALFORMED,
+            expected[2]], 'После переполнения соединение должно работать'
+
+
+def test_unix_socket(tmp_path):
+    async def scenario():
+        path = str(tmp_path / 'server.sock')
+        unix = await server.PackageServer().start(path=path)
+        async with unix:
+            lines = [format_package(*package) for package in PACKAGES]
+            return await exchange(*await asyncio.open_unix_connection(path),
+                                  lines)
+
+    assert asyncio.run(scenario()) == expected_lines()
+
+
+def test_reset_client_releases_connection():
+    async def scenario():
+        package_server = server.PackageServer(max_connections=1,
+                                              max_pipeline=4)
+        tcp = await package_server.start('127.0.0.1', 0)
+        port = tcp.sockets[0].getsockname()[1]
+        async with tcp:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'RUN 15000 1 75\n' * 200_000)
+            await asyncio.sleep(0.2)
+            writer.transport.abort()
+            return await asyncio.wait_for(exchange(
+                *await asyncio.open_connection('127.0.0.1', port),
+                ['RUN 15000 1 75']), timeout=5)
+
+    assert asyncio.run(scenario()) == expected_lines()[:1], (
+        'После сброса соединения клиентом сервер должен принимать новых'
+    )
@@ -0,0 +1,129 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import homework
+import service
+
+THREADS = 16
+PACKAGES_PER_THREAD = 2000
+
+
+def generate_packages(count, seed):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        workout_type = rnd.choice(['RUN', 'WLK', 'SWM'])
+        data = [rnd.randint(100, 20000), rnd.uniform(0.1, 3),
+                rnd.uniform(40, 120)]
+        if workout_type == 'WLK':
+            data.append(rnd.randint(140, 210))
+        elif workout_type == 'SWM':
+            data += [rnd.randint(10, 50), rnd.randint(1, 80)]
+        yield workout_type, data
+
+
+def expected(workout_type, data):
+    return homework.read_package(workout_type, data).show_training_info()
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('WLK', [420, 4, 20, 42]),
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('SWM', [1206, 12, 6, 12, 6]),
+])
+def test_calculate_matches_classes(workout_type, data):
+    calculator = service.CalculatorService()
+    assert calculator.calculate(workout_type, data).as_tuple() == (
+        expected(workout_type, data).as_tuple()
+    ), 'Сервис должен считать так же, как классы тренировок'
+
+
+@pytest.mark.parametrize('workout_type, data, error', [
+    ('BOX', [1, 2, 3], KeyError),
+    ('RUN', [1, 2], TypeError),
+    ('RUN', [1], TypeError),
+    ('RUN', [], TypeError),
+    ('RUN', None, TypeError),
+    ('RUN', [1, 0, 3], ZeroDivisionError),
+    ('WLK', [10 ** 10, 1e-300, 75, 180], OverflowError),
+    ('WLK', [9000, 1, 75, 0], ZeroDivisionError),
+])
+def test_calculate_errors(workout_type, data, error):
+    with pytest.raises(error):
+        expected(workout_type, data)
+    calculator = service.CalculatorService()
+    with pytest.raises(error):
+        calculator.calculate(workout_type, data)
+    with service.CalculatorService(batch_window=0.001) as batched:
+        with pytest.raises(error):
+            batched.calculate_batched(workout_type, data)
+
+
+def test_batch_errors_keep_worker_alive():
+    good = ('RUN', [15000, 1, 75])
+    with service.CalculatorService(batch_window=0.05) as batched:
+        futures = [batched.submit('WLK', [10 ** 10, 1e-300, 75, 180]),
+                   batched.submit(*good),
+                   batched.submit('RUN', None)]
+        with pytest.raises(OverflowError):
+            futures[0].result(timeout=5)
+        assert futures[1].result(timeout=5) == expected(*good), (
+            'Ошибка одного пакета не должна задевать остальные'
+        )
+        with pytest.raises(TypeError):
+            futures[2].result(timeout=5)
+        assert batched.submit(*good).result(timeout=5) == expected(*good)
+
+
+def test_batched_mixed_requests():
+    packages = list(generate_packages(500, seed=3))
+    with service.CalculatorService(batch_window=0.01) as calculator:
+        futures = [calculator.submit(*package) for package in packages]
+        futures.append(calculator.submit('RUN', [-1, 1, 75]))
+        results = [future.result() for future in futures]
+    assert [message.as_tuple() for message in results[:-1]] == [
+        expected(*package).as_tuple() for package in packages
+    ]
+    assert results[-1] == expected('RUN', [-1, 1, 75])
+    assert calculator.batches < len(futures), (
+        'Запросы должны объединяться в микропакеты'
+    )
+
+
+def test_submit_without_batching():
+    calculator = service.CalculatorService()
+    assert calculator.submit('RUN', [15000, 1, 75]).result() == expected(
+        'RUN', [15000, 1, 75])
+    with pytest.raises(KeyError):
+        calculator.submit('BOX', [1]).result()
+
+
+@pytest.mark.parametrize('batch_window', [None, 0.0005])
+def test_stress_many_threads(batch_window):
+    packages = list(generate_packages(THREADS * PACKAGES_PER_THREAD, seed=7))
+    reference = [expected(*package).as_tuple() for package in packages]
+    start = threading.Barrier(THREADS)
+
+    with service.CalculatorService(batch_window) as calculator:
+        call = (calculator.calculate if batch_window is None
+                else calculator.calculate_batched)
+
+        def worker(offset):
+            start.wait()
+            return [
+                call(*packages[i]).as_tuple()
+                for i in range(offset, len(packages), THREADS)
+            ]
+
+        with ThreadPoolExecutor(THREADS) as pool:
+            chunks = list(pool.map(worker, range(THREADS)))
+
+    for offset, chunk in enumerate(chunks):
+        assert chunk == reference[offset::THREADS], (
+            'Результаты под нагрузкой должны совпадать с read_package'
+        )
@@ -0,0 +1,119 @@
+import pytest
+
+import homework
+import sessions
+
+PACKAGES = [
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('WLK', [28000, 1.3, 70, 4]),
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('SWM', [1206, 12, 6, 12, 6]),
+]
+
+
+def start(workout_type, data):
+    """Сессия с постоянными параметрами пакета."""
+    fields = homework.WORKOUT_TYPES[workout_type].FIELDS
+    params = data[3:len(data) - (fields[-1] == sessions.LAP_FIELD)]
+    return sessions.LiveSession(workout_type, data[2], *params)
+
+
+@pytest.mark.parametrize('workout_type, data', PACKAGES)
+@pytest.mark.parametrize('updates', [1, 7, 720])
+def test_final_message_matches_one_shot(workout_type, data, updates):
+    session = start(workout_type, data)
+    action, duration = data[:2]
+    laps = data[-1] if workout_type == 'SWM' else 0
+    step = duration / updates
+    for index in range(updates):
+        session.update(steps=action * (index + 1) // updates
+                       - action * index // updates,
+                       elapsed=step,
+                       laps=laps if index == updates - 1 else 0)
+    expected = homework.read_package(workout_type, data)
+    assert session.duration == pytest.approx(duration, rel=1e-15)
+    training = homework.read_package(
+        workout_type, list(session.fields()))
+    assert session.show_training_info() == training.show_training_info(), (
+        'Итог сессии должен совпадать с расчётом по тем же полям'
+    )
+    if session.duration == duration:
+        assert session.show_training_info() == (
+            expected.show_training_info())
+
+
+def test_compensated_duration():
+    session = sessions.LiveSession('RUN', 75)
+    naive = 0.0
+    for _ in range(720):
+        session.update(steps=20, elapsed=5 / 3600)
+        naive += 5 / 3600
+    assert naive != 1.0
+    assert session.duration == 1.0, (
+        'Сумма приращений времени должна накапливаться с компенсацией'
+    )
+    assert session.show_training_info() == homework.read_package(
+        'RUN', [14400, 1.0, 75]).show_training_info()
+
+
+def test_metrics_follow_updates():
+    session = sessions.LiveSession('WLK', 75, 180)
+    session.update(steps=4500, elapsed=0.5)
+    assert session.get_distance() == homework.read_package(
+        'WLK', [4500, 0.5, 75, 180]).get_distance()
+    session.update(steps=4500, elapsed=0.5)
+    expected = homework.read_package('WLK', [9000, 1, 75, 180])
+    assert session.get_distance() == expected.get_distance()
+    assert session.get_mean_speed() == expected.get_mean_speed()
+    assert session.get_spent_calories() == expected.get_spent_calories()
+
+
+def test_observe_cumulative_readings():
+    session = sessions.LiveSession('SWM', 80, 25)
+    session.observe(360, 0.5, 20)
+    session.observe(720, 1, 40)
+    assert session.show_training_info() == homework.read_package(
+        'SWM', [720, 1, 80, 25, 40]).show_training_info()
+    with pytest.raises(ValueError):
+        session.observe(700, 1.5, 40)
+
+
+@pytest.mark.parametrize('args, kwargs', [
+    (('RUN', 75, 180), {}),
+    (('WLK', 75), {}),
+])
+def test_wrong_params(args, kwargs):
+    with pytest.raises(TypeError):
+        sessions.LiveSession(*args, **kwargs)
+
+
+def test_bad_updates():
+    session = sessions.LiveSession('RUN', 75)
+    with pytest.raises(ValueError):
+        session.update(steps=-1)
+    with pytest.raises(ValueError):
+        session.update(steps=10, laps=1)
+    assert session.action == 0, 'Ошибочное обновление не должно применяться'
+    with pytest.raises(ZeroDivisionError):
+        session.show_training_info()
+
+
+def test_store():
+    store = sessions.SessionStore()
+    for device in range(1000):
+        store.start(device, 'RUN', 75)
+    store.start('pool', 'SWM', 80, 25)
+    with pytest.raises(KeyError):
+        store.start('pool', 'SWM', 80, 25)
+    for _ in range(4):
+        for device in range(1000):
+            store.update(device, steps=3750, elapsed=0.25)
+        store.update('pool', steps=180, elapsed=0.25, laps=10)
+    assert len(store) == 1001
+    expected = homework.read_package('RUN', [15000, 1, 75])
+    assert store.finish(0) == expected.show_training_info()
+    assert 0 not in store
+    assert store.finish('pool') == homework.read_package(
+        'SWM', [720, 1, 80, 25, 40]).show_training_info()
@@ -0,0 +1,137 @@
+import math
+
+import pytest
+
+import batch
+import homework
+import validate
+
+NAN = float('nan')
+
+
+@pytest.mark.parametrize('workout_type, rows', [
+    ('RUN', [[15000, 1, 75], [1206, 12, 6], [0, 0.5, 75.5]]),
+    ('WLK', [[9000, 1, 75, 180], [420, 4, 20, 42]]),
+    ('SWM', [[720, 1, 80, 25, 40], [420, 4, 20, 42, 0]]),
+])
+def test_valid_rows_pass(workout_type, rows):
+    result = validate.validate_rows(workout_type, rows)
+    assert result.rejected == []
+    assert result.rows == rows
+    computed = batch.compute_batch(workout_type, result.columns)
+    for i, data in enumerate(rows):
+        training = homework.read_package(workout_type, data)
+        assert computed.calories[i] == training.get_spent_calories(), (
+            'Колонки проверки должны подходить для compute_batch'
+        )
+
+
+@pytest.mark.parametrize('workout_type, data, reason', [
+    ('RUN', [15000, 1], validate.ARITY),
+    ('RUN', [15000, 1, 75, 1], validate.ARITY),
+    ('RUN', None, validate.ARITY),
+    ('RUN', 15000, validate.ARITY),
+    ('RUN', [15000, '1', 75], validate.TYPE),
+    ('RUN', [15000, None, 75], validate.TYPE),
+    ('RUN', [True, 1, 75], validate.TYPE),
+    ('RUN', [15000, 0, 75], 'duration'),
+    ('RUN', [15000, -1, 75], 'duration'),
+    ('RUN', [15000, NAN, 75], 'duration'),
+    ('RUN', [-1, 1, 75], 'action'),
+    ('RUN', [15000, 1, 0], 'weight'),
+    ('RUN', [15000, 1, 10 ** 400], 'weight'),
+    ('RUN', [15000, 1, float('inf')], 'weight'),
+    ('RUN', [15000, 1e-300, 75], 'duration'),
+    ('WLK', [1e300, 1e-10, 75, 180], 'action'),
+    ('WLK', [9000, 1, 75, 1e-300], 'height'),
+    ('WLK', [9000, 1, 75, 0], 'height'),
+    ('SWM', [720, 1, 80, 0, 40], 'length_pool'),
+    ('SWM', [720, 1, 80, 25, -1], 'count_pool'),
+    ('BOX', [1, 2, 3], validate.UNKNOWN),
+])
+def test_rejection_reasons(workout_type, data, reason):
+    good = {
+        'RUN': [15000, 1, 75],
+        'WLK': [9000, 1, 75, 180],
+        'SWM': [720, 1, 80, 25, 40],
+    }.get(workout_type, data)
+    result = validate.validate_rows(workout_type, [good, data, good])
+    if reason == validate.UNKNOWN:
+        assert result.rejected == [(0, reason), (1, reason), (2, reason)]
+        return
+    assert result.rejected == [(1, reason)], (
+        f'Пакет {data} должен отклоняться с причиной {reason}'
+    )
+    assert result.rows == [good, good]
+    assert len(result.columns['duration']) == 2
+
+
+def test_positions_after_arity_rejections():
+    rows = [[1], [15000, 0, 75], [1, 2], [15000, 1, 0], [15000, 1, 75],
+            [15000, 1.5, 10 ** 40], [15000, 1.5, 10 ** 400]]
+    result = validate.validate_rows('RUN', rows)
+    assert result.rejected == [(0, validate.ARITY), (1, 'duration'),
+                               (2, validate.ARITY), (3, 'weight'),
+                               (6, 'weight')], (
+        'Номера отклонённых по полям строк должны быть исходными'
+    )
+    assert result.rows == rows[4:6]
+    assert list(result.columns['weight']) == [75, 10 ** 40]
+
+
+@pytest.mark.parametrize('workout_type', ['RUN', 'WLK', 'SWM'])
+def test_accepted_extremes_do_not_overflow(workout_type):
+    fields = homework.WORKOUT_TYPES[workout_type].FIELDS
+    low = {name: 0 if validate.RULES[name](0) else validate.MIN_POSITIVE
+           for name in fields}
+    rows = [[validate.MAX_VALUE if (mask >> i) & 1 else low[name]
+             for i, name in enumerate(fields)]
+            for mask in range(2 ** len(fields))]
+    result = validate.validate_rows(workout_type, rows)
+    assert result.rejected == []
+    computed = batch.compute_batch(workout_type, result.columns)
+    for values in (computed.distance, computed.speed, computed.calories):
+        assert all(map(math.isfinite, values)), (
+            'Принятые пакеты должны считаться без переполнения'
+        )
+
+
+def test_first_violation_wins():
+    result = validate.validate_rows('RUN', [[-1, 0, 'x']])
+    assert result.rejected == [(0, 'action')]
+
+
+def test_rejected_rows_would_fail():
+    rows = [[15000, 0, 75], [15000, 1], [9000, 1, 75]]
+    result = validate.validate_rows('RUN', rows)
+    rejected = {i for i, _ in result.rejected}
+    for i, data in enumerate(rows):
+        if i in rejected:
+            with pytest.raises((TypeError, ZeroDivisionError)):
+                homework.read_package('RUN', data).show_training_info()
+        else:
+            homework.read_package('RUN', data).show_training_info()
+
+
+def test_empty_rows():
+    result = validate.validate_rows('WLK', [])
+    assert len(result) == 0
+    assert result.columns == {name: () for name in
+                              homework.SportsWalking.FIELDS}
+
+
+def test_validate_packages():
+    packages = [
+        ('RUN', [15000, 1, 75]),
+        ('BOX', [1, 2, 3]),
+        ('WLK', [9000, 1, 75, 0]),
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 0, 75]),
+    ]
+    results, rejected = validate.validate_packages(packages)
+    assert rejected == [(1, validate.UNKNOWN), (2, 'height'),
+                        (4, 'duration')]
+    assert sorted(results) == ['RUN', 'SWM', 'WLK']
+    assert results['RUN'].rows == [[15000, 1, 75]]
+    assert results['RUN'].rejected == [(4, 'duration')]
+    assert len(results['WLK']) == 0
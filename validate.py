@@ -0,0 +1,265 @@
+"""Проверка пакетов перед расчётом целыми колонками.
+
+Пакеты одного вида тренировки проверяются за несколько проходов
+по колонкам на уровне C: число параметров, их типы (int или float,
+но не bool) и допустимые значения. Построчный разбор выполняется
+только для колонок, в которых нашлось нарушение. Колонки принятых
+пакетов сохраняются в результате и передаются в `compute_batch`
+без повторного разбора строк. Отклонённые строки возвращаются с кодом
+причины:
+
+* ``unknown`` — неизвестный код тренировки;
+* ``arity`` — неверное число параметров;
+* ``type`` — параметр не число;
+* имя поля (``duration``, ``height``, ...) — значение поля вне
+  допустимого диапазона, например нулевая длительность или значение,
+  на котором расчёт переполнит float. Принятые пакеты считаются
+  без исключений.
+"""
+from dataclasses import dataclass, field
+from itertools import repeat
+from operator import eq
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from homework import WORKOUT_TYPES
+
+UNKNOWN: str = 'unknown'
+ARITY: str = 'arity'
+TYPE: str = 'type'
+
+NUMBER_TYPES: frozenset = frozenset((int, float))
+TRANSPOSE_BLOCK: int = 1024
+
+# Верхняя граница всех полей и нижняя граница положительных полей.
+# В этих пределах ни одна формула классов тренировок не выходит
+# за диапазон float: самое большое промежуточное значение — калории
+# ходьбы, около 1e244.
+MAX_VALUE: float = 1e50
+MIN_POSITIVE: float = 1 / MAX_VALUE
+
+
+def _bounded(value: float) -> bool:
+    return -MAX_VALUE <= value <= MAX_VALUE
+
+
+def _non_negative(value: float) -> bool:
+    return 0 <= value <= MAX_VALUE
+
+
+def _positive(value: float) -> bool:
+    return MIN_POSITIVE <= value <= MAX_VALUE
+
+
+# Ограничения полей: `rule(value)` должно быть истинно. NaN,
+# бесконечность и целые вне диапазона float не проходят ни одно
+# из них. Каждое ограничение — отрезок, поэтому колонку без нарушений
+# можно проверить по минимуму и максимуму. Поля без своего ограничения
+# проверяются по DEFAULT_RULE.
+RULES: Dict[str, Callable[[float], bool]] = {
+    'action': _non_negative,
+    'duration': _positive,
+    'weight': _positive,
+    'height': _positive,
+    'length_pool': _positive,
+    'count_pool': _non_negative,
+}
+DEFAULT_RULE: Callable[[float], bool] = _bounded
+
+Rejection = Tuple[int, str]
+
+
+@dataclass
+class ValidationResult:
+    """Пакеты одного вида тренировки, разделённые проверкой."""
+
+    workout_type: str
+    rows: List[Sequence] = field(default_factory=list)
+    columns: Dict[str, Sequence[float]] = field(default_factory=dict)
+    rejected: List[Rejection] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+def _arity(row) -> int:
+    """Получить число параметров строки или -1, если это не список."""
+    try:
+        return len(row)
+    except TypeError:
+        return -1
+
+
+def _transpose(rows: List[Sequence], width: int) -> List[list]:
+    """Разложить строки по колонкам.
+
+    ``zip(*rows)`` по всему списку обходит все строки ради каждой
+    колонки вразброс по памяти; по блокам строки остаются в кэше
+    процессора, и это вдвое быстрее.
+    """
+    columns: List[list] = [[] for _ in range(width)]
+    for start in range(0, len(rows), TRANSPOSE_BLOCK):
+        for column, part in zip(columns,
+                                zip(*rows[start:start + TRANSPOSE_BLOCK])):
+            column += part
+    return columns
+
+
+def _false_positions(flags: Iterable[bool]) -> List[int]:
+    """Получить номера ложных флагов.
+
+    Флаги собираются в bytes на уровне C, а нули ищет `bytes.find`:
+    цикл Python проходит только по найденным номерам.
+    """
+    found: bytes = bytes(flags)
+    positions: List[int] = []
+    i: int = found.find(0)
+    while i != -1:
+        positions.append(i)
+        i = found.find(0, i + 1)
+    return positions
+
+
+def _drop(items: list, removed: List[int]) -> list:
+    """Получить копию без элементов с отсортированными номерами `removed`.
+
+    Копируются срезы между удалёнными номерами, а не каждый элемент.
+    """
+    kept: list = []
+    start: int = 0
+    for i in removed:
+        kept += items[start:i]
+        start = i + 1
+    kept += items[start:]
+    return kept
+
+
+def _original_positions(indices: Iterable[int],
+                        removed: List[int]) -> List[int]:
+    """Перевести номера среди оставшихся строк в номера исходных строк.
+
+    `indices` и `removed` отсортированы.
+    """
+    positions: List[int] = []
+    shift: int = 0
+    for i in indices:
+        while shift < len(removed) and removed[shift] <= i + shift:
+            shift += 1
+        positions.append(i + shift)
+    return positions
+
+
+def _column_ok(rule: Callable[[float], bool],
+               column: Sequence[float]) -> bool:
+    """Проверить ограничение на колонке чисел целиком.
+
+    Ограничение — отрезок, поэтому достаточно проверить минимум
+    и максимум. NaN `min` и `max` пропускают, но он делает NaN и сумму.
+    Сумма неотрицательных чисел не меньше каждого из них, поэтому если
+    она с запасом на округление ниже `MAX_VALUE`, проход `max` не нужен.
+    """
+    try:
+        total: float = sum(column)
+    except OverflowError:
+        return False
+    low: float = min(column)
+    if not rule(low) or total != total:
+        return False
+    return low >= 0 and total <= MAX_VALUE / 2 or rule(max(column))
+
+
+def _check_column(name: str,
+                  column: Sequence,
+                  reasons: Dict[int, str]) -> None:
+    """Отметить в `reasons` строки с нарушениями в колонке."""
+    rule: Callable[[float], bool] = RULES.get(name, DEFAULT_RULE)
+    if not column:
+        return
+    if set(map(type, column)) <= NUMBER_TYPES:
+        if _column_ok(rule, column):
+            return
+        for i in _false_positions(map(rule, column)):
+            reasons.setdefault(i, name)
+        return
+    for i, value in enumerate(column):
+        if type(value) not in NUMBER_TYPES:
+            reasons.setdefault(i, TYPE)
+        elif not rule(value):
+            reasons.setdefault(i, name)
+
+
+def _split_arity(rows: List[Sequence],
+                 width: int) -> Tuple[List[Sequence], List[int]]:
+    """Отделить строки неверной длины и вернуть их номера."""
+    try:
+        if set(map(len, rows)) == {width}:
+            return rows, []
+        removed: List[int] = _false_positions(
+            map(eq, map(len, rows), repeat(width)))
+    except TypeError:
+        removed = _false_positions(map(eq, map(_arity, rows), repeat(width)))
+    return _drop(rows, removed), removed
+
+
+def validate_rows(workout_type: str,
+                  rows: Iterable[Sequence]) -> ValidationResult:
+    """Проверить пакеты одного вида тренировки.
+
+    Номера отклонённых строк — позиции в `rows`; у строки с несколькими
+    нарушениями указывается первое по порядку полей. Строка, которая
+    не является последовательностью, отклоняется как ``arity``.
+    """
+    rows = list(rows)
+    result: ValidationResult = ValidationResult(workout_type)
+    training_class = WORKOUT_TYPES.get(workout_type)
+    if training_class is None:
+        result.rejected = [(i, UNKNOWN) for i in range(len(rows))]
+        return result
+    fields: Tuple[str, ...] = training_class.FIELDS
+    checked, wrong_arity = _split_arity(rows, len(fields))
+    columns: List[Sequence] = (_transpose(checked, len(fields)) if checked
+                               else [()] * len(fields))
+    column_reasons: Dict[int, str] = {}
+    for name, column in zip(fields, columns):
+        _check_column(name, column, column_reasons)
+    result.rows = checked
+    result.columns = dict(zip(fields, columns))
+    if column_reasons:
+        dropped: List[int] = sorted(column_reasons)
+        result.rows = _drop(checked, dropped)
+        result.columns = {name: _drop(column, dropped)
+                          for name, column in result.columns.items()}
+        # Номера в колонках — позиции среди строк верной длины.
+        column_reasons = dict(zip(
+            _original_positions(dropped, wrong_arity),
+            map(column_reasons.get, dropped)))
+    column_reasons.update(dict.fromkeys(wrong_arity, ARITY))
+    result.rejected = sorted(column_reasons.items())
+    return result
+
+
+def validate_packages(
+        packages: Iterable[Tuple[str, Sequence]],
+) -> Tuple[Dict[str, ValidationResult], List[Rejection]]:
+    """Проверить пакеты разных видов тренировок.
+
+    Вернуть принятые пакеты по кодам тренировок и отклонённые пакеты
+    с номерами в исходной последовательности.
+    """
+    groups: Dict[str, Tuple[List[int], List[Sequence]]] = {}
+    for i, (workout_type, data) in enumerate(packages):
+        group = groups.get(workout_type)
+        if group is None:
+            group = groups[workout_type] = ([], [])
+        group[0].append(i)
+        group[1].append(data)
+    results: Dict[str, ValidationResult] = {}
+    rejected: List[Rejection] = []
+    for workout_type, (indices, rows) in groups.items():
+        result: ValidationResult = validate_rows(workout_type, rows)
+        result.rejected = [(indices[i], reason)
+                           for i, reason in result.rejected]
+        rejected.extend(result.rejected)
+        if workout_type in WORKOUT_TYPES:
+            results[workout_type] = result
+    rejected.sort()
+    return results, rejected